@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Benchmark-Suite für die Extraktions-Skripte, mit Ergebnissen als JSON
+Erzeugt deterministische Berichte im Stil von ANALYSE_BERICHT.md (Markdown
+oder HTML, Standardgrößen 1 MB, 100 MB, 1 GB) und misst jede Stufe einzeln
+sowie alle vier Skripte zusammen. Jede Messung läuft in einem frischen
+Prozess (Spitzen-RSS pro Stufe, ein Absturz z.B. wegen Speichermangel
+bricht die Suite nicht ab).
+
+Stufen:
+    tokenize       Datei lesen + URL-Regex (extract_urls_from_file)
+    tokenize_mmap  dasselbe mit mmap (Bytes-Regex, Datei nicht als str geladen)
+    classify       classify_url() für jede unterschiedliche URL
+    categorize     categorize_url() für jede unterschiedliche URL
+    context        Index URL -> (Zeile, Kontext, Anzahl)
+    analyze        analyze_content() bzw. analyze_structured() ohne Cache
+    writers        JSON, Markdown-Report, CSV und Tabelle (write_sinks)
+    mentions       Alle Erwähnungen, Kennzahlen und ALLE_URLS_MIT_DUPLIKATEN.txt
+    end_to_end     Die vier Skripte nacheinander wie von Hand
+
+Beispiele:
+    python benchmark_suite.py --sizes 1 100                 # -> benchmark_results/<commit>.json
+    python benchmark_suite.py --sizes 1 --compare benchmark_results/abc1234.json
+    python benchmark_suite.py --generate bericht.md --sizes 100 --formats markdown
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from multiprocessing import get_context
+
+import create_csv_export
+import extract_all_urls
+import extract_all_urls_with_duplicates
+import url_extraction
+from url_classifier import classify_url
+from url_sinks import CsvSink, JsonSink, MarkdownTableSink, run_sink, write_sinks
+from url_structure import build_structured_index
+
+# Bei Änderungen am Generator erhöhen: gleiche Version + Seed = gleiche Datei
+GENERATOR_VERSION = 1
+DEFAULT_SIZES = [1, 100, 1000]
+FORMATS = {'markdown': '.md', 'html': '.html'}
+# Eingaben ab dieser Größe (MB) werden nur einmal gemessen
+SINGLE_RUN_MB = 10
+# Relative Verlangsamung, ab der --compare eine Regression meldet
+DEFAULT_THRESHOLD = 0.10
+
+CATEGORIES = ["AI & TECHNOLOGY", "INFRASTRUCTURE & SYSTEMS", "CREATIVE & MEDIA",
+              "SECURITY & COMPLIANCE", "DEVELOPMENT TOOLS", "DATA & ANALYTICS",
+              "DIGITAL PLATFORMS", "DOCUMENTATION & RESOURCES"]
+# URLs, die in vielen Repositories wiederkehren (Badges, Lizenzen, Doku)
+SHARED_URLS = [
+    ("License: MIT", "https://img.shields.io/badge/License-MIT-yellow.svg", "https://opensource.org/licenses/MIT"),
+    ("Python", "https://img.shields.io/badge/python-3.11-blue.svg", "https://www.python.org/downloads/"),
+    ("Docker", "https://img.shields.io/badge/docker-ready-2496ED.svg", "https://hub.docker.com/"),
+    ("Discord", "https://img.shields.io/discord/1128867683291627614", "https://discord.gg/ollama"),
+    ("Kubernetes", "https://img.shields.io/badge/k8s-1.29-326CE5.svg", "https://kubernetes.io/docs/home/"),
+    ("NuGet", "https://img.shields.io/nuget/v/Newtonsoft.Json.svg", "https://www.nuget.org/packages/Newtonsoft.Json"),
+    ("PyPI", "https://img.shields.io/pypi/v/requests.svg", "https://pypi.org/project/requests/"),
+    ("Docs", "https://img.shields.io/badge/docs-learn-0078D4.svg", "https://learn.microsoft.com/dotnet/"),
+]
+WORDS = ("system daten analyse modell agent pipeline sicherheit richtlinie plattform web docker "
+         "kubernetes vault design medien hologramm ethik zertifikat lizenz codex manifest "
+         "innovation dokumentation bericht struktur version archiv").split()
+# Anzahl unterschiedlicher Repository-Namen; danach wiederholen sie sich wie
+# die "(1)"-Duplikate im echten Bericht
+REPO_NAMES = 5000
+
+
+def _repo_block(rng, number, fmt):
+    """Ein Repository-Abschnitt: Überschrift, Beschreibung mit Bild und Badges, Links, Metadaten"""
+    name = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{rng.randrange(REPO_NAMES)}"
+    org = f"org{rng.randrange(97)}"
+    text = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))).capitalize() + '.'
+            for _ in range(rng.randint(4, 14))]
+    images = []
+    if rng.random() < 0.3:
+        images.append((f"Bild {number}", f"https://github.com/user-attachments/assets/{rng.getrandbits(128):032x}"))
+    badges = rng.sample(SHARED_URLS, rng.randint(0, 3))
+    links = [f"https://github.com/{org}/{name}"]
+    if rng.random() < 0.2:
+        links.append(f"https://{name}.lovable.app")
+    if rng.random() < 0.1:
+        links.append(f"https://{rng.getrandbits(64):016x}.supabase.co")
+    if rng.random() < 0.3:
+        links.append(f"https://docs.{org}.dev/{name}/getting-started")
+    keywords = ', '.join(sorted(rng.sample(WORDS, 6)))
+    files = rng.randint(1, 400)
+
+    if fmt == 'html':
+        parts = [f'<section class="repo">\n<h3>{number}. {name}</h3>\n<p><strong>📝 Beschreibung:</strong></p>\n']
+        parts.extend(f'<p><img src="{url}" alt="{alt}"></p>\n' for alt, url in images)
+        parts.extend(f'<p>{line}</p>\n' for line in text)
+        parts.extend(f'<a href="{link}"><img src="{badge}" alt="{alt}"></a>\n' for alt, badge, link in badges)
+        parts.append('<ul class="links">\n')
+        parts.extend(f'<li><a href="{link}">{link}</a></li>\n' for link in links)
+        parts.append(f'</ul>\n<p>🏷️ Keywords: {keywords}</p>\n<p>📊 Dateien: {files}</p>\n</section>\n')
+        return ''.join(parts)
+
+    parts = [f"### {number}. {name}\n\n**📝 Beschreibung:**\n\n"]
+    parts.extend(f"![{alt}]({url})\n\n" for alt, url in images)
+    parts.extend(f"{line}\n" for line in text)
+    if badges:
+        parts.append('\n' + ' '.join(f"[![{alt}]({badge})]({link})" for alt, badge, link in badges) + '\n')
+    parts.append("\n[... gekürzt ...]\n\n\n**🔗 Links:**\n")
+    parts.extend(f"- {link}\n" for link in links)
+    parts.append(f"\n\n**🏷️ Keywords:** {keywords}\n\n\n**📊 Metadaten:**\n- Dateien: {files}\n"
+                 f"- README vorhanden: ✓ Ja\n\n---\n\n")
+    return ''.join(parts)
+
+
+def iter_report(fmt='markdown', seed=42):
+    """Endloser Bericht in Blöcken (Kopf, dann Kategorien mit je 30 Repositories)"""
+    rng = random.Random(seed)
+    if fmt == 'html':
+        yield ('<!DOCTYPE html>\n<html lang="de">\n<head>\n<meta charset="utf-8">\n'
+               '<title>📊 Repository Analyse</title>\n'
+               '<style>.hero { background: url(https://cdn.example.org/hero.png); }</style>\n'
+               '</head>\n<body>\n<h1>📊 REPOSITORY ANALYSE - VOLLSTÄNDIGER BERICHT</h1>\n')
+    else:
+        yield "# 📊 REPOSITORY ANALYSE - VOLLSTÄNDIGER BERICHT\n\n**Analysierte Repositories: viele**\n\n---\n\n"
+    number = 0
+    while True:
+        category = CATEGORIES[(number // 30) % len(CATEGORIES)]
+        if fmt == 'html':
+            yield f'<h2>🏷️ {category} (30 Repos)</h2>\n'
+        else:
+            yield f"\n## 🏷️ {category} (30 Repos)\n\n\n"
+        for _ in range(30):
+            number += 1
+            yield _repo_block(rng, number, fmt)
+
+
+def write_report(path, size_mb, fmt='markdown', seed=42):
+    """Schreibt einen Bericht mit mindestens size_mb MB (gleiche Parameter = gleiche Datei)"""
+    target = int(size_mb * 1e6)
+    written = 0
+    with open(path, 'wb') as f:
+        for block in iter_report(fmt, seed):
+            data = block.encode('utf-8')
+            f.write(data)
+            written += len(data)
+            if written >= target:
+                break
+        if fmt == 'html':
+            written += f.write(b'</body>\n</html>\n')
+    return written
+
+
+def corpus_path(directory, size_mb, fmt, seed):
+    return os.path.join(directory, f"bericht-{size_mb:g}MB-s{seed}-v{GENERATOR_VERSION}{FORMATS[fmt]}")
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def run_scripts(path):
+    """Die vier Skripte nacheinander, Ausgaben im aktuellen Verzeichnis, Konsole nach /dev/null"""
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        extract_all_urls.main([path, '--no-cache', '--console', 'quiet'])
+        create_csv_export.main([])
+        extract_all_urls_with_duplicates.main([path, '-o', 'ALLE_URLS_MIT_DUPLIKATEN.txt', '--console', 'quiet'])
+        url_extraction.main([path])
+
+
+# Jede Stufe bereitet ihre Eingaben vor (nicht gemessen) und gibt eine
+# Funktion zurück, die gemessen wird. Deren Ergebnis ist eine Kennzahl der
+# Ausgabe (z.B. Anzahl URLs), damit --compare auch Verhaltensänderungen meldet.
+
+def stage_tokenize(path, fmt, workdir):
+    return lambda: len(extract_all_urls.extract_urls_from_file(path))
+
+
+def stage_tokenize_mmap(path, fmt, workdir):
+    return lambda: len(extract_all_urls.extract_urls_from_file(path, use_mmap=True))
+
+
+def stage_classify(path, fmt, workdir):
+    urls = sorted(set(extract_all_urls.extract_urls_from_file(path)))
+    return lambda: len({classify_url(url).type for url in urls})
+
+
+def stage_categorize(path, fmt, workdir):
+    urls = sorted(set(extract_all_urls.extract_urls_from_file(path)))
+    return lambda: sum(len(extract_all_urls.categorize_url(url)['description']) for url in urls)
+
+
+def stage_context(path, fmt, workdir):
+    content = _read(path)
+    if fmt == 'html':
+        return lambda: len(build_structured_index(content, 'html', with_counts=True))
+    return lambda: len(extract_all_urls.build_context_index(content, with_counts=True))
+
+
+def _analyze(content, fmt):
+    if fmt == 'html':
+        return extract_all_urls.analyze_structured(content, 'html')
+    return extract_all_urls.analyze_content(content)
+
+
+def stage_analyze(path, fmt, workdir):
+    content = _read(path)
+    return lambda: _analyze(content, fmt)[0]
+
+
+def stage_writers(path, fmt, workdir):
+    _, categorized = _analyze(_read(path), fmt)
+    by_type, by_category = extract_all_urls.group_urls(categorized)
+    stats = extract_all_urls.compute_statistics(categorized)
+    type_counts = {url_type: len(items) for url_type, items in by_type.items()}
+    output_data = extract_all_urls.build_output_data(categorized, by_type, by_category, stats)
+
+    def run():
+        sinks = [JsonSink(os.path.join(workdir, 'URL_ANALYSE_RESULTS.json'), output_data),
+                 extract_all_urls.AnalyseReportSink(os.path.join(workdir, 'URL_ANALYSE_REPORT.md'),
+                                                    path, stats, type_counts),
+                 CsvSink(os.path.join(workdir, 'URL_LISTE_VOLLSTAENDIG.csv')),
+                 MarkdownTableSink(os.path.join(workdir, 'URL_TABELLE.md'))]
+        return sum(timing['chars'] for timing in write_sinks(categorized, sinks))
+    return run
+
+
+def stage_mentions(path, fmt, workdir):
+    def run():
+        all_urls = extract_all_urls_with_duplicates.extract_all_urls_with_context(path)
+        stats = extract_all_urls_with_duplicates.aggregate_mentions(all_urls)
+        run_sink(extract_all_urls_with_duplicates.MentionReportSink(
+            os.path.join(workdir, 'ALLE_URLS_MIT_DUPLIKATEN.txt'), stats), all_urls)
+        return stats.total
+    return run
+
+
+def stage_end_to_end(path, fmt, workdir):
+    path = os.path.abspath(path)
+
+    def run():
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            run_scripts(path)
+        finally:
+            os.chdir(cwd)
+        with open(os.path.join(workdir, 'URL_ANALYSE_RESULTS.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)['total_urls']
+    return run
+
+
+STAGES = {
+    'tokenize': stage_tokenize,
+    'tokenize_mmap': stage_tokenize_mmap,
+    'classify': stage_classify,
+    'categorize': stage_categorize,
+    'context': stage_context,
+    'analyze': stage_analyze,
+    'writers': stage_writers,
+    'mentions': stage_mentions,
+    'end_to_end': stage_end_to_end,
+}
+
+
+def _run_stage(stage, path, fmt, repeat):
+    """Läuft im frischen Prozess: Vorbereitung, dann repeat gemessene Durchläufe"""
+    with tempfile.TemporaryDirectory() as workdir:
+        run = STAGES[stage](path, fmt, workdir)
+        seconds = []
+        result = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            seconds.append(time.perf_counter() - start)
+    return {'seconds': seconds, 'result': result,
+            'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def measure(stage, path, fmt, repeat):
+    """Eine Stufe in einem eigenen Prozess; bei Absturz ein Eintrag mit 'error'"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+        try:
+            return pool.submit(_run_stage, stage, path, fmt, repeat).result()
+        except BrokenProcessPool:
+            return {'error': "Prozess abgebrochen (Speichermangel?)"}
+        except Exception as exc:
+            return {'error': f"{type(exc).__name__}: {exc}"}
+
+
+def environment(seed, repeat):
+    """Commit, Interpreter und Maschine, damit Ergebnisse vergleichbar bleiben"""
+    root = os.path.dirname(os.path.abspath(__file__))
+
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=root, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'commit': git('rev-parse', '--short', 'HEAD'),
+        'dirty': bool(status) if status is not None else None,
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'generator_version': GENERATOR_VERSION,
+        'seed': seed,
+        'repeat': repeat,
+    }
+
+
+def run_suite(sizes, formats, stages, repeat, corpus_dir, seed=42, log=print):
+    """Misst alle Kombinationen; gibt die Ergebnisliste für das JSON zurück"""
+    results = []
+    for fmt in formats:
+        for size_mb in sizes:
+            path = corpus_path(corpus_dir, size_mb, fmt, seed)
+            if not os.path.exists(path):
+                log(f"📝 Erzeuge {os.path.basename(path)}...")
+                write_report(path, size_mb, fmt, seed)
+            actual_mb = os.path.getsize(path) / 1e6
+            runs = repeat if size_mb < SINGLE_RUN_MB else 1
+            for stage in stages:
+                entry = {'name': f"{fmt}/{size_mb:g}MB/{stage}", 'format': fmt, 'size_mb': actual_mb,
+                         'stage': stage}
+                entry.update(measure(stage, path, fmt, runs))
+                if 'error' not in entry:
+                    entry['median'] = statistics.median(entry['seconds'])
+                    entry['min'] = min(entry['seconds'])
+                    entry['mb_per_s'] = actual_mb / entry['median'] if entry['median'] else None
+                    log(f"  {entry['name']:32s} {entry['median'] * 1000:10.1f} ms  "
+                        f"{entry['mb_per_s']:8.1f} MB/s  RSS {entry['peak_rss_mb']:7.0f} MB  "
+                        f"(Ergebnis {entry['result']})")
+                else:
+                    log(f"  {entry['name']:32s} ❌ {entry['error']}")
+                results.append(entry)
+    return results
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Vergleicht die Mediane zweier Läufe: [(Name, alt, neu, Verhältnis, Status)]"""
+    old = {entry['name']: entry for entry in baseline['results']}
+    rows = []
+    for entry in current['results']:
+        before = old.get(entry['name'])
+        if before is None or 'median' not in before or 'median' not in entry:
+            continue
+        ratio = entry['median'] / before['median'] if before['median'] else float('inf')
+        if before.get('result') != entry.get('result'):
+            status = 'changed'
+        elif ratio > 1 + threshold:
+            status = 'slower'
+        elif ratio < 1 / (1 + threshold):
+            status = 'faster'
+        else:
+            status = 'same'
+        rows.append((entry['name'], before, entry, ratio, status))
+    return rows
+
+
+def print_comparison(rows, baseline, current):
+    symbols = {'slower': '❌ langsamer', 'faster': '✅ schneller', 'same': '', 'changed': '⚠️  Ergebnis geändert'}
+    print(f"\n📊 VERGLEICH {baseline['environment'].get('commit')} -> {current['environment'].get('commit')}")
+    print("=" * 100)
+    for name, before, after, ratio, status in rows:
+        note = symbols[status]
+        if status == 'changed':
+            note += f" ({before.get('result')} -> {after.get('result')})"
+        print(f"  {name:32s} {before['median'] * 1000:10.1f} ms -> {after['median'] * 1000:10.1f} ms  "
+              f"{(ratio - 1) * 100:+6.1f}%  {note}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark-Suite mit JSON-Ergebnissen")
+    parser.add_argument('--sizes', type=float, nargs='+', default=DEFAULT_SIZES, metavar='MB',
+                        help="Berichtsgrößen in MB (Standard: 1 100 1000)")
+    parser.add_argument('--formats', nargs='+', choices=sorted(FORMATS), default=['markdown', 'html'])
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=5,
+                        help=f"Messungen pro Stufe (Eingaben ab {SINGLE_RUN_MB} MB: eine)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--corpus-dir', default=None,
+                        help="Erzeugte Berichte hier ablegen und wiederverwenden (Standard: temporär)")
+    parser.add_argument('-o', '--output', default=None,
+                        help="JSON-Ergebnis (Standard: benchmark_results/<commit>.json)")
+    parser.add_argument('--compare', metavar='BASELINE',
+                        help="Mit einem früheren JSON-Ergebnis vergleichen; Exit-Code 1 bei Regression")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Relative Verlangsamung, ab der eine Regression gemeldet wird")
+    parser.add_argument('--generate', metavar='PATH',
+                        help="Nur einen Bericht erzeugen (erste Größe und erstes Format) und beenden")
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        written = write_report(args.generate, args.sizes[0], args.formats[0], args.seed)
+        print(f"✅ {args.generate}: {written / 1e6:.1f} MB ({args.formats[0]}, Seed {args.seed})")
+        return 0
+
+    env = environment(args.seed, args.repeat)
+    print(f"⏱️  Benchmark-Suite @ {env['commit']}{' (geändert)' if env['dirty'] else ''}, "
+          f"Python {env['python']}, {env['cpu_count']} CPUs")
+    with contextlib.ExitStack() as stack:
+        corpus_dir = args.corpus_dir
+        if corpus_dir is None:
+            corpus_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        else:
+            os.makedirs(corpus_dir, exist_ok=True)
+        results = run_suite(args.sizes, args.formats, args.stages, args.repeat, corpus_dir, args.seed)
+
+    current = {'environment': env, 'results': results}
+    output = args.output
+    if output is None:
+        output = os.path.join('benchmark_results', f"{env['commit'] or 'unknown'}{'-dirty' if env['dirty'] else ''}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(current, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Ergebnisse gespeichert: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare(baseline, current, args.threshold)
+        print_comparison(rows, baseline, current)
+        if any(status in ('slower', 'changed') for *_, status in rows):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
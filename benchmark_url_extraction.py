@@ -0,0 +1,1085 @@
+#!/usr/bin/env python3
+"""
+Benchmarks für die URL-Extraktions-Skripte
+Erzeugt synthetische Berichte und misst die Laufzeit einzelner Stufen
+"""
+
+import argparse
+import asyncio
+import contextlib
+import csv
+import html
+import json
+import multiprocessing
+import os
+import resource
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from itertools import islice
+
+import benchmark_suite
+import create_csv_export
+import extract_all_urls
+import extract_all_urls_with_duplicates
+import url_cache
+import url_canonical
+import url_classifier
+import url_columnar
+import url_corpus_scan
+import url_db_loader
+import url_extraction
+import url_index
+import url_link_checker
+import url_memo
+import url_metrics
+import url_sinks
+import url_sketches
+import url_streaming
+import url_structure
+import url_tokenizer
+import url_stub_server
+import url_watch
+
+
+def generate_report(num_lines, num_urls, seed=42):
+    """Erzeugt einen synthetischen Bericht im Stil von ANALYSE_BERICHT.md"""
+    rng = random.Random(seed)
+    urls = [f"https://github.com/org{i % 97}/repo-{i}" for i in range(num_urls)]
+    lines = []
+    repo_nr = 0
+    for line_num in range(num_lines):
+        if line_num % 500 == 0:
+            lines.append(f"## 🏷️ KATEGORIE {line_num // 500}")
+        elif line_num % 25 == 0:
+            repo_nr += 1
+            lines.append(f"### {repo_nr}. repo-{repo_nr}")
+        elif rng.random() < 0.2:
+            lines.append(f"- **URL:** {rng.choice(urls)}")
+        else:
+            lines.append("Lorem ipsum dolor sit amet, consectetur adipiscing elit.")
+    return '\n'.join(lines)
+
+
+def legacy_extract_context_from_section(content, url):
+    """Ursprüngliche O(URLs × Zeilen) Kontext-Suche (Referenz)"""
+    lines = content.split('\n')
+    context = "Unknown"
+
+    for i, line in enumerate(lines):
+        if url in line:
+            for j in range(max(0, i-20), i):
+                if lines[j].startswith('### '):
+                    context = lines[j].replace('### ', '').strip()
+                    break
+                elif lines[j].startswith('## '):
+                    context = lines[j].replace('## ', '').strip()
+                    break
+            break
+
+    return context
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_context(args):
+    """Kontext-Auflösung: alter Zeilen-Scan vs. Einmal-Index"""
+    content = generate_report(args.lines, args.urls)
+    unique_urls = sorted(set(extract_all_urls.extract_urls_from_text(content)))
+    print(f"Synthetischer Bericht: {args.lines} Zeilen, {len(unique_urls)} unique URLs")
+
+    def indexed():
+        index = extract_all_urls.build_context_index(content)
+        return {url: extract_all_urls.extract_context_from_section(content, url, index)
+                for url in unique_urls}
+
+    def legacy():
+        return {url: legacy_extract_context_from_section(content, url)
+                for url in unique_urls}
+
+    _, t_new = timed(indexed)
+    print(f"  Index (neu):        {t_new:8.3f} s")
+    if args.skip_legacy:
+        return
+    _, t_old = timed(legacy)
+    print(f"  Zeilen-Scan (alt):  {t_old:8.3f} s")
+    print(f"  Speedup:            {t_old / t_new:8.1f}x")
+
+
+def bench_classify(args):
+    """Klassifikation von N URLs über den kompilierten Domain-Trie"""
+    rng = random.Random(7)
+    hosts = [rule[0] for rule in url_classifier.DOMAIN_RULES]
+    hosts += ['img.shields.io', 'learn.microsoft.com', 'hub.docker.com',
+              'example.org', 'www.typescriptlang.org', 'app.onbiela.dev']
+    pool = [f"https://{rng.choice(hosts)}/path/{i}?q={i % 13}" for i in range(10_000)]
+    pool += [f"https://github.com/user-attachments/assets/{i:08x}" for i in range(1_000)]
+    urls = [rng.choice(pool) for _ in range(args.count)]
+
+    def classify_all():
+        classify = url_classifier.classify_url
+        for url in urls:
+            classify(url)
+
+    _, elapsed = timed(classify_all)
+    print(f"Klassifiziert: {len(urls)} URLs in {elapsed:.3f} s "
+          f"({len(urls) / elapsed:,.0f} URLs/s, {len(url_classifier.DOMAIN_RULES)} Regeln)")
+
+
+def bench_memo(args):
+    """URL-Memo: classify_url()/canonicalize() pro Erwähnung vs. LRU, kleine Kapazität, Datei"""
+    rng = random.Random(7)
+    hosts = [rule[0] for rule in url_classifier.DOMAIN_RULES] + ['example.org', 'app.onbiela.dev']
+    pool = [f"https://{rng.choice(hosts)}/path/{i}?q={i % 13}" for i in range(10_000)]
+    pool += generate_url_variants(1_000)
+    # Wenige URLs werden sehr oft erwähnt (wie Repos und Badges in echten Berichten)
+    urls = rng.choices(pool, weights=[1 / (rank + 1) for rank in range(len(pool))], k=args.count)
+    print(f"{len(urls):,} Erwähnungen, {len(set(urls)):,} unique URLs")
+
+    def run(classify, canonicalize):
+        for url in urls:
+            classify(url)
+            canonicalize(url)
+
+    if not args.skip_legacy:
+        _, elapsed = timed(run, url_classifier.classify_url, url_canonical.canonicalize)
+        print(f"  Ohne Memo:            {elapsed:6.3f} s")
+    for capacity in (url_memo.DEFAULT_CAPACITY, 1_000):
+        memo = url_memo.UrlMemo(capacity)
+        _, elapsed = timed(run, memo.classify, memo.canonicalize)
+        print(f"  Memo {capacity:>7,}:        {elapsed:6.3f} s  ({memo.summary()})")
+
+    # Persistente Stufe: zwei Läufe über die unique URLs, der zweite startet warm
+    unique = list(dict.fromkeys(urls))
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        path = os.path.join(tmp, 'memo.sqlite')
+        for label in ("Datei kalt", "Datei warm"):
+            def persistent():
+                memo = url_memo.UrlMemo(path=path)
+                for url in unique:
+                    memo.classify(url)
+                    memo.canonicalize(url)
+                memo.close()
+                return memo
+            memo, elapsed = timed(persistent)
+            print(f"  {label + ':':21s} {elapsed:6.3f} s  ({memo.summary()})")
+
+
+def bench_sinks(args):
+    """Ausgabe: print()/write() pro Zeile nacheinander vs. gepufferte Sinks im Thread-Pool"""
+    records = [dict(zip(url_columnar.COLUMNS, row)) for row in _synthetic_rows(args.count)]
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        paths = {name: os.path.join(tmp, name) for name in ('a.json', 'a.jsonl', 'a.csv', 'a.md')}
+
+        def legacy():
+            with open(paths['a.json'], 'w', encoding='utf-8') as f:
+                json.dump({'all_urls': records}, f, indent=2, ensure_ascii=False)
+            with open(paths['a.jsonl'], 'w', encoding='utf-8') as f:
+                for item in records:
+                    f.write(json.dumps(item, ensure_ascii=False))
+                    f.write('\n')
+            with open(paths['a.csv'], 'w', encoding='utf-8', newline='') as f:
+                writer = csv.writer(f)
+                for i, item in enumerate(records, 1):
+                    writer.writerow([i, item['url'], item['type'], item['category'], item['domain'],
+                                     item['context'], item['description']])
+            with open(paths['a.md'], 'w', encoding='utf-8') as f:
+                for i, item in enumerate(records, 1):
+                    f.write(f"| {i} | `{item['url']}` | {item['type']} | {item['category']} | "
+                            f"{item['domain']} | {item['context']} | {item['description']} |\n")
+
+        if not args.skip_legacy:
+            _, legacy_time = timed(legacy)
+            print(f"Einzelne Writes : {len(records):,} Datensätze, 4 Dateien in {legacy_time:6.2f} s")
+        sinks = [url_sinks.JsonSink(paths['a.json'], {}), url_sinks.JsonLinesSink(paths['a.jsonl']),
+                 url_sinks.CsvSink(paths['a.csv']), url_sinks.MarkdownTableSink(paths['a.md'])]
+        timings, elapsed = timed(url_sinks.write_sinks, records, sinks)
+        print(f"Gepufferte Sinks: {len(records):,} Datensätze, 4 Dateien in {elapsed:6.2f} s")
+        url_sinks.print_sink_timings(timings)
+
+    # Konsolenliste nach /dev/null: fünf print() pro URL vs. ein write() pro Paket
+    type_counts = {}
+    for item in records:
+        type_counts[item['type']] = type_counts.get(item['type'], 0) + 1
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        def legacy_console():
+            for i, item in enumerate(sorted(records, key=lambda x: (x['type'], x['url'])), 1):
+                print(f"\n{i}. {item['url']}")
+                print(f"   Typ: {item['type']}")
+                print(f"   Kategorie: {item['category']}")
+                print(f"   Kontext: {item['context']}")
+                print(f"   Beschreibung: {item['description']}")
+        _, print_time = timed(legacy_console)
+        _, sink_time = timed(url_sinks.run_sink, extract_all_urls.DetailListingSink('-', type_counts), records)
+    print(f"Konsole print() : {print_time:6.2f} s, Sink: {sink_time:6.2f} s")
+
+
+def legacy_mention_stats(all_urls):
+    """Bisherige Kennzahlen eines Berichts: Gruppierung, Zähler und set() pro Abschnitt neu"""
+    by_type = defaultdict(list)
+    for item in all_urls:
+        by_type[item['type']].append(item)
+    sorted_types = sorted(by_type.items(), key=lambda x: len(x[1]), reverse=True)
+    unique = len(set(u['url'] for u in all_urls))
+    url_counts = defaultdict(int)
+    for item in all_urls:
+        url_counts[item['url']] += 1
+    sorted_urls = sorted(url_counts.items(), key=lambda x: x[1], reverse=True)
+    type_unique = [len(set(u['url'] for u in items)) for _, items in sorted_types]
+    total_unique = len(set(u['url'] for u in all_urls))
+    return unique, sorted_urls[:20], type_unique, total_unique
+
+
+def bench_mentions(args):
+    """Duplikat-Bericht: Kennzahlen pro Renderer neu vs. ein aggregate_mentions()"""
+    rng = random.Random(5)
+    types = ['GitHub Repository', 'Documentation', 'Package', 'Website', 'API', 'Other']
+    pool = [{'url': f"https://github.com/org{i % 97}/repo-{i}", 'type': rng.choice(types),
+             'line': i, 'repo': f"repo-{i % 500}", 'category': f"KATEGORIE {i % 12}",
+             'context': f"- **URL:** https://github.com/org{i % 97}/repo-{i}"}
+            for i in range(min(args.mentions, 200_000))]
+    # Zipf-artige Häufigkeiten, damit es echte Duplikate gibt
+    weights = [1 / (rank + 1) for rank in range(len(pool))]
+    all_urls = rng.choices(pool, weights, k=args.mentions)
+
+    if not args.skip_legacy:
+        def legacy():
+            # Konsole und Datei haben die Kennzahlen jeweils selbst berechnet, main() noch einmal
+            for _ in range(2):
+                legacy_mention_stats(all_urls)
+            return len(set(u['url'] for u in all_urls))
+        _, legacy_time = timed(legacy)
+        print(f"Bisher (2 Berichte): {len(all_urls):,} Erwähnungen in {legacy_time:6.2f} s")
+    stats, elapsed = timed(extract_all_urls_with_duplicates.aggregate_mentions, all_urls)
+    print(f"aggregate_mentions : {len(all_urls):,} Erwähnungen in {elapsed:6.2f} s "
+          f"({stats.unique:,} unique, {len(stats.repo_counts)} Repos, {len(stats.category_counts)} Kategorien)")
+    top, top_time = timed(stats.top_urls, 20)
+    print(f"Top 20 per Heap    : {top_time * 1000:8.1f} ms (häufigste: {top[0][1]:,}x)")
+    if not args.skip_legacy:
+        print(f"Speedup            : {legacy_time / (elapsed + top_time):.1f}x")
+
+
+def _write_report(path, num_lines, num_urls):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(generate_report(num_lines, num_urls))
+
+
+def _mention_records(mode, path):
+    if mode == 'dicts':
+        all_urls = list(extract_all_urls_with_duplicates.iter_mentions_with_context(path))
+    else:
+        all_urls = extract_all_urls_with_duplicates.extract_all_urls_with_context(path)
+    stats = extract_all_urls_with_duplicates.aggregate_mentions(all_urls)
+    return stats.total
+
+
+def bench_records(args):
+    """Erwähnungen einer Datei: ein Dict pro Erwähnung vs. MentionTable (Spitzen-RSS)"""
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        path = os.path.join(tmp, 'bericht.md')
+        # Auch den Bericht in einem eigenen Prozess erzeugen: ru_maxrss des
+        # Elternprozesses wird an die Messprozesse vererbt
+        run_isolated(_write_report, path, args.lines, args.urls)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"Bericht {size_mb:.1f} MB")
+        results = {}
+        for mode in (['table'] if args.skip_legacy else ['dicts', 'table']):
+            count, elapsed, base, peak = run_isolated(_mention_records, mode, path)
+            results[mode] = peak - base
+            print(f"  {mode:6s}: {count:,} Erwähnungen in {elapsed:6.2f} s, "
+                  f"Spitze +{peak - base:8.1f} MB ({(peak - base) * 1e6 / count:6.0f} Byte/Erwähnung)")
+        # Bei kleinen Berichten liegt die Tabelle unter der Messgenauigkeit von ru_maxrss
+        if len(results) == 2 and results['table'] > 0:
+            print(f"  Speicher: {results['dicts'] / results['table']:.1f}x weniger")
+
+        # Sequenz-Zugriff auf eine kleine Tabelle: Slices wie bei der Liste der Dicts
+        small_path = os.path.join(tmp, 'klein.md')
+        _write_report(small_path, 2_000, 200)
+        expected = list(extract_all_urls_with_duplicates.iter_mentions_with_context(small_path))
+        with extract_all_urls_with_duplicates.read_mentions(small_path) as table:
+            for index in (slice(3, 40), slice(None, None, -1), slice(-25, None, 3), slice(10**6, None)):
+                assert list(table[index].records()) == expected[index], index
+            assert list(table[5:60][2:30:4].records()) == expected[5:60][2:30:4]
+            assert table[-1]['context'] == table[len(table) - 1]['context'] == expected[-1]['context']
+        # Nach close() wird die Quelldatei bei Bedarf neu abgebildet
+        assert table[0]['context'] == expected[0]['context']
+        table.close()
+
+
+def generate_url_variants(count, seed=17):
+    """URLs mit typischen Schreibvarianten: '.git', '/', Großschreibung, Port, Tracking-Parameter"""
+    rng = random.Random(seed)
+    bases = [f"https://github.com/org{i % 97}/repo-{i}" for i in range(max(count // 10, 1))]
+    badges = [f"https://img.shields.io/badge/tool{i}-v{i % 9}-blue" for i in range(max(count // 50, 1))]
+    variants = [
+        lambda url: url,
+        lambda url: url + '.git',
+        lambda url: url + '/',
+        lambda url: url.replace('https://github.com', 'https://GitHub.com:443'),
+        lambda url: url + '?utm_source=newsletter&utm_medium=mail',
+        lambda url: url + '#readme',
+    ]
+    urls = []
+    for _ in range(count):
+        if rng.random() < 0.2:
+            style = rng.choice(['flat', 'for-the-badge'])
+            urls.append(f"{rng.choice(badges)}?style={style}&logo=x")
+        else:
+            urls.append(rng.choice(variants)(rng.choice(bases)))
+    return urls
+
+
+def bench_canonical(args):
+    """Kanonisierung: canonicalize() pro Erwähnung vs. canonicalize_batch()"""
+    urls = generate_url_variants(args.count)
+    if not args.skip_legacy:
+        _, single_time = timed(lambda: [url_canonical.canonicalize(url) for url in urls])
+        print(f"canonicalize()      : {len(urls):,} URLs in {single_time:6.2f} s "
+              f"({len(urls) / single_time * 60 / 1e6:5.1f} Mio./min)")
+    forms, batch_time = timed(url_canonical.canonicalize_batch, urls)
+    print(f"canonicalize_batch(): {len(urls):,} URLs in {batch_time:6.2f} s "
+          f"({len(urls) / batch_time * 60 / 1e6:5.1f} Mio./min)")
+    # IPv6-Literale behalten ihre Klammern
+    assert url_canonical.canonicalize('http://[::1]:8080/x') == 'http://[::1]:8080/x'
+    assert url_canonical.canonicalize('https://[2001:DB8::1]:443/a/') == 'https://[2001:db8::1]/a'
+    counts = Counter(forms)
+    clusters, cluster_time = timed(url_canonical.near_duplicate_clusters, counts)
+    print(f"Unique roh {len(set(urls)):,} -> kanonisch {len(counts):,}; "
+          f"{len(clusters):,} Gruppen naher Duplikate in {cluster_time:6.2f} s")
+
+
+SKETCH_SETTINGS = [
+    # (HLL-Fehler, Count-Min epsilon, Space-Saving-Kandidaten)
+    (0.05, 1e-3, 100),
+    (0.01, 1e-4, 1000),
+    (0.005, 1e-5, 5000),
+]
+
+
+def bench_sketch(args):
+    """Sketch-Modus: Genauigkeit und Speicher gegenüber exakten Zählern"""
+    rng = random.Random(13)
+    num_urls = max(args.count // 5, 1)
+    types = ['github-repo', 'badge', 'documentation', 'registry', 'other']
+    pool = [(f"https://host{i % 1009}.example/{i}", types[i % len(types)], f"host{i % 1009}.example")
+            for i in range(num_urls)]
+    weights = [1 / (rank + 1) for rank in range(num_urls)]
+    mentions = rng.choices(pool, weights, k=args.count)
+
+    def exact():
+        counts = Counter(url for url, _, _ in mentions)
+        type_urls = defaultdict(set)
+        type_domains = defaultdict(set)
+        for url, url_type, domain in mentions:
+            type_urls[url_type].add(url)
+            type_domains[url_type].add(domain)
+        return counts, type_urls, type_domains
+
+    tracemalloc.start()
+    (counts, type_urls, _), exact_time = timed(exact)
+    exact_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    true_top = [url for url, _ in counts.most_common(20)]
+    print(f"Exakt: {len(mentions):,} Erwähnungen, {len(counts):,} unique URLs in {exact_time:6.2f} s, "
+          f"{exact_bytes / 1e6:7.1f} MB")
+
+    for error, epsilon, capacity in SKETCH_SETTINGS:
+        def build():
+            sketch = url_sketches.MentionSketch(error, epsilon, 0.01, capacity)
+            for url, url_type, domain in mentions:
+                sketch.add(url, url_type, domain)
+            return sketch
+        sketch, elapsed = timed(build)
+        unique_error = abs(sketch.unique() - len(counts)) / len(counts)
+        type_error = max(abs(estimate - len(type_urls[url_type])) / len(type_urls[url_type])
+                         for url_type, _, estimate, _ in sketch.by_type())
+        top = sketch.top_urls(20)
+        recall = len({url for url, _ in top} & set(true_top)) / len(true_top)
+        overestimate = max(count - counts[url] for url, count in top)
+        print(f"  HLL ±{error:<5g} ε={epsilon:<6g} k={capacity:<5d}: {sketch.nbytes() / 1e6:6.2f} MB, "
+              f"{elapsed:6.2f} s, Unique-Fehler {unique_error:6.2%} (pro Typ max {type_error:6.2%}), "
+              f"Top-20-Recall {recall:4.0%}, max. Überschätzung {overestimate}")
+
+
+LEGACY_KEYWORDS = [kw for _, kw in url_extraction.CATEGORY_KEYWORDS]
+
+
+def legacy_categorize_url(url):
+    """Bisherige Kategorisierung aus url_extraction.py (8 any()-Scans pro Aufruf)"""
+    url_type = url_classifier.classify_url(url).type
+    for (category, _), keywords in zip(url_extraction.CATEGORY_KEYWORDS, LEGACY_KEYWORDS):
+        if any(keyword in url.lower() for keyword in keywords):
+            return url_type, category
+    return url_type, "other"
+
+
+def bench_keywords(args):
+    """url_extraction: 3x Kategorisieren + 2x Beschreibung pro URL vs. einmal build_records"""
+    rng = random.Random(11)
+    hosts = [rule[0] for rule in url_classifier.DOMAIN_RULES] + ['example.org', 'files.example.net']
+    words = ['repo', 'project', 'assets', 'v2', 'index', 'docs', 'policy', 'media', 'x7', 'build']
+    urls = [f"https://{rng.choice(hosts)}/{rng.choice(words)}-{i}/{rng.choice(words)}"
+            for i in range(args.count)]
+
+    def legacy():
+        # Gruppierung, Detailausgabe und Textdatei klassifizieren jeweils neu
+        for url in sorted(urls):
+            legacy_categorize_url(url)
+        for _ in range(2):
+            for url in sorted(urls):
+                url_type, _ = legacy_categorize_url(url)
+                url_extraction.get_repo_name(url)
+                url_extraction.get_description(url, url_type)
+
+    if not args.skip_legacy:
+        _, legacy_time = timed(legacy)
+        print(f"Bisher      : {len(urls):,} URLs in {legacy_time:6.2f} s")
+    records, elapsed = timed(url_extraction.build_records, urls)
+    print(f"build_records: {len(records):,} URLs in {elapsed:6.2f} s")
+    if not args.skip_legacy:
+        print(f"Speedup     : {legacy_time / elapsed:.1f}x")
+
+
+def bench_stream(args):
+    """Streaming-Extraktion: Laufzeit und Python-Spitzenspeicher"""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'report.md')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write(generate_report(args.lines, args.urls))
+        size_mb = os.path.getsize(source) / 1e6
+
+        tracemalloc.start()
+        writers = [url_streaming.JsonLinesWriter(os.path.join(tmp, 'out.jsonl'))]
+        count, elapsed = timed(url_streaming.stream_extract, source, writers)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"Streaming: {size_mb:.1f} MB, {count} Erwähnungen in {elapsed:.3f} s "
+          f"({size_mb / elapsed:.1f} MB/s), Spitzenspeicher {peak / 1e6:.1f} MB")
+
+    # Gemischte Zeilenenden zählen wie readlines() (Universal Newlines), auch über Blockgrenzen
+    rng = random.Random(3)
+    lines = generate_report(2_000, 200).split('\n')
+    text = ''.join(line + rng.choice(['\n', '\r\n', '\r', '\r\r\n', '\n\r']) for line in lines) + 'Ende\r'
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'mixed.md')
+        with open(source, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+        with open(source, 'r', encoding='utf-8') as f:
+            expected = [(i, line.rstrip('\n')) for i, line in enumerate(f.readlines(), 1)]
+        sizes = (1, 2, 7, 4096, url_streaming.CHUNK_SIZE)
+        for size in sizes:
+            got = [(i, line) for i, line, _ in url_streaming.iter_lines(url_streaming.iter_chunks(source, size))]
+            assert got == expected, f"Blockgröße {size}"
+    print(f"Zeilenenden \\r\\n, \\r, \\n = readlines(): ok (Blockgrößen {', '.join(map(str, sizes))})")
+
+
+def bench_corpus(args):
+    """Korpus-Scan: viele kleine Dateien über alle Kerne verteilt"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.files):
+            path = os.path.join(tmp, f"report-{i:05d}.md")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generate_report(args.lines, args.urls, seed=i))
+        files = url_corpus_scan.collect_files([tmp])
+
+        for workers in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            results = url_corpus_scan.scan_corpus(files, workers)
+            url_corpus_scan.merge_results(results)
+            elapsed = time.perf_counter() - start
+            total_mb = sum(r['bytes'] for r in results) / 1e6
+            print(f"Korpus: {len(files)} Dateien, {workers:2d} Prozesse: {elapsed:.2f} s "
+                  f"({len(files) / elapsed:,.0f} Dateien/s, {total_mb / elapsed:.1f} MB/s)")
+
+
+def bench_cache(args):
+    """Inkrementelle Analyse: kalter Lauf, warmer Lauf, ein geänderter Abschnitt"""
+    content = generate_report(args.lines, args.urls)
+    changed = content.replace("Lorem ipsum", "https://example.org/neu Lorem ipsum", 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'cache.sqlite')
+        _, t_plain = timed(extract_all_urls.analyze_content, content)
+        print(f"Ohne Cache:            {t_plain:8.3f} s")
+        for label, text in (("Kalt (Cache leer)", content),
+                            ("Warm (unverändert)", content),
+                            ("Ein Abschnitt neu", changed)):
+            with url_cache.ManifestCache(cache_path) as cache:
+                _, elapsed = timed(extract_all_urls.analyze_content, text, cache, 'report.md')
+            print(f"{label + ':':22s} {elapsed:8.3f} s  ({cache.summary()})")
+
+        # Wiederholt einen Abschnitt ändern: der Cache behält nur die Abschnitte des letzten Stands
+        for i in range(5):
+            text = changed.replace("Lorem ipsum", f"https://example.org/edit-{i} Lorem ipsum", 1)
+            with url_cache.ManifestCache(cache_path) as cache:
+                extract_all_urls.analyze_content(text, cache, 'report.md')
+        with url_cache.ManifestCache(cache_path) as cache:
+            (stored,) = cache.conn.execute("SELECT COUNT(*) FROM sections").fetchone()
+        expected = {url_cache.content_digest(section) for _, section in extract_all_urls.split_sections(text)}
+        assert stored == len(expected), (stored, len(expected))
+        print(f"Nach 5 Änderungen:     {stored:,} Abschnitte im Cache (= aktueller Stand)")
+
+
+def bench_linkcheck(args):
+    """Link-Checker gegen den lokalen Stub-Server (kein Internet)"""
+
+    async def run():
+        stub = url_stub_server.StubServer()
+        port = await stub.start()
+        base = f"http://127.0.0.1:{port}"
+        urls = [f"{base}/ok/{i}" for i in range(args.count)]
+        special = {
+            f"{base}/status/404": 404,
+            f"{base}/no-head/x": 200,
+            f"{base}/flaky/2/a": 200,
+            f"{base}/close/y": 200,
+        }
+        checker = url_link_checker.LinkChecker(concurrency=100, per_host=32, backoff=0.01)
+        start = time.perf_counter()
+        results = await checker.check_all(urls + list(special))
+        elapsed = time.perf_counter() - start
+        await stub.stop()
+
+        for url, expected in special.items():
+            got = results[url]['status']
+            assert got == expected, f"{url}: {got} != {expected}"
+        assert all(results[url]['status'] == 200 for url in urls)
+        print(f"Link-Check: {len(results)} URLs in {elapsed:.3f} s "
+              f"({len(results) / elapsed:,.0f} Prüfungen/s), "
+              f"{sum(p.opened for p in checker.pools.values())} Verbindungen geöffnet, "
+              f"{dict(checker.stats)}")
+
+    asyncio.run(run())
+
+
+def _synthetic_rows(count):
+    types = [rule[1:] + (rule[0],) for rule in url_classifier.DOMAIN_RULES]
+    for i in range(count):
+        url_type, category, description, domain = types[i % len(types)]
+        yield (f"https://{domain}/org{i % 997}/repo-{i}", url_type, category, domain,
+               description, f"{i % 500}. repo-{i % 500}")
+
+
+def _isolated_entry(func, args, queue):
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((result, elapsed, base, peak))
+
+
+def run_isolated(func, *args):
+    """Führt func in einem frischen Prozess aus, damit ru_maxrss nur diesen Lauf misst
+
+    Gibt (Ergebnis, Sekunden, RSS beim Start in MB, Spitzen-RSS in MB) zurück.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_isolated_entry, args=(func, args, queue))
+    proc.start()
+    result, elapsed, base, peak = queue.get()
+    proc.join()
+    return result, elapsed, base / 1024, peak / 1024
+
+
+def _columnar_group(mode, count):
+    if mode == 'dicts':
+        rows = [dict(zip(url_columnar.COLUMNS, row)) for row in _synthetic_rows(count)]
+        groups = {}
+        for row in rows:
+            groups.setdefault(row['type'], []).append(row)
+        return sum(len(v) for v in groups.values())
+    table = url_columnar.UrlTable()
+    for row in _synthetic_rows(count):
+        table.append(*row)
+    return sum(len(v) for v in table.group('type').values())
+
+
+def _export_csv_md(mode, json_path, out_dir):
+    csv_path = os.path.join(out_dir, 'out.csv')
+    md_path = os.path.join(out_dir, 'out.md')
+    if mode == 'json.load':
+        # Bisheriger Weg: ganzes Dokument laden, dann zwei Durchläufe
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        sinks = [url_sinks.CsvSink(csv_path), url_sinks.MarkdownTableSink(md_path)]
+        return url_sinks.write_sinks(data['all_urls'], sinks, workers=1)[0]['rows']
+    if mode == 'stream':
+        records = create_csv_export.load_records(json_path)
+        sinks = [url_sinks.CsvSink(csv_path), url_sinks.MarkdownTableSink(md_path)]
+        return url_sinks.stream_sinks(records, sinks)[0]['rows']
+    # Direkt aus der Extraktion: die Datensätze liegen schon im Speicher,
+    # der JSON-Umweg entfällt (hier ohne die Extraktion selbst gemessen)
+    records = [dict(zip(url_columnar.COLUMNS, row)) for row in _synthetic_rows(mode)]
+    start = time.perf_counter()
+    sinks = [url_sinks.CsvSink(csv_path), url_sinks.MarkdownTableSink(md_path)]
+    url_sinks.write_sinks(records, sinks)
+    return time.perf_counter() - start
+
+
+def _check_json_stream(tmp):
+    """iter_json_array liefert bei jeder Blockgröße dasselbe wie json.load"""
+    path = os.path.join(tmp, 'check.json')
+    records = [dict(zip(url_columnar.COLUMNS, row)) for row in _synthetic_rows(2000)]
+    # Escapes, Klammern in Strings und Nicht-ASCII über Blockgrenzen
+    records.append({'url': 'https://example.com/a?q="[x]"&b={1}', 'type': 'test\\"',
+                    'category': 'ä\u00e4 \U0001f600', 'domain': '\\', 'description': '{"a": [1]}',
+                    'context': 'Zeile\nzwei\t"'})
+    document = extract_all_urls.build_output_data(records)
+    document['numbers'] = [0, -1.5e-7, 12345678901234567890, 3.25, True, None]
+    url_sinks.run_sink(url_sinks.JsonSink(path, document), records)
+    with open(path, 'r', encoding='utf-8') as f:
+        expected = json.load(f)['all_urls']
+    sizes = (1, 2, 7, 64, 4096, create_csv_export.JSON_CHUNK)
+    for chunk_size in sizes:
+        assert list(create_csv_export.iter_json_array(path, chunk_size=chunk_size)) == expected, chunk_size
+    print(f"Inkrementell = json.load: ok (Blockgrößen {', '.join(map(str, sizes))})")
+
+
+def bench_export(args):
+    """CSV/Markdown-Export: json.load vs. inkrementelles JSON vs. direkt aus dem Speicher"""
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        _check_json_stream(tmp)
+        json_path = os.path.join(tmp, 'results.json')
+        records = [dict(zip(url_columnar.COLUMNS, row)) for row in _synthetic_rows(args.count)]
+        document = extract_all_urls.build_output_data(records)
+        url_sinks.run_sink(url_sinks.JsonSink(json_path, document), records)
+        del records, document
+        size_mb = os.path.getsize(json_path) / 1e6
+        print(f"Eingabe: {args.count:,} Zeilen, JSON {size_mb:,.0f} MB")
+        modes = ['stream'] if args.skip_legacy else ['json.load', 'stream']
+        for mode in modes:
+            rows, elapsed, base, peak = run_isolated(_export_csv_md, mode, json_path, tmp)
+            print(f"  {mode:10s}: {rows:,} Zeilen in {elapsed:6.2f} s, Spitzen-RSS +{peak - base:,.0f} MB")
+        seconds, _, _, _ = run_isolated(_export_csv_md, args.count, json_path, tmp)
+        print(f"  {'direkt':10s}: Export ohne JSON-Umweg in {seconds:6.2f} s")
+
+
+def bench_dbload(args):
+    """url_metadata-Loader (SQLite-Ersatz): Einzel-INSERTs vs. Pakete, erneuter Lauf"""
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        json_path = os.path.join(tmp, 'results.json')
+        records = [dict(zip(url_columnar.COLUMNS, row)) for row in _synthetic_rows(args.count)]
+        url_sinks.run_sink(url_sinks.JsonSink(json_path, {}), records)
+        del records
+
+        if not args.skip_legacy:
+            # Bisher gab es keinen Loader; Referenz ist ein INSERT mit Commit pro Zeile
+            sample = min(args.count, 20_000)
+            target = url_db_loader.SqliteTarget(os.path.join(tmp, 'single.db'))
+            ids = list(islice(url_db_loader.iter_url_ids(create_csv_export.load_records(json_path)), sample))
+            start = time.perf_counter()
+            for url_id in ids:
+                target.load_batch([url_id])
+            elapsed = time.perf_counter() - start
+            target.close()
+            print(f"INSERT pro Zeile : {sample:,} Zeilen in {elapsed:6.2f} s ({sample / elapsed:10,.0f} Zeilen/s)")
+
+        target = url_db_loader.SqliteTarget(os.path.join(tmp, 'bulk.db'))
+        for run in ('erster Lauf', 'erneuter Lauf'):
+            url_ids = url_db_loader.iter_url_ids(create_csv_export.load_records(json_path))
+            result = url_db_loader.load(url_ids, target)
+            print(f"Pakete, {run:13s}: {result['rows']:,} Zeilen, {result['inserted']:,} neu in "
+                  f"{result['seconds']:6.2f} s ({result['rows_per_second']:10,.0f} Zeilen/s, inkl. JSON-Lesen)")
+        target.close()
+
+
+def bench_index(args):
+    """SQLite-Index: Abfragen über Erwähnungen vs. JSON laden und filtern"""
+    rng = random.Random(23)
+    rows = list(_synthetic_rows(max(args.count // 10, 1)))
+    words = ['setup', 'deploy', 'supabase', 'auth', 'docs', 'badge', 'pipeline', 'release']
+
+    def mentions():
+        for i in range(args.count):
+            url, _, _, _, _, repo = rng.choice(rows)
+            yield {'url': url, 'line': i + 1, 'repo': repo, 'section': f"KATEGORIE {i % 12}",
+                   'context': f"- {rng.choice(words)} {rng.choice(words)}: {url}"}
+
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        json_path = os.path.join(tmp, 'mentions.json')
+        index = url_index.UrlIndex(os.path.join(tmp, 'urls.db'))
+        items = list(mentions())
+        count, elapsed = timed(index.add_mentions, 'bericht.md', items)
+        _, analyze_time = timed(index.analyze)
+        print(f"Indiziert: {count:,} Erwähnungen in {elapsed:6.2f} s ({count / elapsed:,.0f}/s), "
+              f"ANALYZE {analyze_time:5.2f} s")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'all_mentions': items}, f, indent=2, ensure_ascii=False)
+        domain = rows[0][3]
+        repo = rows[0][5]
+        del items
+
+        def from_json(predicate):
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return [item for item in data['all_mentions'] if predicate(item)]
+
+        domains = {row[0]: row[3] for row in rows}
+        queries = [
+            (f"Repos mit Domain {domain}",
+             lambda: index.query({'domain': domain}, group_by='repo', limit=0),
+             lambda: Counter(item['repo'] for item in from_json(lambda x: domains[x['url']] == domain))),
+            (f"Erwähnungen in {repo}, KATEGORIE 3",
+             lambda: index.query({'repo': repo, 'section': 'KATEGORIE 3'}, limit=0),
+             lambda: from_json(lambda x: x['repo'] == repo and x['section'] == 'KATEGORIE 3')),
+            ("Volltext 'supabase AND auth' (50)",
+             lambda: index.query(search='supabase AND auth', limit=50),
+             lambda: from_json(lambda x: 'supabase' in x['context'] and 'auth' in x['context'])[:50]),
+        ]
+        for name, indexed, legacy in queries:
+            _, index_time = timed(indexed)
+            line = f"  {name:40s}: Index {index_time * 1000:8.1f} ms"
+            if not args.skip_legacy:
+                _, json_time = timed(legacy)
+                line += f", JSON {json_time * 1000:9.1f} ms"
+            print(line)
+        index.close()
+
+
+def bench_columnar(args):
+    """Spitzen-RSS: Liste von Dicts vs. spaltenorientierte Tabelle"""
+    for mode in ('dicts', 'columnar'):
+        rows, elapsed, base, peak = run_isolated(_columnar_group, mode, args.count)
+        print(f"{mode:9s}: {rows:,} URLs in {elapsed:6.2f} s, Spitzen-RSS {peak:7.0f} MB "
+              f"(+{peak - base:.0f} MB über Start)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.urlcol')
+        table = url_columnar.UrlTable()
+        for row in _synthetic_rows(min(args.count, 1_000_000)):
+            table.append(*row)
+        _, t_save = timed(table.save, path)
+        loaded, t_load = timed(url_columnar.UrlTable.load, path)
+        assert list(loaded.iter_rows(range(100))) == list(table.iter_rows(range(100)))
+        # Sequenz-Zugriff: negative Indizes und Slices wie bei einer Liste von Dicts
+        records = [dict(zip(url_columnar.COLUMNS, row)) for row in table.iter_rows(range(10))]
+        head = loaded[:10]
+        assert head == records and loaded[-1] == loaded[len(loaded) - 1]
+        assert head[2:7:2] == records[2:7:2] == table[2:7:2] and head[-3:] == table[7:10]
+        assert table[len(table):] == [] and table[-1:-3:-1] == [loaded[-1], loaded[-2]]
+        loaded.close()
+        bad_path = os.path.join(tmp, 'bad.urlcol')
+        with open(bad_path, 'wb') as f:
+            f.write(b'kein urlcol' * 4)
+        try:
+            url_columnar.UrlTable.load(bad_path)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("ungültige .urlcol-Datei geladen")
+        print(f"urlcol:    {len(table):,} Zeilen, {os.path.getsize(path) / 1e6:.1f} MB, "
+              f"speichern {t_save:.2f} s, mmap-laden {t_load * 1000:.1f} ms")
+
+
+def _write_large_report(path, size_mb):
+    block = generate_report(20_000, 2_000).encode('utf-8')
+    with open(path, 'wb') as f:
+        for _ in range(max(1, int(size_mb * 1e6 // len(block)))):
+            f.write(block)
+            f.write(b'\n')
+
+
+def _count_urls(path, use_mmap):
+    return len(extract_all_urls.extract_urls_from_file(path, use_mmap=use_mmap))
+
+
+def bench_mmap(args):
+    """Volltext-Lesen + str-Regex vs. mmap + Bytes-Regex"""
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        path = os.path.join(tmp, 'large.md')
+        _write_large_report(path, args.size_mb)
+        size_mb = os.path.getsize(path) / 1e6
+        for label, use_mmap in (("read()", False), ("mmap", True)):
+            count, elapsed, base, peak = run_isolated(_count_urls, path, use_mmap)
+            print(f"{label:7s}: {size_mb:,.0f} MB, {count:,} URLs in {elapsed:6.2f} s "
+                  f"({size_mb / elapsed:.0f} MB/s), Spitzen-RSS +{peak - base:.0f} MB")
+
+
+def generate_html(num_blocks, num_urls, seed=42):
+    """Erzeugt eine große HTML-Seite mit Links, Bildern, Inline-CSS und Skripten"""
+    rng = random.Random(seed)
+    urls = [f"https://example{i % 53}.org/page-{i}?a=1&b=2" for i in range(num_urls)]
+    # In Attributen steht & als Entity, im Skript nicht
+    attr_urls = [html.escape(url) for url in urls]
+    parts = ["<!DOCTYPE html><html><head><title>Benchmark</title>",
+             "<style>.hero { background: url(https://cdn.example.org/bg.png); }</style></head><body>"]
+    for block in range(num_blocks):
+        if block % 20 == 0:
+            parts.append(f"<h2>Abschnitt {block // 20}</h2>")
+        choice = rng.random()
+        if choice < 0.2:
+            parts.append(f'<p>Siehe <a href="{rng.choice(attr_urls)}" class="link">Quelle</a>.</p>')
+        elif choice < 0.3:
+            parts.append(f'<img src="{rng.choice(attr_urls)}" '
+                         f'srcset="{rng.choice(attr_urls)} 1x, {rng.choice(attr_urls)} 2x" alt="">')
+        elif choice < 0.4:
+            parts.append(f'<script>fetch("{rng.choice(urls)}").then(r => r.json());</script>')
+        elif choice < 0.5:
+            parts.append(f'<p>Mehr dazu unter {rng.choice(attr_urls)} und im Anhang.</p>')
+        else:
+            parts.append('<div class="card"><p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p></div>')
+    parts.append("</body></html>")
+    return '\n'.join(parts)
+
+
+def bench_html(args):
+    """HTML: Zeilen-Regex mit Überschriften-Fenster vs. html.parser-Leser"""
+    content = generate_html(args.lines, args.urls)
+    size_mb = len(content.encode('utf-8')) / 1e6
+    regex_index, regex_time = timed(extract_all_urls.build_context_index, content, True)
+    html_index, html_time = timed(url_structure.build_structured_index, content, 'html', True)
+    print(f"HTML {size_mb:.1f} MB")
+    print(f"  Zeilen-Regex: {regex_time:6.3f} s ({size_mb / regex_time:6.1f} MB/s), {len(regex_index)} URLs")
+    print(f"  html.parser : {html_time:6.3f} s ({size_mb / html_time:6.1f} MB/s), {len(html_index)} URLs")
+    unknown = sum(1 for entry in regex_index.values() if entry[1] == "Unknown")
+    print(f"  Kontext 'Unknown': Regex {unknown}, Parser "
+          f"{sum(1 for entry in html_index.values() if entry[1] == 'Unknown')}")
+    # <script>/<style> nur auf Wunsch durchsuchen
+    sample = content[:200_000]
+    elements = {m['element'] for m in url_structure.iter_html_mentions((sample,))}
+    assert not elements & url_structure.SCRIPT_TAGS, elements
+    script_index, script_time = timed(url_structure.build_structured_index, content, 'html', True, True)
+    print(f"  mit Skripten: {script_time:6.3f} s ({size_mb / script_time:6.1f} MB/s), {len(script_index)} URLs")
+
+    # Blockweise verfüttert muss dasselbe herauskommen wie am Stück (URLs an Blockgrenzen)
+    sizes = (1, 7, 4096, 1 << 16, url_streaming.CHUNK_SIZE)
+    for size in sizes:
+        # Die ersten 4 MB reichen für mehrere Grenzen; Blockgröße 1 ist langsam
+        sample = content[:4 << 20] if size >= 4096 else content[:200_000]
+        expected = list(url_structure.iter_html_mentions((sample,)))
+        chunks = (sample[i:i + size] for i in range(0, len(sample), size))
+        assert list(url_structure.iter_html_mentions(chunks)) == expected, f"Blockgröße {size}"
+    print(f"  Blockweise = am Stück: ok (Blockgrößen {', '.join(map(str, sizes))})")
+
+
+def bench_watch(args):
+    """Watch-Modus: Speichern bis aktualisierte Ausgaben vs. alle Skripte neu"""
+    content = generate_report(args.lines, args.urls)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        path = os.path.join(tmp, 'bericht.md')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        size_mb = os.path.getsize(path) / 1e6
+        pipeline = url_watch.ReportPipeline(path, tmp)
+        summary, initial = timed(pipeline.update)
+        print(f"Bericht {size_mb:.1f} MB, {summary['sections']} Abschnitte, {summary['mentions']:,} Erwähnungen")
+        print(f"  Erster Lauf (alles):        {initial * 1000:8.1f} ms")
+
+        watcher = url_watch.open_watcher([path])
+        lines = content.split('\n')
+        latencies = []
+        for i in range(args.edits):
+            # Eine Zeile in der Mitte einfügen: alle folgenden Zeilennummern verschieben sich
+            lines.insert(len(lines) // 2, f"- **URL:** https://github.com/watch/edit-{i}")
+            start = time.perf_counter()
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines))
+            changed = watcher.wait(1.0)
+            summary = pipeline.update() if changed else None
+            latencies.append(time.perf_counter() - start)
+            assert summary is not None and summary['reextracted'] == 1
+        watcher.close()
+        latencies.sort()
+        print(f"  Speichern -> Ausgaben ({watcher.name}, {args.edits} Änderungen): "
+              f"Median {latencies[len(latencies) // 2] * 1000:.1f} ms, max {latencies[-1] * 1000:.1f} ms "
+              f"(davon {url_watch.DEBOUNCE * 1000:.0f} ms Debounce)")
+        print(f"  Letzter Lauf: Extraktion {summary['extract_seconds'] * 1000:.1f} ms, "
+              f"Schreiben {(summary['seconds'] - summary['extract_seconds']) * 1000:.1f} ms")
+
+        if not args.skip_legacy:
+            os.chdir(tmp)
+            try:
+                _, legacy = timed(benchmark_suite.run_scripts, path)
+            finally:
+                os.chdir(cwd)
+            print(f"  Vier Skripte von Hand:      {legacy * 1000:8.1f} ms")
+
+
+def bench_parallel(args):
+    """Duplikat-Extraktion einer großen Datei: sequentiell vs. Bereiche in Worker-Prozessen"""
+    content = generate_report(args.lines, args.urls)
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        path = os.path.join(tmp, 'bericht.md')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        del content
+        size_mb = os.path.getsize(path) / 1e6
+        ranges = extract_all_urls_with_duplicates.split_line_ranges(path)
+        print(f"Bericht {size_mb:.1f} MB, {len(ranges)} Bereiche à "
+              f"{extract_all_urls_with_duplicates.RANGE_BYTES >> 20} MB")
+        sequential, t_seq = timed(extract_all_urls_with_duplicates.extract_all_urls_with_context, path)
+        print(f"  Sequentiell:       {t_seq:8.2f} s  {size_mb / t_seq:7.1f} MB/s  "
+              f"({len(sequential):,} Erwähnungen)")
+        for workers in sorted({2, 4, os.cpu_count() or 1} - {1}):
+            parallel, elapsed = timed(extract_all_urls_with_duplicates.extract_all_urls_with_context,
+                                      path, False, workers)
+            assert parallel == sequential, "Parallel weicht vom sequentiellen Ergebnis ab"
+            del parallel
+            print(f"  {workers:2d} Prozesse:       {elapsed:8.2f} s  {size_mb / elapsed:7.1f} MB/s  "
+                  f"Speedup {t_seq / elapsed:.2f}x (identisch)")
+
+
+STARTUP_TARGET_MS = 50
+
+
+def bench_startup(args):
+    """Startzeit pro Aufruf: python -m url_tools <befehl> vs. Skript direkt (kleine Eingabe)"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        source = os.path.join(root, 'ANALYSE_BERICHT.md')
+        path = os.path.join(tmp, 'bericht.md')
+        if os.path.exists(source):
+            shutil.copy(source, path)
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generate_report(2_000, 200))
+        env = dict(os.environ, PYTHONPATH=root)
+        cli = [sys.executable, '-m', 'url_tools']
+        commands = [
+            ("--help", cli + ['--help']),
+            ("extract --help", cli + ['extract', '--help']),
+            ("extract", cli + ['extract', path, '--console', 'quiet']),
+            ("list", cli + ['list', path, '--no-metrics']),
+            ("dupes", cli + ['dupes', path, '-o', 'dupes.txt', '--console', 'quiet']),
+            ("export", cli + ['export']),
+            ("Skript extract_all_urls.py", [sys.executable, os.path.join(root, 'extract_all_urls.py'),
+                                            path, '--console', 'quiet']),
+            ("python -c pass", [sys.executable, '-c', 'pass']),
+        ]
+        print(f"Eingabe {os.path.getsize(path) / 1e3:.0f} KB, Median aus {args.runs} Läufen, "
+              f"Ziel < {STARTUP_TARGET_MS} ms")
+        for label, command in commands:
+            subprocess.run(command, cwd=tmp, env=env, stdout=subprocess.DEVNULL, check=True)  # Aufwärmen
+            samples = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                subprocess.run(command, cwd=tmp, env=env, stdout=subprocess.DEVNULL, check=True)
+                samples.append((time.perf_counter() - start) * 1000)
+            median = statistics.median(samples)
+            mark = "✅" if median < STARTUP_TARGET_MS else "⚠️ "
+            print(f"  {mark} {label:28s} {median:7.1f} ms")
+
+
+def bench_metrics(args):
+    """Overhead der Stufen-Metriken: abgeschaltet, eingeschaltet, mit Profiling"""
+    content = generate_report(args.lines, args.urls)
+    with tempfile.TemporaryDirectory(dir=args.tmpdir) as tmp:
+        variants = (
+            ("Abgeschaltet (NULL_METRICS)", lambda: url_metrics.NULL_METRICS),
+            ("Eingeschaltet", lambda: url_metrics.RunMetrics('bench', directory=tmp)),
+            ("Mit --profile", lambda: url_metrics.RunMetrics('bench', profile=True, directory=tmp)),
+        )
+        baseline = None
+        for label, factory in variants:
+            best = None
+            for _ in range(3):
+                metrics = factory()
+                _, elapsed = timed(lambda: extract_all_urls.analyze_content(content, metrics=metrics))
+                _, written = timed(lambda: metrics.finish(quiet=True))
+                best = elapsed if best is None else min(best, elapsed)
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
+            baseline = baseline or best
+            print(f"{label + ':':30s} {best * 1000:8.1f} ms  ({best / baseline - 1:+6.1%})"
+                  + (f", Dateien {written * 1000:.1f} ms" if metrics is not url_metrics.NULL_METRICS else ""))
+        calls = sum(metrics.calls.values())
+        print(f"  {calls} Stufen-Aufrufe pro Lauf ({len(metrics.calls)} Stufen)")
+
+
+LEGACY_PATTERNS = {
+    'extract_all_urls': (r'https?://[^\s\)<>"\'\]]+(?:[^\s\)<>"\'\]\.])?', '.,;:!?)'),
+    'url_extraction': (r'https?://[^\s\)\]<>"]+[^\s\)\]<>"\',.]', '"\',;:'),
+    'mit_duplikaten': (r'https?://[^\s\)\]\'"<>]+', '.,;:)\'"'),
+}
+
+
+def bench_tokenize(args):
+    """Tokenizer: Golden-Korpus + Durchsatz in MB/s gegen die alten Regexe"""
+    total, failures = url_tokenizer.verify_golden()
+    print(f"Golden-Korpus: {total - len(failures)}/{total} konform")
+    for failure in failures:
+        print(f"  ❌ {failure['name']}: {failure['got']} != {failure['expected']}")
+
+    content = generate_report(args.lines, args.urls)
+    size_mb = len(content.encode('utf-8')) / 1e6
+    count, elapsed = timed(lambda: len(url_tokenizer.find_urls(content)))
+    print(f"  {'url_tokenizer':18s}: {size_mb / elapsed:7.1f} MB/s ({count} URLs)")
+    for name, (pattern, strip) in LEGACY_PATTERNS.items():
+        regex = re.compile(pattern)
+        count, elapsed = timed(lambda: len([m.rstrip(strip) for m in regex.findall(content)]))
+        print(f"  {name + ' (alt)':18s}: {size_mb / elapsed:7.1f} MB/s ({count} URLs)")
+    if failures:
+        raise SystemExit(1)
+
+
+BENCHMARKS = {
+    'startup': bench_startup,
+    'parallel': bench_parallel,
+    'metrics': bench_metrics,
+    'watch': bench_watch,
+    'export': bench_export,
+    'sinks': bench_sinks,
+    'mentions': bench_mentions,
+    'records': bench_records,
+    'sketch': bench_sketch,
+    'canonical': bench_canonical,
+    'dbload': bench_dbload,
+    'index': bench_index,
+    'keywords': bench_keywords,
+    'html': bench_html,
+    'tokenize': bench_tokenize,
+    'mmap': bench_mmap,
+    'columnar': bench_columnar,
+    'linkcheck': bench_linkcheck,
+    'cache': bench_cache,
+    'corpus': bench_corpus,
+    'stream': bench_stream,
+    'classify': bench_classify,
+    'memo': bench_memo,
+    'context': bench_context,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS))
+    parser.add_argument('--lines', type=int, default=100_000)
+    parser.add_argument('--urls', type=int, default=2_000)
+    parser.add_argument('--files', type=int, default=10_000,
+                        help="Anzahl Dateien für 'corpus'")
+    parser.add_argument('--count', type=int, default=1_000_000,
+                        help="Anzahl URLs für 'classify', 'memo', 'keywords', 'sinks', 'export', 'canonical' und 'dbload' "
+                             "(Erwähnungen für 'sketch' und 'index')")
+    parser.add_argument('--mentions', type=int, default=10_000_000,
+                        help="Anzahl URL-Erwähnungen für 'mentions'")
+    parser.add_argument('--edits', type=int, default=20,
+                        help="Anzahl Änderungen für 'watch'")
+    parser.add_argument('--size-mb', type=float, default=2048,
+                        help="Eingabegröße für 'mmap' in MB")
+    parser.add_argument('--runs', type=int, default=20,
+                        help="Anzahl Aufrufe pro Befehl für 'startup'")
+    parser.add_argument('--tmpdir', default=None,
+                        help="Verzeichnis für große temporäre Dateien")
+    parser.add_argument('--skip-legacy', action='store_true',
+                        help="Referenz-Implementierung nicht messen")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
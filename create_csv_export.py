@@ -3,54 +3,222 @@
 CSV Export für alle URLs
 """
 
+import argparse
 import json
-import csv
-
-def main():
-    # Lade JSON-Daten
-    with open('URL_ANALYSE_RESULTS.json', 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Erstelle CSV
-    with open('URL_LISTE_VOLLSTAENDIG.csv', 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        
-        # Header
-        writer.writerow([
-            'Nr',
-            'URL',
-            'Typ',
-            'Kategorie',
-            'Domain',
-            'Kontext/Repo',
-            'Beschreibung'
-        ])
-        
-        # Daten
-        for i, item in enumerate(data['all_urls'], 1):
-            writer.writerow([
-                i,
-                item['url'],
-                item['type'],
-                item['category'],
-                item['domain'],
-                item['context'],
-                item['description']
-            ])
+import os
+import re
+
+from url_columnar import COLUMNS, UrlTable
+from url_metrics import add_metrics_arguments, metrics_from_args
+from url_sinks import CsvSink, MarkdownTableSink, print_sink_timings, run_sink, stream_sinks
+
+# Zeichen pro Leseblock beim inkrementellen JSON-Parsen
+JSON_CHUNK = 1 << 20
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*')
+_SEPARATOR = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+# Alles bis zur nächsten Klammer außerhalb eines Strings (Strings komplett,
+# als "unrolled loop", damit die Regex nicht pro Zeichen verzweigt)
+_SKIP_RUN = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*')
+_DECODER = json.JSONDecoder()
+
+class JsonStream:
+    """Liest JSON-Werte nacheinander aus einer Datei, mit begrenztem Puffer"""
     
-    print("✅ CSV erstellt: URL_LISTE_VOLLSTAENDIG.csv")
+    def __init__(self, f, chunk_size=JSON_CHUNK):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+    
+    def fill(self):
+        """Hängt den nächsten Block an; False am Dateiende"""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
     
-    # Erstelle auch eine Markdown-Tabelle
-    with open('URL_TABELLE.md', 'w', encoding='utf-8') as f:
-        f.write("# 📊 VOLLSTÄNDIGE URL-TABELLE\n\n")
-        f.write("| Nr | URL | Typ | Kategorie | Domain | Kontext | Beschreibung |\n")
-        f.write("|---:|-----|-----|-----------|--------|---------|-------------|\n")
-        
-        for i, item in enumerate(data['all_urls'], 1):
-            url_display = item['url'][:80] + '...' if len(item['url']) > 80 else item['url']
-            f.write(f"| {i} | `{url_display}` | {item['type']} | {item['category']} | {item['domain']} | {item['context']} | {item['description']} |\n")
+    def peek(self):
+        """Nächstes Zeichen nach Whitespace, ohne es zu verbrauchen"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unerwartetes Ende der JSON-Datei")
     
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON: '{char}' erwartet, '{self.buffer[self.pos]}' gefunden")
+        self.pos += 1
+    
+    def value(self):
+        """Dekodiert den nächsten vollständigen Wert"""
+        if self.pos >= len(self.buffer) or self.buffer[self.pos] in ' \t\n\r':
+            self.peek()
+        while True:
+            try:
+                obj, end = _DECODER.scan_once(self.buffer, self.pos)
+            except (json.JSONDecodeError, StopIteration):
+                if not self.fill():
+                    raise ValueError(f"Ungültiges JSON an Position {self.pos}") from None
+                continue
+            # Eine Zahl, hinter der nur noch Zahlzeichen bis zum Pufferende
+            # stehen, kann abgeschnitten sein ("3" von "3.5e-7")
+            if (not self.eof and type(obj) in (int, float)
+                    and _NUMBER_TAIL.match(self.buffer, end).end() == len(self.buffer)
+                    and self.fill()):
+                continue
+            self.pos = end
+            return obj
+    
+    def iter_array(self):
+        """Elemente der Liste an der aktuellen Position"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        scan = _DECODER.scan_once
+        separator_at = _SEPARATOR.match
+        while True:
+            # Schneller Weg: Element und Trenner liegen vollständig im Puffer
+            buffer = self.buffer
+            try:
+                obj, end = scan(buffer, self.pos)
+                match = separator_at(buffer, end)
+            except (json.JSONDecodeError, StopIteration):
+                match = None
+            if match is not None and match.end() < len(buffer):
+                separator = match.group(1)
+                self.pos = match.end()
+            else:
+                # Element oder Trenner reicht über das Pufferende: mit Nachladen
+                obj = self.value()
+                separator = self.peek()
+                self.pos += 1
+            yield obj
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"JSON: ',' oder ']' erwartet, '{separator}' gefunden")
+    
+    def iter_object(self):
+        """Schlüssel des Objekts an der aktuellen Position
+
+        Der zugehörige Wert muss vor dem nächsten Schritt mit value() gelesen
+        oder mit skip() übersprungen werden.
+        """
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"JSON: ',' oder '}}' erwartet, '{separator}' gefunden")
+    
+    def skip(self):
+        """Überspringt den nächsten Wert, ohne ihn zu dekodieren
+
+        Bei Listen und Objekten werden nur die Klammern gezählt; Strings
+        dazwischen überspringt die Regex am Stück.
+        """
+        if self.peek() not in '[{':
+            self.value()
+            return
+        depth = 0
+        while True:
+            self.pos = _SKIP_RUN.match(self.buffer, self.pos).end()
+            if self.pos == len(self.buffer) or self.buffer[self.pos] == '"':
+                # Pufferende oder ein String, der über das Pufferende reicht
+                if not self.fill():
+                    raise ValueError("Unerwartetes Ende der JSON-Datei")
+                continue
+            char = self.buffer[self.pos]
+            self.pos += 1
+            if char in '[{':
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+def iter_json_array(path, key='all_urls', chunk_size=JSON_CHUNK):
+    """Liest die Elemente von data[key] einzeln, ohne das ganze Dokument zu laden
+
+    Andere Schlüssel der obersten Ebene werden übersprungen; im Speicher
+    liegen nur ein Leseblock und das aktuelle Element.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = JsonStream(f, chunk_size)
+        for name in stream.iter_object():
+            if name == key:
+                yield from stream.iter_array()
+                return
+            stream.skip()
+    raise KeyError(key)
+
+def load_rows(json_path=None, columnar_path=None):
+    """Liefert Zeilen als Tupel (url, type, category, domain, description, context)"""
+    if columnar_path:
+        return _iter_columnar_rows(columnar_path)
+    
+    return (tuple(item[name] for name in COLUMNS) for item in iter_json_array(json_path))
+
+def _iter_columnar_rows(path):
+    """Zeilen einer .urlcol-Datei; die Abbildung wird nach der letzten Zeile geschlossen"""
+    with UrlTable.load(path) as table:
+        yield from table.iter_rows()
+
+def load_records(json_path=None, columnar_path=None):
+    """Wie load_rows, aber als Dicts mit (mindestens) den Schlüsseln aus COLUMNS"""
+    if columnar_path:
+        return (dict(zip(COLUMNS, row)) for row in load_rows(columnar_path=columnar_path))
+    return iter_json_array(json_path)
+
+def write_csv(rows, path):
+    """Schreibt URL_LISTE_VOLLSTAENDIG.csv"""
+    run_sink(CsvSink(path), (dict(zip(COLUMNS, row)) for row in rows))
+
+def write_markdown_table(rows, path):
+    """Schreibt URL_TABELLE.md"""
+    run_sink(MarkdownTableSink(path), (dict(zip(COLUMNS, row)) for row in rows))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV- und Markdown-Export der URL-Ergebnisse")
+    parser.add_argument('--input', default='URL_ANALYSE_RESULTS.json')
+    parser.add_argument('--columnar', help="Statt JSON eine .urlcol-Datei lesen")
+    parser.add_argument('--timings', action='store_true', help="Dauer pro Ausgabe anzeigen")
+    add_metrics_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics = metrics_from_args('create_csv_export', args)
+    source = args.columnar or args.input
+    metrics.count('bytes_read', os.path.getsize(source))
+    
+    # Erstelle CSV und Markdown-Tabelle in einem Lesedurchlauf
+    sinks = [CsvSink('URL_LISTE_VOLLSTAENDIG.csv'), MarkdownTableSink('URL_TABELLE.md')]
+    # Lesen/Parsen und Schreiben wechseln sich paketweise ab; der Schreibanteil
+    # steht pro Sink in den Messwerten
+    with metrics.stage('export'):
+        timings = stream_sinks(load_records(args.input, args.columnar), sinks)
+    metrics.add_sink_timings(timings)
+    metrics.count('urls', timings[0]['rows'])
+    print("✅ CSV erstellt: URL_LISTE_VOLLSTAENDIG.csv")
     print("✅ Markdown-Tabelle erstellt: URL_TABELLE.md")
+    if args.timings:
+        print_sink_timings(timings)
+    metrics.finish()
 
 if __name__ == '__main__':
     main()
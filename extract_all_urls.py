@@ -4,233 +4,325 @@ URL Extractor for ANALYSE_BERICHT.md
 Extrahiert ALLE URLs und kategorisiert sie
 """
 
+import argparse
+import os
 import re
-import json
-from collections import defaultdict
-from urllib.parse import urlparse
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
 
-def extract_urls_from_file(filepath):
-    """Extrahiert alle URLs aus der Datei"""
+from url_columnar import COLUMNS, UrlTable
+from url_memo import SHARED_MEMO, add_memo_arguments, memo_from_args
+from url_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
+from url_streaming import detect_format, iter_mmap_matches
+from url_sinks import (CsvSink, JsonLinesSink, JsonSink, MarkdownTableSink, Sink,
+                       print_sink_timings, write_sinks)
+from url_tokenizer import URL_REGEX_BYTES, find_urls
+
+# url_cache (sqlite3, hashlib), url_canonical und url_structure (html.parser)
+# werden erst geladen, wenn der Cache, --canonical bzw. ein HTML-/Markdown-Leser
+# sie braucht
+
+# Ohne ausdrückliches --cache werden kleinere Eingaben ohne Manifest analysiert:
+# SQLite öffnen und Hashen dauert dort länger als die Analyse selbst
+CACHE_MIN_BYTES = 256 << 10
+# Anzahl Zeilen, die vor einer URL nach einer Überschrift durchsucht werden
+CONTEXT_WINDOW = 20
+# Zeilenumbruch vor einer ``## ``- oder ``### ``-Überschrift (literaler Präfix,
+# damit die Regex-Engine schnell sucht; die erste Zeile teilt nie)
+HEADING_START = re.compile(r'\n###? ')
+
+def extract_urls_from_file(filepath, use_mmap=False):
+    """Extrahiert alle URLs aus der Datei
+
+    Mit use_mmap=True läuft die Regex als Bytes-Muster direkt über eine
+    mmap-Abbildung, ohne die ganze Datei als str zu laden.
+    """
+    if use_mmap:
+        return list(iter_mmap_matches(filepath, URL_REGEX_BYTES))
+    
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Regex für alle URLs (http:// und https://)
-    url_pattern = r'https?://[^\s\)<>"\'\]]+(?:[^\s\)<>"\'\]\.])?'
-    
-    urls = []
-    for match in re.finditer(url_pattern, content):
-        url = match.group(0)
-        # Bereinige URL (entferne trailing Sonderzeichen)
-        url = url.rstrip('.,;:!?)')
-        urls.append(url)
-    
-    return urls
+    return extract_urls_from_text(content)
+
+def extract_urls_from_text(content):
+    """Extrahiert alle URLs aus einem Text"""
+    return find_urls(content)
 
 def categorize_url(url):
     """Kategorisiert eine URL nach Typ und Kategorie"""
-    parsed = urlparse(url)
-    domain = parsed.netloc.lower()
-    path = parsed.path.lower()
-    
-    # Bestimme Typ
-    url_type = "other"
-    category = "other"
-    description = ""
-    
-    # GitHub URLs
-    if 'github.com' in domain:
-        if '/user-attachments/assets/' in path:
-            url_type = "github-asset"
-            category = "creative"
-            description = "GitHub Asset/Image"
-        else:
-            url_type = "github-repo"
-            category = "devtools"
-            description = "GitHub Repository"
-    
-    # Lovable.dev
-    elif 'lovable.dev' in domain:
-        url_type = "lovable"
-        category = "platforms"
-        description = "Lovable.dev Project"
-    
-    # Supabase
-    elif 'supabase.co' in domain:
-        url_type = "supabase"
-        category = "infrastructure"
-        description = "Supabase Database"
-    
-    # Shields.io (Badges)
-    elif 'shields.io' in domain or 'img.shields.io' in domain:
-        url_type = "badge"
-        category = "documentation"
-        description = "Shields.io Badge"
-    
-    # Discord
-    elif 'discord.gg' in domain or 'dcbadge.limes.pink' in domain:
-        url_type = "discord"
-        category = "platforms"
-        description = "Discord Server/Badge"
-    
-    # Netlify
-    elif 'netlify.app' in domain or 'netlify.com' in domain:
-        url_type = "infrastructure"
-        category = "infrastructure"
-        description = "Netlify Deployment"
-    
-    # Microsoft/Azure
-    elif 'microsoft.com' in domain or 'azure.com' in domain:
-        url_type = "documentation"
-        category = "documentation"
-        description = "Microsoft Documentation"
-    
-    # Docker
-    elif 'docker.com' in domain or 'hub.docker.com' in domain:
-        url_type = "registry"
-        category = "infrastructure"
-        description = "Docker Hub"
-    
-    # Kubernetes
-    elif 'kubernetes.io' in domain:
-        url_type = "documentation"
-        category = "infrastructure"
-        description = "Kubernetes Documentation"
-    
-    # PyPI
-    elif 'pypi.org' in domain:
-        url_type = "registry"
-        category = "devtools"
-        description = "Python Package Index"
-    
-    # NuGet
-    elif 'nuget.org' in domain:
-        url_type = "registry"
-        category = "devtools"
-        description = "NuGet Package Registry"
-    
-    # Maven
-    elif 'maven' in domain:
-        url_type = "registry"
-        category = "devtools"
-        description = "Maven Repository"
-    
-    # NPM
-    elif 'npmjs.com' in domain or 'npmjs.org' in domain:
-        url_type = "registry"
-        category = "devtools"
-        description = "NPM Package Registry"
-    
-    # Open Source Licenses
-    elif 'opensource.org' in domain:
-        url_type = "license"
-        category = "documentation"
-        description = "Open Source License"
-    
-    # Vaultproject.io
-    elif 'vaultproject.io' in domain:
-        url_type = "infrastructure"
-        category = "security"
-        description = "HashiCorp Vault"
-    
-    # Ollama
-    elif 'ollama.ai' in domain:
-        url_type = "infrastructure"
-        category = "ai"
-        description = "Ollama AI"
-    
-    # Portainer
-    elif 'portainer.io' in domain:
-        url_type = "infrastructure"
-        category = "infrastructure"
-        description = "Portainer"
-    
-    # Onbiela.dev
-    elif 'onbiela.dev' in domain:
-        url_type = "platforms"
-        category = "platforms"
-        description = "Onbiela Platform"
-    
-    # Macaly
-    elif 'macaly-app.com' in domain:
-        url_type = "platforms"
-        category = "platforms"
-        description = "Macaly Application"
-    
-    # Domain-specific
-    elif 'hnoss-ambassador.org' in domain:
-        url_type = "reference"
-        category = "documentation"
-        description = "HNOSS Ambassador Organization"
-    
-    elif 'universal-values.org' in domain:
-        url_type = "reference"
-        category = "documentation"
-        description = "Universal Values"
-    
-    elif 'st-daniel-pohl.org' in domain:
-        url_type = "reference"
-        category = "documentation"
-        description = "St. Daniel Pohl"
-    
-    elif 'dotnet.microsoft.com' in domain:
-        url_type = "documentation"
-        category = "devtools"
-        description = ".NET Documentation"
+    info = SHARED_MEMO.classify(url)
     
     return {
         'url': url,
-        'type': url_type,
-        'category': category,
-        'domain': domain,
-        'description': description
+        'type': info.type,
+        'category': info.category,
+        'domain': info.domain,
+        'description': info.description
     }
 
-def extract_context_from_section(content, url):
+def build_context_index(content, with_counts=False):
+    """Baut in einem Durchlauf den Index URL -> (erste Zeile, Kontext)
+
+    Für jede URL wird die erste Zeile gemerkt, in der sie vorkommt, und
+    die erste ``## ``/``### ``-Überschrift innerhalb der CONTEXT_WINDOW
+    Zeilen davor. Damit ist die Kontext-Auflösung O(1) pro URL statt
+    O(Zeilen) und der ganze Lauf linear in der Dokumentgröße.
+    Mit with_counts=True enthält jeder Eintrag zusätzlich die Anzahl
+    der Erwähnungen: (erste Zeile, Kontext, Anzahl).
+    """
+    index = {}
+    counts = defaultdict(int) if with_counts else None
+    headings = deque()
+
+    for line_num, line in enumerate(content.split('\n'), 1):
+        if 'http' in line:
+            while headings and headings[0][0] < line_num - CONTEXT_WINDOW:
+                headings.popleft()
+            context = headings[0][1] if headings else "Unknown"
+            for url in find_urls(line):
+                if url not in index:
+                    index[url] = (line_num, context)
+                if counts is not None:
+                    counts[url] += 1
+
+        if line.startswith('### '):
+            headings.append((line_num, line.replace('### ', '').strip()))
+        elif line.startswith('## '):
+            headings.append((line_num, line.replace('## ', '').strip()))
+
+    if counts is not None:
+        return {url: (line_num, context, counts[url]) for url, (line_num, context) in index.items()}
+    return index
+
+def extract_context_from_section(content, url, index=None):
     """Extrahiert den Kontext/Repo-Namen aus dem die URL kommt"""
-    # Suche nach dem Repo-Namen in der Nähe der URL
-    lines = content.split('\n')
-    context = "Unknown"
-    
-    for i, line in enumerate(lines):
-        if url in line:
-            # Suche rückwärts nach Repo-Titel
-            for j in range(max(0, i-20), i):
-                if lines[j].startswith('### '):
-                    context = lines[j].replace('### ', '').strip()
-                    break
-                elif lines[j].startswith('## '):
-                    context = lines[j].replace('## ', '').strip()
-                    break
-            break
-    
-    return context
-
-def main():
-    filepath = 'ANALYSE_BERICHT.md'
-    
-    print("🔍 Analysiere ANALYSE_BERICHT.md...")
-    print("=" * 80)
-    
-    # Extrahiere URLs
-    urls = extract_urls_from_file(filepath)
-    
-    # Dedupliziere
-    unique_urls = list(set(urls))
-    
-    print(f"\n✅ Gefunden: {len(urls)} URLs (davon {len(unique_urls)} unique)")
-    print("=" * 80)
-    
-    # Kategorisiere URLs
-    categorized = []
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+    if index is None:
+        index = build_context_index(content)
+    entry = index.get(url)
+    return entry[1] if entry else "Unknown"
+
+def split_sections(content):
+    """Teilt den Text vor jeder ``## ``/``### ``-Überschrift: (Startzeile, Text)"""
+    sections = []
+    start = 0
+    line_num = 1
+    # Die Regex findet die Überschriften, statt jede Zeile einzeln zu prüfen
+    for match in HEADING_START.finditer(content):
+        pos = match.start() + 1
+        if pos > start:
+            sections.append((line_num, content[start:pos - 1]))
+            line_num += content.count('\n', start, pos)
+            start = pos
+    sections.append((line_num, content[start:]))
+    return sections
+
+def analyze_section(text, metrics=NULL_METRICS):
+    """Extrahiert und klassifiziert die URLs eines Abschnitts (cachebar)
+
+    Zeilennummern sind relativ zum Abschnitt; der Kontext wird erst beim
+    Zusammenführen aufgelöst, weil das Fenster über die Abschnittsgrenze
+    zurückreichen kann.
+    """
+    with metrics.stage('match'):
+        index = build_context_index(text, with_counts=True)
     
-    for url in unique_urls:
-        info = categorize_url(url)
-        info['context'] = extract_context_from_section(content, url)
-        categorized.append(info)
+    urls = []
+    with metrics.stage('classify'):
+        for url, (line_num, _, count) in index.items():
+            info = categorize_url(url)
+            urls.append([url, line_num, count, info['type'], info['category'],
+                         info['domain'], info['description']])
+    
+    headings = []
+    with metrics.stage('context'):
+        for line_num, line in enumerate(text.split('\n'), 1):
+            if line.startswith('### '):
+                headings.append([line_num, line.replace('### ', '').strip()])
+            elif line.startswith('## '):
+                headings.append([line_num, line.replace('## ', '').strip()])
+    
+    return {'urls': urls, 'headings': headings}
+
+def _categorized(rows, columnar):
+    """Kategorisierte URLs aus Zeilen in der Reihenfolge von COLUMNS
+
+    Als UrlTable (columnar=True) oder als Liste von Dicts.
+    """
+    if not columnar:
+        return [dict(zip(COLUMNS, row)) for row in rows]
+    table = UrlTable()
+    append = table.append
+    for row in rows:
+        append(*row)
+    return table
+
+def _categorized_rows(categorized):
+    """Umkehrung von _categorized: Zeilen für den Manifest-Cache"""
+    if isinstance(categorized, UrlTable):
+        return list(categorized.iter_rows())
+    return [[item[name] for name in COLUMNS] for item in categorized]
+
+def analyze_content(content, cache=None, path=None, sections=None, metrics=NULL_METRICS,
+                    columnar=False):
+    """Analysiert einen Text, optional über den Manifest-Cache
+
+    Gibt (Anzahl Erwähnungen, kategorisierte URLs in Fundreihenfolge) zurück,
+    die URLs als Liste von Dicts oder mit columnar=True als UrlTable.
+    Unveränderte Dateien werden komplett aus dem Cache geladen, bei
+    Änderungen werden nur die geänderten Abschnitte neu berechnet.
+    sections sind die schon mit split_sections geteilten Abschnitte.
+    metrics (url_metrics) misst die Stufen match, classify, context und cache.
+    """
+    if cache is not None:
+        from url_cache import content_digest
+    digest = None
+    if cache is not None and path is not None:
+        with metrics.stage('cache'):
+            digest = content_digest(content)
+            cached = cache.get_file(path, digest)
+        if cached is not None:
+            return cached['mentions'], _categorized(cached['rows'], columnar)
+    
+    first_seen = {}
+    counts = defaultdict(int)
+    heading_lines = []
+    heading_texts = []
+    
+    if sections is None:
+        with metrics.stage('split'):
+            sections = split_sections(content)
+    metrics.count('sections', len(sections))
+    section_digests = []
+    for start, text in sections:
+        result = None
+        if cache is not None:
+            with metrics.stage('cache'):
+                section_digest = content_digest(text)
+                section_digests.append(section_digest)
+                result = cache.get_section(section_digest)
+        if result is None:
+            result = analyze_section(text, metrics)
+            if cache is not None:
+                with metrics.stage('cache'):
+                    cache.put_section(section_digest, result)
+        
+        with metrics.stage('context'):
+            for line_num, heading in result['headings']:
+                heading_lines.append(start + line_num - 1)
+                heading_texts.append(heading)
+            for url, line_num, count, url_type, category, domain, description in result['urls']:
+                counts[url] += count
+                if url not in first_seen:
+                    first_seen[url] = (start + line_num - 1, url_type, category, domain, description)
+    
+    def rows():
+        for url, (line_num, url_type, category, domain, description) in first_seen.items():
+            # Erste Überschrift im Fenster [line - CONTEXT_WINDOW, line)
+            i = bisect_left(heading_lines, line_num - CONTEXT_WINDOW)
+            context = heading_texts[i] if i < len(heading_lines) and heading_lines[i] < line_num else "Unknown"
+            yield url, url_type, category, domain, description, context
+    
+    with metrics.stage('context'):
+        categorized = _categorized(rows(), columnar)
+    
+    mentions = sum(counts.values())
+    if digest is not None:
+        with metrics.stage('cache'):
+            cache.put_file(path, digest, {'mentions': mentions, 'rows': _categorized_rows(categorized)},
+                           sections=section_digests)
+    return mentions, categorized
+
+def analyze_structured(content, fmt, cache=None, path=None, metrics=NULL_METRICS, columnar=False):
+    """Wie analyze_content, aber mit dem HTML- bzw. Markdown-Leser aus url_structure
+
+    Der Kontext ist die letzte Überschrift vor der ersten Erwähnung (ohne
+    Zeilenfenster). Gecacht wird nur pro Datei. Suche und Kontext laufen
+    im Parser gemeinsam und zählen als Stufe match.
+    """
+    from url_structure import build_structured_index
+    
+    digest = None
+    if cache is not None and path is not None:
+        from url_cache import content_digest
+        with metrics.stage('cache'):
+            digest = content_digest(content)
+            cached = cache.get_file(path, digest, kind=f'analyze-{fmt}')
+        if cached is not None:
+            return cached['mentions'], _categorized(cached['rows'], columnar)
+    
+    with metrics.stage('match'):
+        index = build_structured_index(content, fmt, with_counts=True)
+    
+    def rows():
+        for url, (_, context, _) in index.items():
+            info = SHARED_MEMO.classify(url)
+            yield url, info.type, info.category, info.domain, info.description, context
+    
+    mentions = sum(count for _, _, count in index.values())
+    with metrics.stage('classify'):
+        categorized = _categorized(rows(), columnar)
+    
+    if digest is not None:
+        with metrics.stage('cache'):
+            cache.put_file(path, digest, {'mentions': mentions, 'rows': _categorized_rows(categorized)},
+                           kind=f'analyze-{fmt}')
+    return mentions, categorized
+
+def merge_canonical(categorized):
+    """Fasst URLs mit gleicher kanonischer Form zusammen; die erste Fundstelle gewinnt"""
+    from url_canonical import canonicalize_batch
+    
+    if isinstance(categorized, UrlTable):
+        merged = UrlTable()
+        seen = set()
+        forms = canonicalize_batch(categorized.url(row) for row in range(len(categorized)))
+        for (_, *values), canonical in zip(categorized.iter_rows(), forms):
+            if canonical not in seen:
+                seen.add(canonical)
+                merged.append(canonical, *values)
+        return merged
+    
+    merged = {}
+    for item, canonical in zip(categorized, canonicalize_batch(item['url'] for item in categorized)):
+        if canonical not in merged:
+            merged[canonical] = dict(item, url=canonical)
+    return list(merged.values())
+
+def compute_statistics(categorized):
+    """Zählt die URLs der Zusammenfassung (nach Typ bzw. Kategorie)"""
+    if isinstance(categorized, UrlTable):
+        type_counts = defaultdict(int, categorized.counts('type'))
+        infrastructure = categorized.counts('category').get('infrastructure', 0)
+    else:
+        type_counts = defaultdict(int)
+        infrastructure = 0
+        for item in categorized:
+            type_counts[item['type']] += 1
+            if item['category'] == 'infrastructure':
+                infrastructure += 1
     
-    # Gruppiere nach Typ
+    return {
+        'github_repos': type_counts['github-repo'],
+        'github_assets': type_counts['github-asset'],
+        'lovable_projects': type_counts['lovable'],
+        'supabase_databases': type_counts['supabase'],
+        'badges': type_counts['badge'],
+        'discord_servers': type_counts['discord'],
+        'package_registries': type_counts['registry'],
+        'documentation_sites': type_counts['documentation'],
+        'infrastructure_tools': infrastructure
+    }
+
+def group_urls(categorized):
+    """Gruppiert die kategorisierten URLs nach Typ und Kategorie
+
+    Bei einer UrlTable sind die Gruppen Zeilennummern (array), sonst Listen
+    der Dicts.
+    """
+    if isinstance(categorized, UrlTable):
+        return categorized.group('type'), categorized.group('category')
     by_type = defaultdict(list)
     by_category = defaultdict(list)
     
@@ -238,122 +330,270 @@ def main():
         by_type[item['type']].append(item)
         by_category[item['category']].append(item)
     
-    # Statistiken
-    print("\n📊 STATISTIKEN:")
-    print("=" * 80)
+    return by_type, by_category
+
+def build_output_data(categorized, by_type=None, by_category=None, stats=None):
+    """Baut die Struktur von URL_ANALYSE_RESULTS.json"""
+    if by_type is None or by_category is None:
+        by_type, by_category = group_urls(categorized)
+    if stats is None:
+        stats = compute_statistics(categorized)
+    
+    if isinstance(categorized, UrlTable):
+        # Beide Gruppierungen teilen sich einen String pro URL
+        urls = [categorized.url(row) for row in range(len(categorized))]
+        url_lists = lambda groups: {k: [urls[row] for row in rows] for k, rows in groups.items()}
+    else:
+        url_lists = lambda groups: {k: [item['url'] for item in v] for k, v in groups.items()}
     
-    print("\n🔷 Nach Typ:")
-    for url_type, items in sorted(by_type.items(), key=lambda x: len(x[1]), reverse=True):
-        print(f"  {url_type:20s}: {len(items):3d} URLs")
+    return {
+        'total_urls': len(categorized),
+        'statistics': stats,
+        'by_type': url_lists(by_type),
+        'by_category': url_lists(by_category),
+        'all_urls': categorized
+    }
+
+class TypeGroupedSink(Sink):
+    """Gibt die URLs nach Typ und URL sortiert aus, mit Überschrift pro Typ"""
+    
+    def __init__(self, path, type_counts):
+        super().__init__(path)
+        self.type_counts = type_counts
+        self.current_type = None
+        self.index = 0
+    
+    def prepare(self, records):
+        if isinstance(records, UrlTable):
+            # Sortiert wird pro Typ nur über die Zeilennummern
+            groups = records.group('type')
+            return records.records(row for url_type in sorted(groups)
+                                   for row in sorted(groups[url_type], key=records.url))
+        return sorted(records, key=lambda x: (x['type'], x['url']))
+    
+    def render(self, batch, start):
+        parts = []
+        for item in batch:
+            if item['type'] != self.current_type:
+                self.current_type = item['type']
+                self.index = 0
+                parts.append(self.render_group(self.current_type, self.type_counts[self.current_type]))
+            self.index += 1
+            parts.append(self.render_item(self.index, item))
+        return ''.join(parts)
+
+class AnalyseReportSink(TypeGroupedSink):
+    """URL_ANALYSE_REPORT.md: Statistik, dann alle URLs nach Typ gruppiert"""
+    
+    name = 'md-report'
+    
+    def __init__(self, path, filepath, stats, type_counts):
+        super().__init__(path, type_counts)
+        self.filepath = filepath
+        self.stats = stats
+    
+    def header(self):
+        stats = self.stats
+        return (
+            "# 📊 URL-ANALYSE REPORT\n\n"
+            f"**Analysiert:** {self.filepath}\n"
+            f"**Datum:** {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            "## 📈 STATISTIKEN\n\n"
+            f"- 📦 **GitHub Repositories:** {stats['github_repos']}\n"
+            f"- 🖼️ **GitHub Assets (Bilder):** {stats['github_assets']}\n"
+            f"- 💖 **Lovable.dev Projekte:** {stats['lovable_projects']}\n"
+            f"- 🗄️ **Supabase Datenbanken:** {stats['supabase_databases']}\n"
+            f"- 🏷️ **Badges (shields.io):** {stats['badges']}\n"
+            f"- 💬 **Discord Server:** {stats['discord_servers']}\n"
+            f"- 📚 **Package Registries:** {stats['package_registries']}\n"
+            f"- 📖 **Documentation Sites:** {stats['documentation_sites']}\n"
+            f"- 🏗️ **Infrastructure Tools:** {stats['infrastructure_tools']}\n"
+            f"- 📊 **TOTAL URLs:** {sum(self.type_counts.values())}\n\n"
+            "---\n\n"
+        )
+    
+    def render_group(self, url_type, count):
+        return f"## 🔹 {url_type.upper()} ({count} URLs)\n\n"
+    
+    def render_item(self, index, item):
+        return (
+            f"### {index}. {item['description']}\n\n"
+            f"**URL:** `{item['url']}`\n\n"
+            f"- **Typ:** {item['type']}\n"
+            f"- **Kategorie:** {item['category']}\n"
+            f"- **Kontext:** {item['context']}\n"
+            f"- **Domain:** {item['domain']}\n\n"
+            "---\n\n"
+        )
+
+class DetailListingSink(TypeGroupedSink):
+    """Detaillierte URL-Liste für die Konsole"""
     
-    print("\n🔷 Nach Kategorie:")
-    for category, items in sorted(by_category.items(), key=lambda x: len(x[1]), reverse=True):
-        print(f"  {category:20s}: {len(items):3d} URLs")
+    name = 'console'
     
-    # Detaillierte Ausgabe
-    print("\n" + "=" * 80)
-    print("📋 DETAILLIERTE URL-LISTE:")
-    print("=" * 80)
+    def header(self):
+        return "\n" + "=" * 80 + "\n📋 DETAILLIERTE URL-LISTE:\n" + "=" * 80 + "\n"
     
-    for url_type in sorted(by_type.keys()):
-        items = by_type[url_type]
-        print(f"\n\n{'='*80}")
-        print(f"🔹 {url_type.upper()} ({len(items)} URLs)")
-        print(f"{'='*80}")
-        
-        for i, item in enumerate(sorted(items, key=lambda x: x['url']), 1):
-            print(f"\n{i}. {item['url']}")
-            print(f"   Typ: {item['type']}")
-            print(f"   Kategorie: {item['category']}")
-            print(f"   Kontext: {item['context']}")
-            print(f"   Beschreibung: {item['description']}")
-    
-    # Spezielle Zählungen
-    github_repos = [item for item in categorized if item['type'] == 'github-repo']
-    github_assets = [item for item in categorized if item['type'] == 'github-asset']
-    lovable_projects = [item for item in categorized if item['type'] == 'lovable']
-    supabase_dbs = [item for item in categorized if item['type'] == 'supabase']
-    badges = [item for item in categorized if item['type'] == 'badge']
-    discord_servers = [item for item in categorized if item['type'] == 'discord']
-    registries = [item for item in categorized if item['type'] == 'registry']
-    documentation = [item for item in categorized if item['type'] == 'documentation']
-    infrastructure = [item for item in categorized if item['category'] == 'infrastructure']
-    
-    print("\n\n" + "=" * 80)
-    print("🎯 ZUSAMMENFASSUNG:")
-    print("=" * 80)
-    print(f"📦 GitHub Repositories: {len(github_repos)}")
-    print(f"🖼️  GitHub Assets (Bilder): {len(github_assets)}")
-    print(f"💖 Lovable.dev Projekte: {len(lovable_projects)}")
-    print(f"🗄️  Supabase Datenbanken: {len(supabase_dbs)}")
-    print(f"🏷️  Badges (shields.io): {len(badges)}")
-    print(f"💬 Discord Server: {len(discord_servers)}")
-    print(f"📚 Package Registries: {len(registries)}")
-    print(f"📖 Documentation Sites: {len(documentation)}")
-    print(f"🏗️  Infrastructure Tools: {len(infrastructure)}")
-    print(f"📊 TOTAL URLs: {len(unique_urls)}")
-    
-    # Exportiere zu JSON
-    output_data = {
-        'total_urls': len(unique_urls),
-        'statistics': {
-            'github_repos': len(github_repos),
-            'github_assets': len(github_assets),
-            'lovable_projects': len(lovable_projects),
-            'supabase_databases': len(supabase_dbs),
-            'badges': len(badges),
-            'discord_servers': len(discord_servers),
-            'package_registries': len(registries),
-            'documentation_sites': len(documentation),
-            'infrastructure_tools': len(infrastructure)
-        },
-        'by_type': {k: [item['url'] for item in v] for k, v in by_type.items()},
-        'by_category': {k: [item['url'] for item in v] for k, v in by_category.items()},
-        'all_urls': categorized
-    }
+    def render_group(self, url_type, count):
+        return f"\n\n{'='*80}\n🔹 {url_type.upper()} ({count} URLs)\n{'='*80}\n"
     
-    with open('URL_ANALYSE_RESULTS.json', 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
+    def render_item(self, index, item):
+        return (
+            f"\n{index}. {item['url']}\n"
+            f"   Typ: {item['type']}\n"
+            f"   Kategorie: {item['category']}\n"
+            f"   Kontext: {item['context']}\n"
+            f"   Beschreibung: {item['description']}\n"
+        )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extrahiert und kategorisiert alle URLs")
+    parser.add_argument('input', nargs='?', default='ANALYSE_BERICHT.md')
+    parser.add_argument('--cache', metavar='PATH',
+                        help="SQLite-Manifest für inkrementelle Läufe (Standard: .url_cache.sqlite, "
+                             "für Eingaben ab 256 KB)")
+    parser.add_argument('--columnar', metavar='PATH',
+                        help="Ergebnisse zusätzlich spaltenorientiert (.urlcol) speichern")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Alles neu berechnen, Cache weder lesen noch schreiben")
+    parser.add_argument('--format', choices=['auto', 'regex', 'html', 'markdown'], default='regex',
+                        help="Leser: regex = Zeilen-Regex mit Überschriften-Fenster (am schnellsten), "
+                             "html/markdown = url_structure (Kontext aus der Struktur, HTML etwa "
+                             "10x langsamer), auto = HTML-Parser für .html, sonst regex")
+    parser.add_argument('--console', choices=['full', 'summary', 'quiet'], default='full',
+                        help="Konsolenausgabe: full = mit detaillierter URL-Liste, "
+                             "summary = nur Statistiken, quiet = nur Exportmeldungen")
+    parser.add_argument('--jsonl', metavar='PATH', help="Zusätzlich als JSON Lines ausgeben")
+    parser.add_argument('--csv', metavar='PATH', help="Zusätzlich als CSV ausgeben")
+    parser.add_argument('--md-table', metavar='PATH', help="Zusätzlich als Markdown-Tabelle ausgeben")
+    parser.add_argument('--export', action='store_true',
+                        help="URL_LISTE_VOLLSTAENDIG.csv und URL_TABELLE.md direkt mit erzeugen "
+                             "(ersetzt create_csv_export.py)")
+    parser.add_argument('--canonical', action='store_true',
+                        help="Schreibvarianten derselben URL zusammenfassen (url_canonical)")
+    add_memo_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics = metrics_from_args('extract_all_urls', args)
+    memo = memo_from_args(args)
+    filepath = args.input
+    fmt = args.format
+    if fmt == 'auto':
+        fmt = 'html' if detect_format(filepath) == 'html' else 'regex'
+    
+    print(f"🔍 Analysiere {filepath}...")
+    print("=" * 80)
     
-    print("\n" + "=" * 80)
-    print("✅ Export abgeschlossen: URL_ANALYSE_RESULTS.json")
+    # Extrahiere und kategorisiere URLs (nur geänderte Abschnitte neu)
+    with metrics.stage('read'):
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+    size = os.path.getsize(filepath)
+    metrics.count('bytes_read', size)
+    
+    cache = None
+    if not args.no_cache and (args.cache or size >= CACHE_MIN_BYTES):
+        from url_cache import DEFAULT_CACHE_PATH, ManifestCache
+        cache = ManifestCache(args.cache or DEFAULT_CACHE_PATH)
+    try:
+        if fmt == 'regex':
+            mention_count, categorized = analyze_content(content, cache, os.path.abspath(filepath),
+                                                         metrics=metrics, columnar=True)
+        else:
+            mention_count, categorized = analyze_structured(content, fmt, cache, os.path.abspath(filepath),
+                                                            metrics=metrics, columnar=True)
+    finally:
+        if cache is not None:
+            cache.close()
+    
+    print(f"\n✅ Gefunden: {mention_count} URLs (davon {len(categorized)} unique)")
+    metrics.count('matches', mention_count)
+    if args.canonical:
+        raw_count = len(categorized)
+        with metrics.stage('canonical'):
+            categorized = merge_canonical(categorized)
+        print(f"🔗 Kanonisiert: {raw_count} -> {len(categorized)} unique URLs")
+    metrics.count('urls', len(categorized))
+    if cache is not None:
+        print(f"💾 Cache: {cache.summary()}")
+        metrics.add_cache_stats(cache.stats)
+    memo.close()
+    print(f"🧠 URL-Memo: {memo.summary()}")
+    metrics.add_cache_stats(memo.stats, prefix='memo')
     print("=" * 80)
     
-    # Erstelle auch eine lesbare Markdown-Datei
-    with open('URL_ANALYSE_REPORT.md', 'w', encoding='utf-8') as f:
-        f.write("# 📊 URL-ANALYSE REPORT\n\n")
-        f.write(f"**Analysiert:** ANALYSE_BERICHT.md\n")
-        f.write(f"**Datum:** {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-        
-        f.write("## 📈 STATISTIKEN\n\n")
-        f.write(f"- 📦 **GitHub Repositories:** {len(github_repos)}\n")
-        f.write(f"- 🖼️ **GitHub Assets (Bilder):** {len(github_assets)}\n")
-        f.write(f"- 💖 **Lovable.dev Projekte:** {len(lovable_projects)}\n")
-        f.write(f"- 🗄️ **Supabase Datenbanken:** {len(supabase_dbs)}\n")
-        f.write(f"- 🏷️ **Badges (shields.io):** {len(badges)}\n")
-        f.write(f"- 💬 **Discord Server:** {len(discord_servers)}\n")
-        f.write(f"- 📚 **Package Registries:** {len(registries)}\n")
-        f.write(f"- 📖 **Documentation Sites:** {len(documentation)}\n")
-        f.write(f"- 🏗️ **Infrastructure Tools:** {len(infrastructure)}\n")
-        f.write(f"- 📊 **TOTAL URLs:** {len(unique_urls)}\n\n")
+    # Gruppiere nach Typ
+    with metrics.stage('aggregate'):
+        by_type, by_category = group_urls(categorized)
+        stats = compute_statistics(categorized)
+        type_counts = {url_type: len(items) for url_type, items in by_type.items()}
+    
+    if args.console != 'quiet':
+        # Statistiken
+        print("\n📊 STATISTIKEN:")
+        print("=" * 80)
         
-        f.write("---\n\n")
+        print("\n🔷 Nach Typ:")
+        for url_type, items in sorted(by_type.items(), key=lambda x: len(x[1]), reverse=True):
+            print(f"  {url_type:20s}: {len(items):3d} URLs")
         
-        for url_type in sorted(by_type.keys()):
-            items = by_type[url_type]
-            f.write(f"## 🔹 {url_type.upper()} ({len(items)} URLs)\n\n")
-            
-            for i, item in enumerate(sorted(items, key=lambda x: x['url']), 1):
-                f.write(f"### {i}. {item['description']}\n\n")
-                f.write(f"**URL:** `{item['url']}`\n\n")
-                f.write(f"- **Typ:** {item['type']}\n")
-                f.write(f"- **Kategorie:** {item['category']}\n")
-                f.write(f"- **Kontext:** {item['context']}\n")
-                f.write(f"- **Domain:** {item['domain']}\n\n")
-                f.write("---\n\n")
+        print("\n🔷 Nach Kategorie:")
+        for category, items in sorted(by_category.items(), key=lambda x: len(x[1]), reverse=True):
+            print(f"  {category:20s}: {len(items):3d} URLs")
+    
+    # Alle Ausgaben in einem Durchlauf, die Dateien parallel
+    with metrics.stage('aggregate'):
+        output_data = build_output_data(categorized, by_type, by_category, stats)
+    sinks = [
+        JsonSink('URL_ANALYSE_RESULTS.json', output_data),
+        AnalyseReportSink('URL_ANALYSE_REPORT.md', filepath, stats, type_counts),
+    ]
+    if args.console == 'full':
+        sinks.append(DetailListingSink('-', type_counts))
+    if args.jsonl:
+        sinks.append(JsonLinesSink(args.jsonl))
+    if args.csv or args.export:
+        sinks.append(CsvSink(args.csv or 'URL_LISTE_VOLLSTAENDIG.csv'))
+    if args.md_table or args.export:
+        sinks.append(MarkdownTableSink(args.md_table or 'URL_TABELLE.md'))
+    # cProfile sieht nur den eigenen Thread: beim Profilieren nacheinander schreiben
+    with metrics.stage('write'):
+        timings = write_sinks(categorized, sinks, workers=1 if metrics.profile else None)
+    metrics.add_sink_timings(timings)
+    
+    if args.console != 'quiet':
+        print("\n\n" + "=" * 80)
+        print("🎯 ZUSAMMENFASSUNG:")
+        print("=" * 80)
+        print(f"📦 GitHub Repositories: {stats['github_repos']}")
+        print(f"🖼️  GitHub Assets (Bilder): {stats['github_assets']}")
+        print(f"💖 Lovable.dev Projekte: {stats['lovable_projects']}")
+        print(f"🗄️  Supabase Datenbanken: {stats['supabase_databases']}")
+        print(f"🏷️  Badges (shields.io): {stats['badges']}")
+        print(f"💬 Discord Server: {stats['discord_servers']}")
+        print(f"📚 Package Registries: {stats['package_registries']}")
+        print(f"📖 Documentation Sites: {stats['documentation_sites']}")
+        print(f"🏗️  Infrastructure Tools: {stats['infrastructure_tools']}")
+        print(f"📊 TOTAL URLs: {len(categorized)}")
     
+    print("\n" + "=" * 80)
+    print("✅ Export abgeschlossen: URL_ANALYSE_RESULTS.json")
+    print("=" * 80)
     print("✅ Markdown Report erstellt: URL_ANALYSE_REPORT.md")
     print("=" * 80)
+    for timing in timings[2:]:
+        if timing['path'] != '-':
+            print(f"✅ {timing['sink']} erstellt: {timing['path']}")
+    
+    if args.columnar:
+        with metrics.stage('write'):
+            categorized.save(args.columnar)
+        print(f"✅ Spaltenformat gespeichert: {args.columnar}")
+        print("=" * 80)
+    
+    if args.console != 'quiet':
+        print_sink_timings(timings)
+    metrics.finish(quiet=args.console == 'quiet')
 
 if __name__ == '__main__':
     main()
@@ -2,249 +2,574 @@
 """
 Extrahiert ALLE URLs aus ANALYSE_BERICHT.md - INKLUSIVE DUPLIKATE!
 Zeigt jede URL-Erwähnung mit vollständigem Kontext
+
+Die Erwähnungen liegen kompakt in einer MentionTable (url_mentions); die
+Kontextzeile wird erst beim Schreiben des Berichts aus der Datei gelesen.
 """
 
-import re
-from collections import defaultdict
+import argparse
+import heapq
+import io
+import os
+from array import array
+from collections import defaultdict, deque, namedtuple
+from itertools import chain, islice
+from types import MappingProxyType
 
-def extract_all_urls_with_context(filepath):
-    """Extrahiert ALLE URLs mit Kontext (keine Deduplizierung!)"""
-    
+from url_memo import SHARED_MEMO, add_memo_arguments, memo_from_args
+from url_mentions import MentionRows, MentionTable
+from url_metrics import add_metrics_arguments, metrics_from_args
+from url_sinks import Sink, print_sink_timings, run_sink, write_sinks
+from url_tokenizer import find_urls, iter_urls
+
+# url_canonical, url_index (sqlite3), url_sketches und concurrent.futures
+# werden erst mit --canonical/--near-duplicates, --index, --sketch bzw.
+# mehreren Bereichen geladen
+
+# Bytes pro Bereich bei der parallelen Suche in einer großen Datei; kleinere
+# Dateien werden wie bisher sequentiell gelesen
+RANGE_BYTES = 32 << 20
+
+def iter_mentions_with_context(filepath, canonical=False):
+    """Liefert ALLE URL-Erwähnungen mit Kontext, Zeile für Zeile gelesen
+
+    Mit canonical=True wird jede URL in kanonischer Form geliefert, so dass
+    Schreibvarianten als Duplikate derselben URL zählen. Jede Erwähnung ist
+    ein eigenes Dict mit Kopie der Zeile; für ganze Dateien ist
+    read_mentions() deutlich sparsamer.
+    """
     with open(filepath, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
-    
-    # URL Pattern
-    url_pattern = re.compile(r'https?://[^\s\)\]\'"<>]+')
+        yield from iter_line_mentions(f, canonical=canonical)
+
+def read_mentions(filepath, canonical=False):
+    """Alle Erwähnungen einer Datei als MentionTable (Kontext erst beim Rendern gelesen)"""
+    table = MentionTable(filepath)
+    # newline='': Zeilenenden bleiben erhalten, damit die Byte-Positionen stimmen
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        scan_mentions(f, table, canonical=canonical)
+    return table
+
+def update_heading(line, repo, category):
+    """(repo, category) nach einer Zeile; nur Überschriften ändern etwas"""
+    # Erkenne Kategorien
+    if line.startswith('## 🏷️'):
+        category = line.replace('## 🏷️', '').strip()
     
-    all_urls = []
-    current_repo = "Unknown"
-    current_category = "Unknown"
+    # Erkenne Repository-Namen
+    if line.startswith('### ') and '. ' in line:
+        repo = line.split('. ', 1)[1].strip()
+    return repo, category
+
+def iter_line_mentions(lines, first_line=1, repo="Unknown", category="Unknown", canonical=False):
+    """Erwähnungen in einer Folge von Zeilen, ab Zeilennummer first_line
+
+    repo und category sind der Kontext vor der ersten Zeile (für einzelne
+    Abschnitte z.B. None = "vom vorherigen Abschnitt übernehmen"). Der
+    Rückgabewert des Generators ist der Kontext (repo, category) nach der
+    letzten Zeile.
+    """
+    current_repo = repo
+    current_category = category
+    forms = {}
     
-    for line_num, line in enumerate(lines, 1):
-        # Erkenne Kategorien
-        if line.startswith('## 🏷️'):
-            current_category = line.replace('## 🏷️', '').strip()
-        
-        # Erkenne Repository-Namen
-        if line.startswith('### ') and '. ' in line:
-            current_repo = line.split('. ', 1)[1].strip()
+    for line_num, line in enumerate(lines, first_line):
+        if line.startswith('#'):
+            current_repo, current_category = update_heading(line, current_repo, current_category)
         
         # Finde alle URLs in der Zeile
-        matches = url_pattern.finditer(line)
-        for match in matches:
-            url = match.group(0)
-            # Entferne trailing Satzzeichen
-            url = url.rstrip('.,;:)\'"')
+        for url in find_urls(line):
+            if canonical:
+                form = forms.get(url)
+                if form is None:
+                    form = forms[url] = SHARED_MEMO.canonicalize(url)
+                url = form
             
             # Bestimme URL-Typ
-            url_type = classify_url(url)
-            
-            # Kontext
-            context = line.strip()
+            info = SHARED_MEMO.classify(url)
             
-            all_urls.append({
+            yield {
                 'url': url,
-                'type': url_type,
+                'type': info.type,
+                'domain': info.domain,
                 'line': line_num,
                 'repo': current_repo,
                 'category': current_category,
-                'context': context
-            })
+                'context': line.strip()
+            }
+    return current_repo, current_category
+
+def scan_mentions(lines, table, first_line=1, offset=0, repo="Unknown", category="Unknown",
+                  canonical=False):
+    """Hängt die Erwähnungen einer Folge von Zeilen an eine MentionTable an
+
+    Wie iter_line_mentions, aber ohne ein Dict pro Erwähnung. Die Zeilen
+    müssen ihr Zeilenende behalten (open(..., newline='')); offset ist die
+    Byte-Position der ersten Zeile in der Quelldatei. Gibt (Anzahl Zeilen,
+    (repo, category) nach der letzten Zeile) zurück.
+    """
+    forms = {}
+    append = table.append
+    line_num = first_line - 1
     
-    return all_urls
+    for line_num, line in enumerate(lines, first_line):
+        if line.startswith('#'):
+            repo, category = update_heading(line, repo, category)
+        
+        if 'http' in line:
+            for column, url in iter_urls(line):
+                if canonical:
+                    form = forms.get(url)
+                    if form is None:
+                        form = forms[url] = SHARED_MEMO.canonicalize(url)
+                    url = form
+                append(url, line_num, repo, category, offset, column)
+        offset += len(line) if line.isascii() else len(line.encode('utf-8'))
+    return line_num - first_line + 1, (repo, category)
+
+def split_line_ranges(filepath, range_bytes=RANGE_BYTES):
+    """Teilt eine Datei in Byte-Bereiche [start, end), die jeweils an einem Zeilenanfang beginnen"""
+    total = os.path.getsize(filepath)
+    ranges = []
+    start = 0
+    with open(filepath, 'rb') as f:
+        while start < total:
+            end = start + range_bytes
+            if end < total:
+                # Bis hinter das nächste '\n'; ein '\r\n' wird so nie getrennt
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            end = min(end, total)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+def scan_line_range(filepath, start, end, canonical=False):
+    """Erwähnungen eines Byte-Bereichs als MentionTable (läuft im Worker-Prozess)
+
+    Zeilennummern sind relativ zum Bereich. repo/category sind None, solange
+    im Bereich noch keine Überschrift vorkam; beides löst
+    iter_mention_tables() mit dem Zustand am Ende des vorherigen Bereichs
+    auf. Gibt (Tabelle, Anzahl Zeilen, (repo, category) am Ende) zurück.
+    """
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    # Zeilen wie beim Lesen der Datei ('\n', '\r\n' und '\r'), Zeilenenden erhalten
+    lines = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', newline='')
+    table = MentionTable(filepath)
+    line_count, state = scan_mentions(lines, table, offset=start, repo=None, category=None,
+                                      canonical=canonical)
+    return table, line_count, state
+
+def iter_mention_tables(filepath, workers=None, canonical=False, range_bytes=RANGE_BYTES):
+    """Die Erwähnungen einer Datei als MentionTable pro Byte-Bereich, in Dateireihenfolge
+
+    Die Bereiche werden in mehreren Prozessen durchsucht; ein Durchlauf
+    über die Ergebnisse verschiebt die Zeilennummern (line_offset der
+    gelieferten Paare (Tabelle, line_offset)) und setzt Repo und Kategorie
+    vor der ersten Überschrift eines Bereichs. Zusammen ergeben die
+    Tabellen genau das sequentielle Ergebnis. Es sind höchstens
+    2 × workers Bereiche gleichzeitig unterwegs, der Speicher wächst also
+    nicht mit der Dateigröße.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_line_ranges(filepath, range_bytes)
+    if workers == 1 or len(ranges) < 2:
+        yield read_mentions(filepath, canonical), 0
+        return
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    repo, category = "Unknown", "Unknown"
+    offset = 0
+    ranges = iter(ranges)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque(pool.submit(scan_line_range, filepath, start, end, canonical)
+                        for start, end in islice(ranges, workers * 2))
+        while pending:
+            table, line_count, (end_repo, end_category) = pending.popleft().result()
+            for start, end in islice(ranges, 1):
+                pending.append(pool.submit(scan_line_range, filepath, start, end, canonical))
+            
+            # Nur die Erwähnungen vor der ersten Überschrift brauchen den Kontext
+            # des vorherigen Bereichs; None kann nur im ersten Lauf stehen
+            for runs, value in ((table.repo_runs, repo), (table.category_runs, category)):
+                if runs.values and runs.values[0] is None:
+                    runs.set_first(value)
+            yield table, offset
+            
+            offset += line_count
+            repo = repo if end_repo is None else end_repo
+            category = category if end_category is None else end_category
+
+def iter_mentions_parallel(filepath, workers=None, canonical=False, range_bytes=RANGE_BYTES):
+    """Wie iter_mentions_with_context, die Bereiche der Datei in mehreren Prozessen
+
+    Liefert Mention-Sichten (url_mentions) in Dateireihenfolge, identisch
+    mit dem sequentiellen Lesen; siehe iter_mention_tables(). Mit einem
+    Worker kommen sie aus read_mentions().
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        with read_mentions(filepath, canonical) as table:
+            yield from table
+        return
+    for table, line_offset in iter_mention_tables(filepath, workers, canonical, range_bytes):
+        if line_offset:
+            table.lines = array('I', (line + line_offset for line in table.lines))
+        with table:
+            yield from table
+
+def extract_all_urls_with_context(filepath, canonical=False, workers=1):
+    """Extrahiert ALLE URLs mit Kontext (keine Deduplizierung!) als MentionTable
+
+    Mit workers != 1 wird eine große Datei in Bereichen parallel durchsucht
+    (iter_mention_tables; None = alle Kerne).
+    """
+    if workers == 1:
+        return read_mentions(filepath, canonical)
+    table = MentionTable(filepath)
+    for part, line_offset in iter_mention_tables(filepath, workers, canonical):
+        table.extend(part, line_offset)
+    return table
 
 def classify_url(url):
     """Klassifiziert URLs nach Typ"""
-    url_lower = url.lower()
-    
-    if 'github.com/user-attachments/assets' in url_lower:
-        return 'github-asset'
-    elif 'github.com' in url_lower and '.git' in url_lower:
-        return 'github-repo-git'
-    elif 'github.com' in url_lower:
-        return 'github-repo'
-    elif 'lovable.dev' in url_lower:
-        return 'lovable'
-    elif 'supabase.co' in url_lower:
-        return 'supabase'
-    elif 'shields.io' in url_lower:
-        return 'badge'
-    elif 'netlify.app' in url_lower:
-        return 'netlify'
-    elif 'discord' in url_lower:
-        return 'discord'
-    elif 'microsoft.com' in url_lower or 'azure' in url_lower:
-        return 'microsoft'
-    elif 'docker' in url_lower:
-        return 'docker'
-    elif 'kubernetes.io' in url_lower:
-        return 'kubernetes'
-    elif 'portainer.io' in url_lower:
-        return 'portainer'
-    elif 'pypi.org' in url_lower:
-        return 'pypi'
-    elif 'nuget.org' in url_lower:
-        return 'nuget'
-    elif 'opensource.org' in url_lower:
-        return 'license'
-    elif 'learn.microsoft.com' in url_lower:
-        return 'docs'
-    elif '.onbiela.dev' in url_lower:
-        return 'deployment'
-    elif 'macaly-app.com' in url_lower:
-        return 'macaly'
-    elif 'dmde.com' in url_lower or 'softdm.com' in url_lower:
-        return 'software'
-    elif any(x in url_lower for x in ['hnoss', 'ambassador', 'pohl']):
-        return 'organization'
-    elif 'vault' in url_lower:
-        return 'vault'
-    elif 'ollama' in url_lower:
-        return 'ai'
-    else:
-        return 'other'
-
-def generate_full_report(all_urls):
-    """Generiert vollständigen Bericht"""
-    
-    print("=" * 120)
-    print("VOLLSTÄNDIGE URL-EXTRAKTION AUS ANALYSE_BERICHT.md")
-    print("INKLUSIVE ALLER DUPLIKATE UND WIEDERHOLUNGEN")
-    print("=" * 120)
-    print(f"\nGESAMTANZAHL URL-ERWÄHNUNGEN: {len(all_urls)}")
-    print(f"ANZAHL UNIQUE URLs: {len(set(u['url'] for u in all_urls))}")
-    print()
-    
-    # Gruppierung nach Typ
+    return SHARED_MEMO.classify(url).type
+
+class MentionStats(namedtuple('MentionStats', 'total unique url_counts by_type type_unique '
+                                              'repo_counts category_counts')):
+    """Unveränderliche Kennzahlen aller Erwähnungen aus einem Durchlauf
+
+    url_counts, type_unique, repo_counts und category_counts sind
+    schreibgeschützte Mappings (Wert -> Anzahl) in Fundreihenfolge; by_type
+    ist ((Typ, (Erwähnungen, ...)), ...) mit dem häufigsten Typ zuerst.
+    """
+    
+    __slots__ = ()
+    
+    def top_urls(self, k=None):
+        """Meist-erwähnte URLs als [(URL, Anzahl)]; bei Gleichstand in Fundreihenfolge
+
+        Mit k läuft ein Heap über die Zähler statt einer vollständigen Sortierung.
+        """
+        if k is None:
+            return sorted(self.url_counts.items(), key=lambda x: x[1], reverse=True)
+        return heapq.nlargest(k, self.url_counts.items(), key=lambda x: x[1])
+
+def aggregate_mentions(all_urls):
+    """Zählt URLs, Typen, Repositories und Kategorien in einem Durchlauf"""
+    if isinstance(all_urls, MentionTable):
+        return aggregate_table(all_urls)
+    url_counts = defaultdict(int)
     by_type = defaultdict(list)
+    type_urls = defaultdict(set)
+    repo_counts = defaultdict(int)
+    category_counts = defaultdict(int)
+    
     for item in all_urls:
+        url = item['url']
+        url_counts[url] += 1
         by_type[item['type']].append(item)
+        type_urls[item['type']].add(url)
+        repo_counts[item['repo']] += 1
+        category_counts[item['category']] += 1
     
     sorted_types = sorted(by_type.items(), key=lambda x: len(x[1]), reverse=True)
+    return MentionStats(
+        total=sum(url_counts.values()),
+        unique=len(url_counts),
+        url_counts=MappingProxyType(dict(url_counts)),
+        by_type=tuple((url_type, tuple(items)) for url_type, items in sorted_types),
+        type_unique=MappingProxyType({url_type: len(urls) for url_type, urls in type_urls.items()}),
+        repo_counts=MappingProxyType(dict(repo_counts)),
+        category_counts=MappingProxyType(dict(category_counts)),
+    )
+
+def aggregate_table(table):
+    """aggregate_mentions für eine MentionTable: gezählt wird über die Code-Spalten
+
+    by_type enthält MentionRows (Zeilennummern) statt einer Liste von Erwähnungen.
+    """
+    url_counts = table.counts('url')
+    sorted_types = sorted(table.group_by_type().items(), key=lambda x: len(x[1]), reverse=True)
+    return MentionStats(
+        total=len(table),
+        unique=len(url_counts),
+        url_counts=MappingProxyType(url_counts),
+        by_type=tuple(sorted_types),
+        type_unique=MappingProxyType(table.unique_per_type()),
+        repo_counts=MappingProxyType(table.counts('repo')),
+        category_counts=MappingProxyType(table.counts('category')),
+    )
+
+def group_by_type(all_urls):
+    """Erwähnungen nach Typ, häufigster Typ zuerst: ((Typ, (Erwähnungen, ...)), ...)"""
+    return aggregate_mentions(all_urls).by_type
+
+class MentionReportSink(Sink):
+    """Bericht über alle Erwähnungen, nach Typ gruppiert, mit Häufigkeiten und Zusammenfassung
+
+    console=True ist die Konsolenfassung (Kontext gekürzt, nur Top 20 der
+    Häufigkeiten); listing=False lässt die Liste der Erwähnungen weg. Mit
+    context_window zeigt der Kontext von Erwähnungen aus einer MentionTable
+    nur so viele Zeichen vor und nach der URL.
+    """
     
-    # Ausgabe nach Typ
-    for url_type, items in sorted_types:
-        print(f"\n{'='*120}")
-        print(f"KATEGORIE: {url_type.upper()}")
-        print(f"Anzahl Erwähnungen: {len(items)}")
-        print(f"{'='*120}\n")
-        
-        for idx, item in enumerate(items, 1):
-            print(f"[{idx}/{len(items)}]")
-            print(f"  URL:         {item['url']}")
-            print(f"  TYPE:        {item['type']}")
-            print(f"  CATEGORY:    {item['category']}")
-            print(f"  REPO:        {item['repo']}")
-            print(f"  ZEILE:       {item['line']}")
-            if len(item['context']) > 100:
-                print(f"  CONTEXT:     {item['context'][:100]}...")
-            else:
-                print(f"  CONTEXT:     {item['context']}")
-            print()
-    
-    # Zähle Häufigkeit jeder URL
-    print("\n" + "=" * 120)
-    print("URL-HÄUFIGKEITSANALYSE (Top 20 meist-erwähnte URLs)")
-    print("=" * 120)
-    
-    url_counts = defaultdict(int)
-    for item in all_urls:
-        url_counts[item['url']] += 1
-    
-    sorted_urls = sorted(url_counts.items(), key=lambda x: x[1], reverse=True)
+    name = 'txt-report'
     
-    for idx, (url, count) in enumerate(sorted_urls[:20], 1):
-        print(f"{idx:2d}. [{count:3d}x] {url}")
+    def __init__(self, path, stats, console=False, listing=True, context_window=None):
+        super().__init__(path)
+        self.stats = stats
+        self.console = console
+        self.listing = listing
+        self.context_window = context_window
+        self.type_counts = {url_type: len(items) for url_type, items in stats.by_type}
+        self.current_type = None
+        self.index = 0
     
-    # Zusammenfassung nach Typ
-    print("\n" + "=" * 120)
-    print("ZUSAMMENFASSUNG NACH TYP:")
-    print("=" * 120)
-    for url_type, items in sorted_types:
-        unique_in_type = len(set(u['url'] for u in items))
-        print(f"{url_type:20s}: {len(items):4d} Erwähnungen ({unique_in_type:3d} unique URLs)")
-    print(f"\n{'TOTAL':20s}: {len(all_urls):4d} Erwähnungen ({len(set(u['url'] for u in all_urls)):3d} unique URLs)")
-    print("=" * 120)
-
-def save_full_report(all_urls, output_file):
-    """Speichert vollständigen Bericht"""
+    def prepare(self, records):
+        if not self.listing:
+            return []
+        # Erwähnungen aus einer MentionTable erst hier und paketweise als Dicts
+        return chain.from_iterable(
+            items.records(self.context_window) if isinstance(items, MentionRows) else items
+            for _, items in self.stats.by_type)
     
-    by_type = defaultdict(list)
-    for item in all_urls:
-        by_type[item['type']].append(item)
+    def header(self):
+        return (
+            "=" * 120 + "\n"
+            "VOLLSTÄNDIGE URL-EXTRAKTION AUS ANALYSE_BERICHT.md\n"
+            "INKLUSIVE ALLER DUPLIKATE UND WIEDERHOLUNGEN\n"
+            + "=" * 120 + "\n\n"
+            f"GESAMTANZAHL URL-ERWÄHNUNGEN: {self.stats.total}\n"
+            f"ANZAHL UNIQUE URLs: {self.stats.unique}\n\n"
+        )
     
-    sorted_types = sorted(by_type.items(), key=lambda x: len(x[1]), reverse=True)
+    def render(self, batch, start):
+        parts = []
+        for item in batch:
+            if item['type'] != self.current_type:
+                self.current_type = item['type']
+                self.index = 0
+                parts.append(
+                    f"\n{'='*120}\n"
+                    f"KATEGORIE: {self.current_type.upper()}\n"
+                    f"Anzahl Erwähnungen: {self.type_counts[self.current_type]}\n"
+                    f"{'='*120}\n\n"
+                )
+            self.index += 1
+            context = item['context']
+            if self.console and len(context) > 100:
+                context = context[:100] + "..."
+            parts.append(
+                f"[{self.index}/{self.type_counts[item['type']]}]\n"
+                f"  URL:         {item['url']}\n"
+                f"  TYPE:        {item['type']}\n"
+                f"  CATEGORY:    {item['category']}\n"
+                f"  REPO:        {item['repo']}\n"
+                f"  ZEILE:       {item['line']}\n"
+                f"  CONTEXT:     {context}\n\n"
+            )
+        return ''.join(parts)
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 120 + "\n")
-        f.write("VOLLSTÄNDIGE URL-EXTRAKTION AUS ANALYSE_BERICHT.md\n")
-        f.write("INKLUSIVE ALLER DUPLIKATE UND WIEDERHOLUNGEN\n")
-        f.write("=" * 120 + "\n\n")
-        f.write(f"GESAMTANZAHL URL-ERWÄHNUNGEN: {len(all_urls)}\n")
-        f.write(f"ANZAHL UNIQUE URLs: {len(set(u['url'] for u in all_urls))}\n\n")
-        
-        for url_type, items in sorted_types:
-            f.write(f"\n{'='*120}\n")
-            f.write(f"KATEGORIE: {url_type.upper()}\n")
-            f.write(f"Anzahl Erwähnungen: {len(items)}\n")
-            f.write(f"{'='*120}\n\n")
-            
-            for idx, item in enumerate(items, 1):
-                f.write(f"[{idx}/{len(items)}]\n")
-                f.write(f"  URL:         {item['url']}\n")
-                f.write(f"  TYPE:        {item['type']}\n")
-                f.write(f"  CATEGORY:    {item['category']}\n")
-                f.write(f"  REPO:        {item['repo']}\n")
-                f.write(f"  ZEILE:       {item['line']}\n")
-                f.write(f"  CONTEXT:     {item['context']}\n")
-                f.write("\n")
+    def footer(self):
+        parts = []
+        stats = self.stats
         
         # URL-Häufigkeit
-        f.write("\n" + "=" * 120 + "\n")
-        f.write("URL-HÄUFIGKEITSANALYSE\n")
-        f.write("=" * 120 + "\n\n")
-        
-        url_counts = defaultdict(int)
-        for item in all_urls:
-            url_counts[item['url']] += 1
-        
-        sorted_urls = sorted(url_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        for idx, (url, count) in enumerate(sorted_urls, 1):
-            f.write(f"{idx:3d}. [{count:3d}x] {url}\n")
+        if self.console:
+            parts.append("\n" + "=" * 120 + "\nURL-HÄUFIGKEITSANALYSE (Top 20 meist-erwähnte URLs)\n" + "=" * 120 + "\n")
+            parts.extend(f"{idx:2d}. [{count:3d}x] {url}\n" for idx, (url, count) in enumerate(stats.top_urls(20), 1))
+        else:
+            parts.append("\n" + "=" * 120 + "\nURL-HÄUFIGKEITSANALYSE\n" + "=" * 120 + "\n\n")
+            parts.extend(f"{idx:3d}. [{count:3d}x] {url}\n" for idx, (url, count) in enumerate(stats.top_urls(), 1))
         
         # Zusammenfassung
-        f.write("\n" + "=" * 120 + "\n")
-        f.write("ZUSAMMENFASSUNG NACH TYP:\n")
-        f.write("=" * 120 + "\n")
-        for url_type, items in sorted_types:
-            unique_in_type = len(set(u['url'] for u in items))
-            f.write(f"{url_type:20s}: {len(items):4d} Erwähnungen ({unique_in_type:3d} unique URLs)\n")
-        f.write(f"\n{'TOTAL':20s}: {len(all_urls):4d} Erwähnungen ({len(set(u['url'] for u in all_urls)):3d} unique URLs)\n")
-        f.write("=" * 120 + "\n")
+        parts.append("\n" + "=" * 120 + "\nZUSAMMENFASSUNG NACH TYP:\n" + "=" * 120 + "\n")
+        for url_type, items in stats.by_type:
+            parts.append(f"{url_type:20s}: {len(items):4d} Erwähnungen ({stats.type_unique[url_type]:3d} unique URLs)\n")
+        parts.append(f"\n{'TOTAL':20s}: {stats.total:4d} Erwähnungen "
+                     f"({stats.unique:3d} unique URLs)\n")
+        parts.append("=" * 120 + "\n")
+        return ''.join(parts)
 
-if __name__ == "__main__":
-    import sys
-    from pathlib import Path
+def sketch_mentions(mentions, error=0.01, epsilon=1e-4, delta=0.01, capacity=1000):
+    """Sketch-Modus: zählt Erwähnungen mit festem Speicher statt set()/dict pro URL"""
+    from url_sketches import MentionSketch
+    sketch = MentionSketch(error, epsilon, delta, capacity)
+    for item in mentions:
+        sketch.add(item['url'], item['type'], item['domain'])
+    return sketch
+
+class SketchReportSink(Sink):
+    """Bericht aus einem MentionSketch: geschätzte Kennzahlen, keine Liste der Erwähnungen"""
+    
+    name = 'sketch-report'
+    
+    def __init__(self, path, sketch, top=20):
+        super().__init__(path)
+        self.sketch = sketch
+        self.top = top
+    
+    def header(self):
+        sketch = self.sketch
+        return (
+            "=" * 120 + "\n"
+            "URL-EXTRAKTION IM SKETCH-MODUS (GESCHÄTZTE WERTE)\n"
+            + "=" * 120 + "\n\n"
+            f"GESAMTANZAHL URL-ERWÄHNUNGEN: {sketch.total}\n"
+            f"ANZAHL UNIQUE URLs: ~{sketch.unique()} (±{sketch.urls.error:.1%})\n"
+        )
+    
+    def render(self, batch, start):
+        return ''
     
-    # Dateipfade
-    script_dir = Path(__file__).parent
-    input_file = script_dir / "ANALYSE_BERICHT.md"
-    output_file = script_dir / "ALLE_URLS_MIT_DUPLIKATEN.txt"
+    def footer(self):
+        sketch = self.sketch
+        _, epsilon, delta, capacity = sketch.settings
+        parts = ["\n" + "=" * 120 + f"\nURL-HÄUFIGKEITSANALYSE (Top {self.top}, geschätzt: "
+                 f"höchstens +{epsilon * sketch.total:.0f} mit {1 - delta:.0%} Sicherheit)\n" + "=" * 120 + "\n"]
+        parts.extend(f"{idx:2d}. [~{count:3d}x] {url}\n"
+                     for idx, (url, count) in enumerate(sketch.top_urls(self.top), 1))
+        
+        parts.append("\n" + "=" * 120 + "\nZUSAMMENFASSUNG NACH TYP:\n" + "=" * 120 + "\n")
+        for url_type, count, unique_urls, unique_domains in sketch.by_type():
+            parts.append(f"{url_type:20s}: {count:4d} Erwähnungen (~{unique_urls:3d} unique URLs, "
+                         f"~{unique_domains:3d} Domains)\n")
+        parts.append(f"\n{'TOTAL':20s}: {sketch.total:4d} Erwähnungen (~{sketch.unique():3d} unique URLs)\n")
+        parts.append(f"{'SKETCH-SPEICHER':20s}: {sketch.nbytes() / 1e6:.1f} MB "
+                     f"(HLL ±{sketch.urls.error:.1%}, Count-Min ε={epsilon:g} δ={delta:g}, {capacity} Kandidaten)\n")
+        parts.append("=" * 120 + "\n")
+        return ''.join(parts)
+
+def generate_full_report(all_urls, listing=True, stats=None):
+    """Generiert vollständigen Bericht (Konsole)"""
+    stats = stats or aggregate_mentions(all_urls)
+    return run_sink(MentionReportSink('-', stats, console=True, listing=listing), all_urls)
+
+def save_full_report(all_urls, output_file, stats=None):
+    """Speichert vollständigen Bericht"""
+    stats = stats or aggregate_mentions(all_urls)
+    return run_sink(MentionReportSink(str(output_file), stats), all_urls)
+
+def main(argv=None):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Extrahiert alle URL-Erwähnungen inklusive Duplikate")
+    parser.add_argument('input', nargs='?', default=os.path.join(script_dir, "ANALYSE_BERICHT.md"))
+    parser.add_argument('-o', '--output', default=os.path.join(script_dir, "ALLE_URLS_MIT_DUPLIKATEN.txt"))
+    parser.add_argument('--console', choices=['full', 'summary', 'quiet'], default='full',
+                        help="Konsolenausgabe: full = alle Erwähnungen, summary = nur "
+                             "Häufigkeiten und Zusammenfassung, quiet = keine")
+    parser.add_argument('--canonical', action='store_true',
+                        help="URLs kanonisieren: Schreibvarianten zählen als Duplikate")
+    parser.add_argument('--near-duplicates', action='store_true',
+                        help="Gruppen naher Duplikate ausgeben (gleicher Host und Pfad, "
+                             "andere Query)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="Worker-Prozesse für Dateien ab zwei Bereichen à "
+                             f"{RANGE_BYTES >> 20} MB (Standard: alle Kerne, 1 = sequentiell)")
+    parser.add_argument('--context-window', type=int, metavar='N',
+                        help="Im Bericht nur N Zeichen Kontext vor und nach jeder URL "
+                             "(Standard: ganze Zeile)")
+    parser.add_argument('--index', metavar='PATH',
+                        help="Erwähnungen zusätzlich in einen SQLite-Index schreiben (url_index)")
+    parser.add_argument('--sketch', action='store_true',
+                        help="Nur geschätzte Kennzahlen mit festem Speicher (HyperLogLog, "
+                             "Count-Min, Space-Saving); keine Liste der Erwähnungen")
+    parser.add_argument('--sketch-error', type=float, default=0.01,
+                        help="Relativer Standardfehler der Unique-Zählung (HyperLogLog)")
+    parser.add_argument('--cms-epsilon', type=float, default=1e-4,
+                        help="Count-Min: Überschätzung höchstens epsilon × Erwähnungen")
+    parser.add_argument('--cms-delta', type=float, default=0.01,
+                        help="Count-Min: Wahrscheinlichkeit, dass die Schranke nicht hält")
+    parser.add_argument('--heavy-hitters', type=int, default=1000,
+                        help="Space-Saving: Anzahl Kandidaten für die häufigsten URLs")
+    add_memo_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args(argv)
+    # Lesen, Suchen, Klassifizieren und Kontext laufen zeilenweise verschränkt
+    # und werden gemeinsam als Stufe extract gemessen
+    metrics = metrics_from_args('extract_all_urls_with_duplicates', args)
+    memo = memo_from_args(args)
+    input_file = args.input
+    output_file = args.output
     
     print("Starte vollständige URL-Extraktion (inkl. Duplikate)...")
     print(f"Eingabedatei: {input_file}\n")
+    metrics.count('bytes_read', os.path.getsize(input_file))
     
-    # URLs extrahieren
-    all_urls = extract_all_urls_with_context(input_file)
+    if args.sketch:
+        with metrics.stage('extract'):
+            mentions = iter_mentions_parallel(input_file, args.workers, args.canonical)
+            sketch = sketch_mentions(mentions, args.sketch_error, args.cms_epsilon, args.cms_delta,
+                                     args.heavy_hitters)
+        metrics.count('matches', sketch.total)
+        metrics.set('urls_estimated', sketch.unique())
+        memo.close()
+        metrics.add_cache_stats(memo.stats, prefix='memo')
+        sinks = [SketchReportSink(output_file, sketch)]
+        if args.console != 'quiet':
+            sinks.insert(0, SketchReportSink('-', sketch))
+        with metrics.stage('write'):
+            timings = write_sinks([], sinks, workers=1 if metrics.profile else None)
+        metrics.add_sink_timings(timings)
+        print(f"\n✅ Sketch-Bericht wurde gespeichert: {output_file}")
+        print(f"🧠 URL-Memo: {memo.summary()}")
+        if args.console != 'quiet':
+            print_sink_timings(timings)
+        metrics.finish(quiet=args.console == 'quiet')
+        return
     
-    # Bericht generieren
-    generate_full_report(all_urls)
+    # URLs extrahieren
+    with metrics.stage('extract'):
+        all_urls = extract_all_urls_with_context(input_file, args.canonical, args.workers)
     
-    # In Datei speichern
-    save_full_report(all_urls, output_file)
+    # Kennzahlen einmal berechnen, Bericht für Konsole und Datei in einem Durchlauf
+    with metrics.stage('aggregate'):
+        stats = aggregate_mentions(all_urls)
+    metrics.count('matches', stats.total)
+    metrics.count('urls', stats.unique)
+    sinks = []
+    if args.console != 'quiet':
+        sinks.append(MentionReportSink('-', stats, console=True, listing=args.console == 'full',
+                                       context_window=args.context_window))
+    sinks.append(MentionReportSink(output_file, stats, context_window=args.context_window))
+    with metrics.stage('write'):
+        timings = write_sinks(all_urls, sinks, workers=1 if metrics.profile else None)
+    metrics.add_sink_timings(timings)
     
     print(f"\n✅ Vollständiger Bericht wurde gespeichert: {output_file}")
+    if args.index:
+        from url_index import UrlIndex
+        index = UrlIndex(args.index)
+        try:
+            with metrics.stage('index'):
+                count = index.add_mentions(input_file, all_urls)
+                index.analyze()
+        finally:
+            index.close()
+        print(f"✅ {count} Erwähnungen indiziert: {args.index}")
+    # Berichte und Index sind geschrieben: die Abbildung der Eingabedatei freigeben
+    all_urls.close()
+    memo.close()
+    metrics.add_cache_stats(memo.stats, prefix='memo')
     print(f"\n📊 STATISTIK:")
-    print(f"   - Gesamt URL-Erwähnungen: {len(all_urls)}")
-    print(f"   - Unique URLs: {len(set(u['url'] for u in all_urls))}")
+    print(f"   - Gesamt URL-Erwähnungen: {stats.total}")
+    print(f"   - Unique URLs: {stats.unique}")
+    print(f"   - Duplikate: {stats.total - stats.unique}")
+    print(f"   - Repositories: {len(stats.repo_counts)}, Kategorien: {len(stats.category_counts)}")
+    print(f"   - URL-Memo: {memo.summary()}")
+    if args.near_duplicates:
+        from url_canonical import format_clusters, near_duplicate_clusters
+        with metrics.stage('near_duplicates'):
+            clusters = near_duplicate_clusters(stats.url_counts)
+        print(f"\n🔗 NAHE DUPLIKATE: {len(clusters)} Gruppen")
+        print(format_clusters(clusters), end='')
+    if args.console != 'quiet':
+        print_sink_timings(timings)
+    metrics.finish(quiet=args.console == 'quiet')
+
+if __name__ == "__main__":
+    main()
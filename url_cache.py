@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Persistenter Manifest-Cache für die URL-Extraktion
+Speichert Extraktions- und Klassifikationsergebnisse in SQLite, einmal pro
+Datei (Pfad + Inhalts-Hash) und einmal pro Abschnitt (Inhalts-Hash), damit
+bei einem erneuten Lauf nur geänderte Teile neu berechnet werden. Pro Datei
+wird vermerkt, welche Abschnitte ihr letzter Stand benutzt; Abschnitte, auf
+die keine Datei mehr verweist, entfernt prune() (beim Schließen automatisch).
+"""
+
+import hashlib
+import json
+import sqlite3
+from collections import Counter
+
+from url_classifier import rules_version
+from url_tokenizer import URL_PATTERN
+
+DEFAULT_CACHE_PATH = '.url_cache.sqlite'
+
+# Bei Format-Änderungen erhöhen, damit alte Einträge verworfen werden
+CACHE_FORMAT = 2
+
+
+def content_digest(text):
+    """SHA-256 über den Text (UTF-8)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def file_digest(path):
+    """SHA-256 über den Dateiinhalt (Bytes)"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ManifestCache:
+    """SQLite-Manifest: Datei- und Abschnitts-Ergebnisse nach Inhalts-Hash"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, version=None):
+        self.path = path
+        self.version = version or f"{CACHE_FORMAT}:{rules_version()}:{content_digest(URL_PATTERN)[:16]}"
+        self.stats = Counter()
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS files (
+                kind TEXT NOT NULL,
+                path TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (kind, path)
+            );
+            CREATE TABLE IF NOT EXISTS sections (
+                digest TEXT PRIMARY KEY,
+                result TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS file_sections (
+                path TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                PRIMARY KEY (path, digest)
+            );
+            CREATE INDEX IF NOT EXISTS file_sections_digest ON file_sections (digest);
+        """)
+        # Wurden in diesem Lauf Verweise geändert, räumt close() auf
+        self.references_changed = False
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row[0] != self.version:
+            # Regeln oder Format geändert: alle Ergebnisse sind ungültig
+            self.conn.executescript("DELETE FROM files; DELETE FROM sections; DELETE FROM file_sections;")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (self.version,))
+            self.conn.commit()
+
+    def get_file(self, path, digest, kind='analyze'):
+        row = self.conn.execute("SELECT digest, result FROM files WHERE kind = ? AND path = ?",
+                                (kind, path)).fetchone()
+        if row is not None and row[0] == digest:
+            self.stats['file_hits'] += 1
+            return json.loads(row[1])
+        self.stats['file_misses'] += 1
+        return None
+
+    def put_file(self, path, digest, result, kind='analyze', sections=None):
+        """Speichert das Ergebnis einer Datei
+
+        sections sind die Digests der Abschnitte dieses Stands; sie ersetzen
+        die Verweise des vorherigen Stands der Datei.
+        """
+        self.conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                          (kind, path, digest, json.dumps(result, ensure_ascii=False)))
+        if sections is not None:
+            self.conn.execute("DELETE FROM file_sections WHERE path = ?", (path,))
+            self.conn.executemany("INSERT OR IGNORE INTO file_sections VALUES (?, ?)",
+                                  ((path, section) for section in sections))
+            self.references_changed = True
+
+    def get_section(self, digest):
+        row = self.conn.execute("SELECT result FROM sections WHERE digest = ?", (digest,)).fetchone()
+        if row is not None:
+            self.stats['section_hits'] += 1
+            return json.loads(row[0])
+        self.stats['section_misses'] += 1
+        return None
+
+    def put_section(self, digest, result):
+        self.conn.execute("INSERT OR REPLACE INTO sections VALUES (?, ?)",
+                          (digest, json.dumps(result, ensure_ascii=False)))
+
+    def prune(self):
+        """Entfernt Abschnitte, auf die keine Datei mehr verweist; gibt die Anzahl zurück"""
+        removed = self.conn.execute(
+            "DELETE FROM sections WHERE digest NOT IN (SELECT digest FROM file_sections)").rowcount
+        self.stats['sections_pruned'] += removed
+        self.references_changed = False
+        return removed
+
+    def summary(self):
+        """Lesbare Trefferstatistik"""
+        s = self.stats
+        text = (f"Dateien {s['file_hits']} Treffer / {s['file_misses']} Fehlschläge, "
+                f"Abschnitte {s['section_hits']} Treffer / {s['section_misses']} Fehlschläge")
+        if s['sections_pruned']:
+            text += f", {s['sections_pruned']} veraltete Abschnitte entfernt"
+        return text
+
+    def close(self):
+        if self.references_changed:
+            self.prune()
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Kanonische Form von URLs und Gruppierung naher Duplikate
+Bringt Schreibvarianten derselben Ressource auf eine Form:
+
+    Schema und Host klein, IDN als Punycode, Standard-Ports entfernt
+    Prozent-Kodierung normalisiert (Hex groß, ungeschützte Zeichen dekodiert)
+    Punkt-Segmente aufgelöst, '/' und '.git' am Pfadende entfernt
+    Tracking-Parameter (utm_*, fbclid, ...) entfernt, Query nach Schlüssel sortiert
+    Fragment entfernt
+
+    https://GitHub.com:443/x/y.git/  ->  https://github.com/x/y
+
+Nahe Duplikate sind URLs mit gleichem Host und gleichem Pfad(-präfix), die
+sich nur in der Query unterscheiden (z.B. shields.io-Badges mit anderem
+style=). canonicalize_batch() kanonisiert jede unterschiedliche URL nur
+einmal; bereits kanonische URLs erkennt eine einzige Regex ohne Zerlegung.
+"""
+
+import argparse
+import re
+import sys
+from collections import defaultdict
+from hashlib import blake2b
+from urllib.parse import urlsplit
+
+from url_tokenizer import find_urls
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+# Query-Parameter, die nur der Reichweitenmessung dienen
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+                   '_ga', '_gl', 'ref_src', 'ref_url', 'spm'}
+TRACKING_PREFIXES = ('utm_',)
+
+_PERCENT = re.compile(r'%([0-9A-Fa-f]{2})')
+_UNRESERVED = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-._~')
+# Bereits kanonisch: kleiner ASCII-Host ohne Port, kein Query/Fragment/Prozent,
+# kein '/' oder '.git' am Ende und keine Punkt-Segmente (siehe is_canonical)
+_CANONICAL_FAST = re.compile(r'https?://[a-z0-9-]+(?:\.[a-z0-9-]+)*(?:/[^?#%\s]*)?')
+
+
+def _decode_unreserved(match):
+    char = chr(int(match.group(1), 16))
+    return char if char in _UNRESERVED else '%' + match.group(1).upper()
+
+
+def _normalize_percent(text):
+    return _PERCENT.sub(_decode_unreserved, text) if '%' in text else text
+
+
+def _remove_dot_segments(path):
+    """RFC 3986, Abschnitt 5.2.4"""
+    if '/.' not in path:
+        return path
+    output = []
+    for segment in path.split('/')[1:]:
+        if segment == '..':
+            if output:
+                output.pop()
+        elif segment != '.':
+            output.append(segment)
+    if path.endswith(('/.', '/..')):
+        output.append('')
+    return '/' + '/'.join(output)
+
+
+def _host(hostname):
+    hostname = hostname.rstrip('.')
+    if hostname.isascii():
+        return hostname
+    try:
+        return hostname.encode('idna').decode('ascii')
+    except UnicodeError:
+        return hostname
+
+
+def is_canonical(url):
+    """Schnelltest: ist die URL schon in kanonischer Form?"""
+    return (_CANONICAL_FAST.fullmatch(url) is not None and url[-1] != '/'
+            and not url.endswith('.git') and '/.' not in url)
+
+
+def canonicalize(url):
+    """Kanonische Form einer URL (siehe Modulbeschreibung)"""
+    if is_canonical(url):
+        return url
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = _host(parts.hostname or '')
+    if ':' in host:
+        # IPv6-Literal: hostname liefert es ohne Klammern
+        host = f"[{host}]"
+    netloc = host
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    if '@' in parts.netloc:
+        netloc = parts.netloc.rsplit('@', 1)[0] + '@' + netloc
+
+    path = _remove_dot_segments(_normalize_percent(parts.path)).rstrip('/')
+    if path.endswith('.git'):
+        path = path[:-4].rstrip('/')
+
+    query = ''
+    if parts.query:
+        params = []
+        for param in parts.query.split('&'):
+            if not param:
+                continue
+            param = _normalize_percent(param)
+            key = param.split('=', 1)[0].lower()
+            if key in TRACKING_PARAMS or key.startswith(TRACKING_PREFIXES):
+                continue
+            params.append((param.split('=', 1)[0], param))
+        if params:
+            params.sort(key=lambda x: x[0])
+            query = '?' + '&'.join(param for _, param in params)
+
+    return f"{scheme}://{netloc}{path}{query}"
+
+
+def canonical_key(url):
+    """Kurzer Hash der kanonischen Form (16 Hex-Zeichen), z.B. als Datenbankschlüssel"""
+    return blake2b(canonicalize(url).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def canonicalize_batch(urls):
+    """Kanonische Formen für eine Folge von URLs (mit Wiederholungen)
+
+    Jede unterschiedliche URL wird nur einmal nachgeschlagen (im URL-Memo,
+    siehe url_memo); gibt eine Liste in Eingabereihenfolge zurück.
+    """
+    from url_memo import SHARED_MEMO
+    forms = {}
+    result = []
+    append = result.append
+    for url in urls:
+        form = forms.get(url)
+        if form is None:
+            form = forms[url] = SHARED_MEMO.canonicalize(url)
+        append(form)
+    return result
+
+
+def cluster_key(url, depth=None):
+    """Host + die ersten depth Pfadsegmente (alle bei None), ohne Schema und Query"""
+    canonical = canonicalize(url)
+    rest = canonical.split('://', 1)[-1].split('?', 1)[0]
+    if depth is None:
+        return rest
+    host, _, path = rest.partition('/')
+    segments = [segment for segment in path.split('/') if segment][:depth]
+    return '/'.join([host] + segments)
+
+
+def near_duplicate_clusters(url_counts, depth=None):
+    """Gruppen unterschiedlicher URLs mit gleichem Cluster-Schlüssel
+
+    url_counts ist URL -> Anzahl Erwähnungen. Gibt [(Schlüssel, [(URL, Anzahl)])]
+    zurück, nur Gruppen mit mindestens zwei URLs, die meist-erwähnte zuerst.
+    """
+    clusters = defaultdict(list)
+    for url, count in url_counts.items():
+        clusters[cluster_key(url, depth)].append((url, count))
+    groups = [(key, members) for key, members in clusters.items() if len(members) > 1]
+    return sorted(groups, key=lambda x: sum(count for _, count in x[1]), reverse=True)
+
+
+def format_clusters(clusters, limit=20):
+    """Textblock für Berichte: die größten Gruppen naher Duplikate"""
+    lines = []
+    for key, members in clusters[:limit]:
+        total = sum(count for _, count in members)
+        lines.append(f"{key}  ({len(members)} Varianten, {total}x)\n")
+        lines.extend(f"    [{count:3d}x] {url}\n" for url, count in members)
+    if len(clusters) > limit:
+        lines.append(f"... {len(clusters) - limit} weitere Gruppen\n")
+    return ''.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kanonisiert URLs und gruppiert nahe Duplikate")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--clusters', action='store_true',
+                        help="Nahe Duplikate statt der URL-Zuordnung ausgeben")
+    parser.add_argument('--depth', type=int, default=None,
+                        help="Pfadsegmente im Cluster-Schlüssel (Standard: ganzer Pfad)")
+    args = parser.parse_args(argv)
+
+    counts = defaultdict(int)
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for url in find_urls(f.read()):
+                counts[url] += 1
+
+    if args.clusters:
+        clusters = near_duplicate_clusters(counts, args.depth)
+        sys.stdout.write(format_clusters(clusters, limit=len(clusters)))
+        return 0
+    for url in counts:
+        canonical = canonicalize(url)
+        print(f"{canonical_key(url)}\t{canonical}" + ("" if canonical == url else f"\t<- {url}"))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Gemeinsamer URL-Klassifikator für alle Extraktions-Skripte
+Die Regeln werden in einen Trie über die umgedrehten Domain-Labels
+kompiliert, der Aufwand pro URL hängt nur von der Anzahl der Labels ab
+"""
+
+import re
+from collections import namedtuple
+
+UrlClass = namedtuple('UrlClass', ['type', 'category', 'description', 'domain'])
+
+# (Domain-Suffix, Typ, Kategorie, Beschreibung)
+# Ein Suffix passt auf die Domain selbst und alle Subdomains,
+# der spezifischste Suffix gewinnt.
+DOMAIN_RULES = [
+    ('github.com', 'github-repo', 'devtools', 'GitHub Repository'),
+    ('lovable.dev', 'lovable', 'platforms', 'Lovable.dev Project'),
+    ('supabase.co', 'supabase', 'infrastructure', 'Supabase Database'),
+    ('shields.io', 'badge', 'documentation', 'Shields.io Badge'),
+    ('discord.gg', 'discord', 'platforms', 'Discord Server/Badge'),
+    ('discord.com', 'discord', 'platforms', 'Discord Server/Badge'),
+    ('dcbadge.limes.pink', 'discord', 'platforms', 'Discord Server/Badge'),
+    ('netlify.app', 'infrastructure', 'infrastructure', 'Netlify Deployment'),
+    ('netlify.com', 'infrastructure', 'infrastructure', 'Netlify Deployment'),
+    ('microsoft.com', 'documentation', 'documentation', 'Microsoft Documentation'),
+    ('azure.com', 'documentation', 'documentation', 'Microsoft Documentation'),
+    ('dotnet.microsoft.com', 'documentation', 'devtools', '.NET Documentation'),
+    ('docker.com', 'registry', 'infrastructure', 'Docker Hub'),
+    ('kubernetes.io', 'documentation', 'infrastructure', 'Kubernetes Documentation'),
+    ('pypi.org', 'registry', 'devtools', 'Python Package Index'),
+    ('nuget.org', 'registry', 'devtools', 'NuGet Package Registry'),
+    ('maven.org', 'registry', 'devtools', 'Maven Repository'),
+    ('maven.apache.org', 'registry', 'devtools', 'Maven Repository'),
+    ('mvnrepository.com', 'registry', 'devtools', 'Maven Repository'),
+    ('npmjs.com', 'registry', 'devtools', 'NPM Package Registry'),
+    ('npmjs.org', 'registry', 'devtools', 'NPM Package Registry'),
+    ('opensource.org', 'license', 'documentation', 'Open Source License'),
+    ('vaultproject.io', 'infrastructure', 'security', 'HashiCorp Vault'),
+    ('ollama.ai', 'infrastructure', 'ai', 'Ollama AI'),
+    ('ollama.com', 'infrastructure', 'ai', 'Ollama AI'),
+    ('portainer.io', 'infrastructure', 'infrastructure', 'Portainer'),
+    ('onbiela.dev', 'platforms', 'platforms', 'Onbiela Platform'),
+    ('macaly-app.com', 'platforms', 'platforms', 'Macaly Application'),
+    ('cal.com', 'platforms', 'platforms', 'Cal.com Scheduling'),
+    ('dmde.com', 'software', 'devtools', 'DMDE Software'),
+    ('softdm.com', 'software', 'devtools', 'DMDE Software'),
+    ('hnoss-ambassador.org', 'reference', 'documentation', 'HNOSS Ambassador Organization'),
+    ('universal-values.org', 'reference', 'documentation', 'Universal Values'),
+    ('st-daniel-pohl.org', 'reference', 'documentation', 'St. Daniel Pohl'),
+]
+
+# (Domain-Suffix, Pfad-Präfix, Typ, Kategorie, Beschreibung)
+# Verfeinert eine Domain-Regel anhand des (kleingeschriebenen) Pfads.
+PATH_RULES = [
+    ('github.com', '/user-attachments/assets/', 'github-asset', 'creative', 'GitHub Asset/Image'),
+]
+
+DEFAULT_TYPE = 'other'
+DEFAULT_CATEGORY = 'other'
+
+# Schema + Netloc + Pfad ohne Query/Fragment
+_URL_PARTS = re.compile(r'^[A-Za-z][A-Za-z0-9+.\-]*://([^/?#]*)([^?#]*)')
+
+# Schlüssel im Trie, die nie als Domain-Label vorkommen
+_RULE = None
+_PATHS = '/'
+
+
+def compile_rules(domain_rules=DOMAIN_RULES, path_rules=PATH_RULES):
+    """Kompiliert die Regel-Tabellen in einen Trie über umgedrehte Labels"""
+    trie = {}
+
+    def node_for(suffix):
+        node = trie
+        for label in reversed(suffix.lower().split('.')):
+            node = node.setdefault(label, {})
+        return node
+
+    for suffix, url_type, category, description in domain_rules:
+        node_for(suffix)[_RULE] = (url_type, category, description)
+
+    for suffix, prefix, url_type, category, description in path_rules:
+        node = node_for(suffix)
+        if _RULE not in node:
+            raise ValueError(f"Pfad-Regel ohne Domain-Regel: {suffix}")
+        paths = node.setdefault(_PATHS, [])
+        paths.append((prefix.lower(), (url_type, category, description)))
+        # Längstes Präfix zuerst prüfen
+        paths.sort(key=lambda item: len(item[0]), reverse=True)
+
+    return trie
+
+
+def split_host_path(url):
+    """Zerlegt eine URL in (netloc, host, pfad), alles kleingeschrieben"""
+    match = _URL_PARTS.match(url)
+    if not match:
+        return '', '', ''
+    netloc = match.group(1).lower()
+    host = netloc.rpartition('@')[2]
+    if host.startswith('['):
+        host = host[:host.find(']') + 1]
+    else:
+        host = host.partition(':')[0]
+    return netloc, host.rstrip('.'), match.group(2).lower()
+
+
+def lookup(trie, host, path):
+    """Sucht die spezifischste Regel für Host und Pfad"""
+    node = trie
+    rule_node = None
+    for label in reversed(host.split('.')):
+        node = node.get(label)
+        if node is None:
+            break
+        if _RULE in node:
+            rule_node = node
+
+    if rule_node is None:
+        return None
+
+    for prefix, rule in rule_node.get(_PATHS, ()):
+        if path.startswith(prefix):
+            return rule
+    return rule_node[_RULE]
+
+
+def rules_version(domain_rules=DOMAIN_RULES, path_rules=PATH_RULES):
+    """Kurzer Hash über die Regel-Tabellen (zum Invalidieren von Caches)"""
+    import hashlib  # erst hier: die Klassifikation selbst braucht kein OpenSSL
+    payload = repr((domain_rules, path_rules, DEFAULT_TYPE, DEFAULT_CATEGORY))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+_DEFAULT_TRIE = compile_rules()
+
+
+def classify_url(url, trie=None):
+    """Klassifiziert eine URL nach Typ, Kategorie und Beschreibung"""
+    netloc, host, path = split_host_path(url)
+    rule = lookup(_DEFAULT_TRIE if trie is None else trie, host, path)
+    if rule is None:
+        return UrlClass(DEFAULT_TYPE, DEFAULT_CATEGORY, '', netloc)
+    return UrlClass(rule[0], rule[1], rule[2], netloc)
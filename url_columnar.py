@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Spaltenorientierter Speicher für URL-Ergebnisse
+Typ, Kategorie, Domain, Beschreibung und Kontext werden als kleine
+Integer-Codes in internierten String-Pools gehalten, alle URLs liegen in
+einem zusammenhängenden UTF-8-Puffer mit Offsets. Gruppieren und
+Exportieren kommen ohne ein Dict pro URL aus: table[i], table[a:b] und der
+Iterator bauen die Datensatz-Dicts erst beim Lesen.
+
+Dateiformat (.urlcol, native Byte-Reihenfolge, per mmap ladbar):
+    Magic b'URLCOL1\\n', Byte-Reihenfolge (1 Byte: b'<' oder b'>'), 7 Byte Padding
+    Zeilenanzahl (Q)
+    pro Code-Spalte: Pool (Anzahl Q, Offsets Q*(Anzahl+1), UTF-8-Blob, Padding auf 8)
+                     und Codes (I * Zeilenanzahl, Padding auf 8)
+    URL-Offsets (Q * (Zeilenanzahl+1)) und URL-Blob
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+MAGIC = b'URLCOL1\n'
+CODE_COLUMNS = ('type', 'category', 'domain', 'description', 'context')
+COLUMNS = ('url',) + CODE_COLUMNS
+
+
+class StringPool:
+    """Interniert Strings zu fortlaufenden Integer-Codes"""
+
+    def __init__(self, strings=()):
+        self.strings = list(strings)
+        self.codes = {s: i for i, s in enumerate(self.strings)}
+
+    def intern(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def __getitem__(self, code):
+        return self.strings[code]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class UrlTable(Sequence):
+    """Spaltenorientierte Tabelle der kategorisierten URLs
+
+    Als Sequenz gelesen liefert sie Dicts mit den Schlüsseln aus COLUMNS
+    (wie die Einträge von all_urls). Eine per load() abgebildete Tabelle
+    wird mit close() bzw. als Kontextmanager wieder freigegeben.
+    """
+
+    def __init__(self):
+        self.url_blob = bytearray()
+        self.url_offsets = array('Q', [0])
+        self.pools = {name: StringPool() for name in CODE_COLUMNS}
+        self.codes = {name: array('I') for name in CODE_COLUMNS}
+        self._mapping = None
+
+    @classmethod
+    def from_records(cls, records):
+        """Baut die Tabelle aus Dicts mit den Schlüsseln aus COLUMNS"""
+        table = cls()
+        for record in records:
+            table.append(*(record.get(name, '') for name in COLUMNS))
+        return table
+
+    def append(self, url, url_type, category, domain, description='', context=''):
+        self.url_blob += url.encode('utf-8')
+        self.url_offsets.append(len(self.url_blob))
+        for name, value in zip(CODE_COLUMNS, (url_type, category, domain, description, context)):
+            self.codes[name].append(self.pools[name].intern(value))
+
+    def __len__(self):
+        return len(self.url_offsets) - 1
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return list(self.records(range(*row.indices(len(self)))))
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return self.record(row)
+
+    def __iter__(self):
+        return self.records()
+
+    def url(self, row):
+        return str(self.url_blob[self.url_offsets[row]:self.url_offsets[row + 1]], 'utf-8')
+
+    def value(self, column, row):
+        if column == 'url':
+            return self.url(row)
+        return self.pools[column][self.codes[column][row]]
+
+    def iter_rows(self, rows=None):
+        """Liefert Tupel in der Reihenfolge von COLUMNS"""
+        pools = [self.pools[name] for name in CODE_COLUMNS]
+        codes = [self.codes[name] for name in CODE_COLUMNS]
+        for row in (range(len(self)) if rows is None else rows):
+            yield (self.url(row),) + tuple(pool[code[row]] for pool, code in zip(pools, codes))
+
+    def record(self, row):
+        return dict(zip(COLUMNS, next(self.iter_rows((row,)))))
+
+    def records(self, rows=None):
+        """Dicts wie record() für die Zeilen rows (Standard: alle), eins nach dem anderen"""
+        for row in self.iter_rows(rows):
+            yield dict(zip(COLUMNS, row))
+
+    def counts(self, column):
+        """Anzahl Zeilen pro Wert einer Code-Spalte"""
+        tally = [0] * len(self.pools[column])
+        for code in self.codes[column]:
+            tally[code] += 1
+        return {self.pools[column][code]: n for code, n in enumerate(tally) if n}
+
+    def group(self, column):
+        """Zeilenindizes pro Wert einer Code-Spalte (Wert -> array('I'))"""
+        groups = [array('I') for _ in range(len(self.pools[column]))]
+        for row, code in enumerate(self.codes[column]):
+            groups[code].append(row)
+        return {self.pools[column][code]: rows for code, rows in enumerate(groups) if rows}
+
+    def save(self, path):
+        """Schreibt die Tabelle im .urlcol-Format"""
+        order = b'<' if sys.byteorder == 'little' else b'>'
+        with open(path, 'wb') as f:
+            f.write(MAGIC + order + b'\0' * 7)
+            f.write(struct.pack('=Q', len(self)))
+            for name in CODE_COLUMNS:
+                strings = self.pools[name].strings
+                blob = bytearray()
+                offsets = array('Q', [0])
+                for s in strings:
+                    blob += s.encode('utf-8')
+                    offsets.append(len(blob))
+                f.write(struct.pack('=Q', len(strings)))
+                offsets.tofile(f)
+                _write_padded(f, blob)
+                _write_padded(f, self.codes[name].tobytes())
+            self.url_offsets.tofile(f)
+            f.write(self.url_blob)
+
+    @classmethod
+    def load(cls, path):
+        """Lädt eine .urlcol-Datei per mmap; URL-Puffer und Codes bleiben in der Abbildung"""
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        # Alle Teilsichten, damit sie bei einem Fehler wieder freigegeben werden
+        parts = []
+
+        def part(start, end, fmt=None):
+            sub = view[start:end]
+            parts.append(sub)
+            if fmt is not None:
+                sub = sub.cast(fmt)
+                parts.append(sub)
+            return sub
+
+        try:
+            if bytes(view[:8]) != MAGIC:
+                raise ValueError(f"Keine .urlcol-Datei: {path}")
+            if view[8:9] != (b'<' if sys.byteorder == 'little' else b'>'):
+                raise ValueError(f"Falsche Byte-Reihenfolge: {path}")
+            pos = 16
+            (rows,) = struct.unpack_from('=Q', view, pos)
+            pos += 8
+
+            table = cls.__new__(cls)
+            table.pools = {}
+            table.codes = {}
+            for name in CODE_COLUMNS:
+                (count,) = struct.unpack_from('=Q', view, pos)
+                pos += 8
+                offsets = part(pos, pos + 8 * (count + 1), 'Q')
+                pos += 8 * (count + 1)
+                blob = part(pos, pos + offsets[count])
+                pos += _padded(offsets[count])
+                table.pools[name] = StringPool(
+                    str(blob[offsets[i]:offsets[i + 1]], 'utf-8') for i in range(count))
+                table.codes[name] = part(pos, pos + 4 * rows, 'I')
+                pos += _padded(4 * rows)
+            table.url_offsets = part(pos, pos + 8 * (rows + 1), 'Q')
+            pos += 8 * (rows + 1)
+            table.url_blob = part(pos, pos + table.url_offsets[rows])
+        except Exception:
+            for sub in reversed(parts):
+                sub.release()
+            view.release()
+            mapping.close()
+            raise
+        table._view = view
+        table._mapping = mapping
+        return table
+
+    def close(self):
+        """Gibt die mmap-Abbildung einer geladenen Tabelle frei; danach ist sie nicht mehr lesbar"""
+        if self._mapping is None:
+            return
+        # Die Abbildung lässt sich erst schließen, wenn keine memoryview mehr auf ihr liegt
+        for view in list(self.codes.values()) + [self.url_offsets, self.url_blob, self._view]:
+            view.release()
+        self._mapping.close()
+        self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _padded(size):
+    return (size + 7) & ~7
+
+
+def _write_padded(f, data):
+    f.write(data)
+    f.write(b'\0' * (_padded(len(data)) - len(data)))
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Bulk-Loader: Extraktionsergebnisse in die Tabelle url_metadata
+Liest URL_ANALYSE_RESULTS.json (inkrementell) oder eine .urlcol-Datei und
+legt für jede URL eine Zeile in url_metadata an (supabase-enhanced-schema.sql).
+url_id ist die kanonische Form der URL (oder mit --key hash deren Hash aus
+url_canonical). Bestehende Zeilen bleiben unverändert (ON CONFLICT DO
+NOTHING), damit Aufrufe, Kommentare und Likes erhalten bleiben; ein
+erneuter Lauf fügt nichts doppelt ein.
+
+Ziele:
+    Postgres  --dsn / DATABASE_URL, benötigt psycopg2. Pro Paket COPY in
+              eine temporäre Tabelle und INSERT ... SELECT ... ON CONFLICT,
+              eine Transaktion pro Paket, Pakete parallel über einen
+              Verbindungspool
+    SQLite    --sqlite PATH, Ersatz für lokale Tests; die Tabelle wird aus
+              derselben Schema-Datei erzeugt (Typen übersetzt)
+"""
+
+import argparse
+import io
+import os
+import re
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from create_csv_export import load_records
+from url_canonical import canonical_key, canonicalize_batch
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'supabase-enhanced-schema.sql')
+TABLE = 'url_metadata'
+# Zeilen pro Transaktion; große, sortierte Pakete berühren weniger Index-Seiten
+BATCH_SIZE = 50_000
+
+# Postgres-Typen und -Defaults -> SQLite
+_SQLITE_TYPES = [
+    (re.compile(r'\bTIMESTAMPTZ\b'), 'TEXT'),
+    (re.compile(r'\bDEFAULT NOW\(\)'), 'DEFAULT CURRENT_TIMESTAMP'),
+    (re.compile(r'\bBOOLEAN\b'), 'INTEGER'),
+    (re.compile(r'\bDEFAULT FALSE\b'), 'DEFAULT 0'),
+    (re.compile(r'\bDEFAULT TRUE\b'), 'DEFAULT 1'),
+]
+
+
+def table_ddl(table=TABLE, path=SCHEMA_PATH):
+    """CREATE TABLE-Anweisung einer Tabelle aus der Schema-Datei"""
+    with open(path, 'r', encoding='utf-8') as f:
+        schema = f.read()
+    match = re.search(rf'CREATE TABLE IF NOT EXISTS {table} \(.*?\n\);', schema, re.S)
+    if match is None:
+        raise ValueError(f"Tabelle {table} nicht in {path}")
+    return match.group(0)
+
+
+def sqlite_ddl(table=TABLE, path=SCHEMA_PATH):
+    """Die CREATE TABLE-Anweisung mit SQLite-Typen"""
+    ddl = table_ddl(table, path)
+    for pattern, replacement in _SQLITE_TYPES:
+        ddl = pattern.sub(replacement, ddl)
+    return ddl
+
+
+def iter_url_ids(records, key='url'):
+    """url_id pro unterschiedlicher kanonischer URL, in Fundreihenfolge"""
+    seen = set()
+    while True:
+        batch = [item['url'] for item in islice(records, BATCH_SIZE)]
+        if not batch:
+            return
+        for canonical in canonicalize_batch(batch):
+            if canonical not in seen:
+                seen.add(canonical)
+                yield canonical_key(canonical) if key == 'hash' else canonical
+
+
+def iter_batches(rows, batch_size=BATCH_SIZE):
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class SqliteTarget:
+    """SQLite-Datei als Ersatz für Postgres (eine Verbindung, ein Schreiber)"""
+
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(sqlite_ddl())
+        self.conn.commit()
+
+    def load_batch(self, url_ids):
+        """Fügt ein Paket in einer Transaktion ein; gibt die Anzahl neuer Zeilen zurück"""
+        before = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO {TABLE} (url_id) VALUES (?) ON CONFLICT (url_id) DO NOTHING",
+                ((url_id,) for url_id in sorted(url_ids)))
+        return self.conn.total_changes - before
+
+    def count(self):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class PostgresTarget:
+    """Postgres über einen psycopg2-Verbindungspool; COPY in eine Staging-Tabelle pro Paket"""
+
+    name = 'postgres'
+
+    def __init__(self, dsn, pool_size=4):
+        try:
+            from psycopg2.pool import ThreadedConnectionPool
+        except ImportError:
+            raise SystemExit("❌ Für Postgres wird psycopg2 benötigt (pip install psycopg2-binary)")
+        self.pool = ThreadedConnectionPool(1, pool_size, dsn)
+        self.pool_size = pool_size
+
+    def load_batch(self, url_ids):
+        conn = self.pool.getconn()
+        try:
+            with conn, conn.cursor() as cur:
+                cur.execute("CREATE TEMP TABLE IF NOT EXISTS url_metadata_staging "
+                            "(url_id TEXT) ON COMMIT DELETE ROWS")
+                buffer = io.StringIO()
+                for url_id in url_ids:
+                    # COPY-Textformat: Backslash, Tab und Zeilenumbrüche maskieren
+                    buffer.write(url_id.replace('\\', '\\\\').replace('\t', '\\t')
+                                 .replace('\n', '\\n').replace('\r', '\\r'))
+                    buffer.write('\n')
+                buffer.seek(0)
+                cur.copy_expert("COPY url_metadata_staging (url_id) FROM STDIN", buffer)
+                cur.execute(f"INSERT INTO {TABLE} (url_id) SELECT DISTINCT url_id FROM url_metadata_staging "
+                            "ORDER BY url_id ON CONFLICT (url_id) DO NOTHING")
+                return cur.rowcount
+        finally:
+            self.pool.putconn(conn)
+
+    def count(self):
+        conn = self.pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"SELECT COUNT(*) FROM {TABLE}")
+                return cur.fetchone()[0]
+        finally:
+            self.pool.putconn(conn)
+
+    def close(self):
+        self.pool.closeall()
+
+
+def load(url_ids, target, batch_size=BATCH_SIZE, workers=1):
+    """Lädt alle url_ids paketweise; gibt Zeilen, neue Zeilen, Dauer und Zeilen/s zurück"""
+    start = time.perf_counter()
+    rows = 0
+    inserted = 0
+    batches = iter_batches(url_ids, batch_size)
+    if workers == 1:
+        for batch in batches:
+            rows += len(batch)
+            inserted += target.load_batch(batch)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for batch in batches:
+                rows += len(batch)
+                pending.append(pool.submit(target.load_batch, batch))
+                if len(pending) >= 2 * workers:
+                    inserted += pending.pop(0).result()
+            inserted += sum(future.result() for future in pending)
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'inserted': inserted, 'seconds': seconds,
+            'rows_per_second': rows / seconds if seconds else 0.0}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lädt die extrahierten URLs in url_metadata")
+    parser.add_argument('input', nargs='?', default='URL_ANALYSE_RESULTS.json',
+                        help="URL_ANALYSE_RESULTS.json oder eine Datei im gleichen Format")
+    parser.add_argument('--columnar', help="Statt JSON eine .urlcol-Datei lesen")
+    target_group = parser.add_mutually_exclusive_group()
+    target_group.add_argument('--dsn', default=os.environ.get('DATABASE_URL'),
+                              help="Postgres-Verbindung (Standard: $DATABASE_URL)")
+    target_group.add_argument('--sqlite', metavar='PATH', help="SQLite-Datei statt Postgres")
+    parser.add_argument('--key', choices=['url', 'hash'], default='url',
+                        help="url_id: kanonische URL oder deren 16-stelliger Hash")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Zeilen pro Transaktion")
+    parser.add_argument('-j', '--workers', type=int, default=4,
+                        help="Parallele Pakete/Verbindungen (nur Postgres)")
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        target = SqliteTarget(args.sqlite)
+        workers = 1
+    elif args.dsn:
+        target = PostgresTarget(args.dsn, args.workers)
+        workers = args.workers
+    else:
+        parser.error("Ziel angeben: --dsn (oder DATABASE_URL) oder --sqlite")
+
+    source = args.columnar or args.input
+    print(f"🗄️  Lade {source} nach {target.name}:{TABLE}...")
+    try:
+        records = load_records(args.input, args.columnar)
+        result = load(iter_url_ids(records, args.key), target, args.batch_size, workers)
+        total = target.count()
+    finally:
+        target.close()
+
+    print(f"✅ {result['rows']} URLs, {result['inserted']} neu, "
+          f"{result['rows'] - result['inserted']} bereits vorhanden")
+    print(f"⏱️  {result['seconds']:.2f} s, {result['rows_per_second']:,.0f} Zeilen/s; "
+          f"{total} Zeilen in {TABLE}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,101 +4,103 @@ URL Extraction Script for ANALYSE_BERICHT.md
 Extrahiert und kategorisiert alle URLs aus dem Analyse-Bericht
 """
 
+import argparse
+import os
 import re
-from collections import defaultdict
-from urllib.parse import urlparse
+from collections import defaultdict, namedtuple
 
-def extract_urls_from_file(filepath):
-    """Liest die Datei und extrahiert alle URLs"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Regulärer Ausdruck für URLs (http und https)
-    url_pattern = r'https?://[^\s\)\]<>"]+[^\s\)\]<>"\',.]'
-    urls = re.findall(url_pattern, content)
-    
-    # Bereinige URLs (entferne trailing characters)
-    cleaned_urls = []
-    for url in urls:
-        # Entferne trailing quotes, brackets etc.
-        url = url.rstrip('"\',;:')
-        cleaned_urls.append(url)
-    
-    return list(set(cleaned_urls))  # Entferne Duplikate
+from url_memo import SHARED_MEMO, add_memo_arguments, memo_from_args
+from url_metrics import NULL_METRICS, add_metrics_arguments, metrics_from_args
+from url_streaming import iter_mmap_matches
+from url_tokenizer import URL_REGEX_BYTES, find_urls
 
-def categorize_url(url):
-    """Kategorisiert eine URL nach Typ und Kategorie"""
-    parsed = urlparse(url)
-    domain = parsed.netloc.lower()
-    path = parsed.path.lower()
-    
-    # Bestimme TYPE
-    url_type = "other"
-    if "github.com" in domain:
-        if "/user-attachments/assets/" in path:
-            url_type = "asset"
-        else:
-            url_type = "github"
-    elif "lovable.dev" in domain:
-        url_type = "lovable"
-    elif "supabase.co" in domain:
-        url_type = "supabase"
-    elif "discord.gg" in domain or "discord.com" in domain or "dcbadge" in domain:
-        url_type = "discord"
-    elif "shields.io" in domain:
-        url_type = "badge"
-    elif "netlify.app" in domain:
-        url_type = "netlify"
-    elif "cal.com" in domain:
-        url_type = "cal"
-    elif "onbiela.dev" in domain:
-        url_type = "onbiela"
-    elif "macaly-app.com" in domain:
-        url_type = "macaly"
-    elif "microsoft.com" in domain or "nuget.org" in domain or "pypi.org" in domain:
-        url_type = "package"
-    elif "docker.com" in domain or "hub.docker.com" in domain:
-        url_type = "docker"
-    elif "kubernetes.io" in domain:
-        url_type = "kubernetes"
-    elif "portainer.io" in domain:
-        url_type = "portainer"
-    elif "vaultproject.io" in domain:
-        url_type = "vault"
-    elif "ollama.ai" in domain:
-        url_type = "ai"
-    elif "opensource.org" in domain:
-        url_type = "license"
-    
-    # Bestimme CATEGORY
-    category = "other"
-    
+def extract_urls_from_file(filepath, use_mmap=False, canonical=False, metrics=NULL_METRICS):
+    """Liest die Datei und extrahiert alle URLs
+
+    Mit use_mmap=True wird die Datei per mmap abgebildet und nur die
+    Treffer dekodiert (für große, überwiegend ASCII-Exporte). Mit
+    canonical=True zählen Schreibvarianten (z.B. '.git', '/' am Ende) als
+    eine URL in kanonischer Form. Beim mmap-Scan fallen Lesen und Suchen
+    zusammen und zählen als Stufe match.
+    """
+    metrics.count('bytes_read', os.path.getsize(filepath))
+    if use_mmap:
+        with metrics.stage('match'):
+            urls = list(iter_mmap_matches(filepath, URL_REGEX_BYTES))
+    else:
+        with metrics.stage('read'):
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
+        with metrics.stage('match'):
+            urls = find_urls(content)
+    metrics.count('matches', len(urls))
+    if canonical:
+        from url_canonical import canonicalize_batch
+        with metrics.stage('canonical'):
+            urls = canonicalize_batch(urls)
+    
+    return list(set(urls))  # Entferne Duplikate
+
+# Kategorien in Prioritätsreihenfolge: die erste Kategorie, von der ein
+# Schlüsselwort irgendwo in der URL vorkommt, gewinnt
+CATEGORY_KEYWORDS = [
     # AI & Technology
-    if any(keyword in url.lower() for keyword in ["ai", "agent", "chatgpt", "gemini", "ollama", "machine-learning", "ml"]):
-        category = "ai"
+    ("ai", ["ai", "agent", "chatgpt", "gemini", "ollama", "machine-learning", "ml"]),
     # Infrastructure
-    elif any(keyword in url.lower() for keyword in ["docker", "kubernetes", "portainer", "proxmox", "infrastructure", "deployment", "vault", "system"]):
-        category = "infrastructure"
+    ("infrastructure", ["docker", "kubernetes", "portainer", "proxmox", "infrastructure", "deployment", "vault", "system"]),
     # Development Tools
-    elif any(keyword in url.lower() for keyword in ["framework", "package", "pypi", "nuget", "microsoft", "dotnet"]):
-        category = "devtools"
+    ("devtools", ["framework", "package", "pypi", "nuget", "microsoft", "dotnet"]),
     # Creative & Media
-    elif any(keyword in url.lower() for keyword in ["3d", "modeling", "animation", "media", "hologram", "design"]):
-        category = "creative"
+    ("creative", ["3d", "modeling", "animation", "media", "hologram", "design"]),
     # Security & Compliance
-    elif any(keyword in url.lower() for keyword in ["security", "compliance", "dsgvo", "policy", "ethik", "certificate", "eid"]):
-        category = "security"
+    ("security", ["security", "compliance", "dsgvo", "policy", "ethik", "certificate", "eid"]),
     # Data & Analytics
-    elif any(keyword in url.lower() for keyword in ["database", "supabase", "data", "pipeline", "analytics"]):
-        category = "data"
+    ("data", ["database", "supabase", "data", "pipeline", "analytics"]),
     # Digital Platforms
-    elif any(keyword in url.lower() for keyword in ["lovable", "netlify", "website", "web", "platform"]):
-        category = "platforms"
+    ("platforms", ["lovable", "netlify", "website", "web", "platform"]),
     # Documentation
-    elif any(keyword in url.lower() for keyword in ["documentation", "docs", "learn", "readme"]):
-        category = "documentation"
-    
-    return url_type, category
+    ("documentation", ["documentation", "docs", "learn", "readme"]),
+]
+
+UrlRecord = namedtuple('UrlRecord', 'url type category repo description')
+
+
+def compile_category_matcher(groups=CATEGORY_KEYWORDS):
+    """Eine Regex für alle Schlüsselwörter; gibt (Regex, Schlüsselwort -> Priorität) zurück
+
+    Die Alternation steht in einem Lookahead, damit auch überlappende
+    Schlüsselwörter gefunden werden (z.B. "ai" in "mediaid"). Die
+    Alternativen sind nach dem ersten Zeichen zusammengefasst und innerhalb
+    davon nach Priorität sortiert, so gewinnt an jeder Position das
+    Schlüsselwort mit der höchsten Priorität.
+    """
+    priority = {}
+    for rank, (_, keywords) in enumerate(groups):
+        for keyword in keywords:
+            priority.setdefault(keyword.lower(), rank)
+    by_first = {}
+    for keyword in priority:
+        by_first.setdefault(keyword[0], []).append(re.escape(keyword[1:]))
+    alternation = '|'.join(f"{re.escape(first)}(?:{'|'.join(rests)})" for first, rests in by_first.items())
+    return re.compile(f'(?=({alternation}))'), priority
+
+
+_CATEGORY_REGEX, _KEYWORD_PRIORITY = compile_category_matcher()
+_CATEGORY_NAMES = [name for name, _ in CATEGORY_KEYWORDS] + ["other"]
+
+
+def match_category(url):
+    """Kategorie aus den Schlüsselwörtern in einem Durchlauf über die URL"""
+    best = len(_CATEGORY_NAMES) - 1
+    for keyword in _CATEGORY_REGEX.findall(url.lower()):
+        rank = _KEYWORD_PRIORITY[keyword]
+        if rank < best:
+            best = rank
+    return _CATEGORY_NAMES[best]
+
+def categorize_url(url):
+    """Kategorisiert eine URL nach Typ und Kategorie"""
+    return SHARED_MEMO.classify(url).type, match_category(url)
 
 def get_repo_name(url):
     """Extrahiert den Repository-Namen aus GitHub URLs"""
@@ -112,50 +114,39 @@ def get_repo_name(url):
 
 def get_description(url, url_type):
     """Generiert eine Beschreibung basierend auf URL und Typ"""
-    descriptions = {
-        "github": "GitHub Repository",
-        "asset": "GitHub Asset Bild/Datei",
-        "lovable": "Lovable.dev Projekt",
-        "supabase": "Supabase Backend/Database",
-        "discord": "Discord Server/Badge",
-        "badge": "Shields.io Status Badge",
-        "netlify": "Netlify Deployment",
-        "onbiela": "Onbiela.dev Platform",
-        "macaly": "Macaly App Platform",
-        "package": "Package Registry (NuGet/PyPI)",
-        "docker": "Docker Registry",
-        "kubernetes": "Kubernetes Platform",
-        "portainer": "Portainer Container Management",
-        "vault": "HashiCorp Vault",
-        "ai": "Ollama AI Platform",
-        "license": "Open Source Lizenz",
-        "cal": "Cal.com Scheduling",
-    }
-    return descriptions.get(url_type, "Web Resource")
-
-def main():
-    filepath = "ANALYSE_BERICHT.md"
-    
-    print("=" * 80)
-    print("URL EXTRACTION REPORT - ANALYSE_BERICHT.md")
-    print("=" * 80)
-    print()
-    
-    # Extrahiere URLs
-    urls = extract_urls_from_file(filepath)
-    
-    print(f"✅ Gefundene URLs: {len(urls)}")
-    print()
-    
-    # Gruppiere URLs nach Typ
-    urls_by_type = defaultdict(list)
-    urls_by_category = defaultdict(list)
-    
+    return SHARED_MEMO.classify(url).description or "Web Resource"
+
+def build_records(urls):
+    """Klassifiziert jede URL genau einmal; sortierte Liste von UrlRecord"""
+    records = []
     for url in sorted(urls):
-        url_type, category = categorize_url(url)
-        urls_by_type[url_type].append(url)
-        urls_by_category[category].append(url)
-    
+        info = SHARED_MEMO.classify(url)
+        records.append(UrlRecord(url, info.type, match_category(url), get_repo_name(url),
+                                 info.description or "Web Resource"))
+    return records
+
+def write_results(output_file, filepath, records):
+    """Schreibt URL_EXTRACTION_RESULTS.txt (Liste der UrlRecords)"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("=" * 80 + "\n")
+        f.write(f"URL EXTRACTION REPORT - {filepath}\n")
+        f.write("=" * 80 + "\n\n")
+        f.write(f"Total URLs found: {len(records)}\n\n")
+        
+        f.write("=" * 80 + "\n")
+        f.write("DETAILLIERTE STRUKTURIERTE URL-LISTE\n")
+        f.write("=" * 80 + "\n\n")
+        
+        for i, record in enumerate(records, 1):
+            f.write(f"\n--- URL #{i} ---\n")
+            f.write(f"URL: {record.url}\n")
+            f.write(f"TYPE: {record.type}\n")
+            f.write(f"CATEGORY: {record.category}\n")
+            f.write(f"REPO: {record.repo}\n")
+            f.write(f"DESCRIPTION: {record.description}\n")
+
+def print_listing(records, urls_by_type, urls_by_category):
+    """Konsolenausgabe: nach Typ, nach Kategorie und die detaillierte Liste"""
     # Ausgabe nach Typ gruppiert
     print("=" * 80)
     print("📊 URLS GRUPPIERT NACH TYP")
@@ -165,7 +156,7 @@ def main():
     for url_type in sorted(urls_by_type.keys()):
         print(f"\n### {url_type.upper()} ({len(urls_by_type[url_type])} URLs)")
         print("-" * 80)
-        for url in sorted(urls_by_type[url_type]):
+        for url in urls_by_type[url_type]:
             print(f"  - {url}")
     
     # Ausgabe nach Kategorie gruppiert
@@ -178,7 +169,7 @@ def main():
     for category in sorted(urls_by_category.keys()):
         print(f"\n### {category.upper()} ({len(urls_by_category[category])} URLs)")
         print("-" * 80)
-        for url in sorted(urls_by_category[category]):
+        for url in urls_by_category[category]:
             print(f"  - {url}")
     
     # Detaillierte strukturierte Ausgabe
@@ -188,44 +179,68 @@ def main():
     print("=" * 80)
     print()
     
-    for i, url in enumerate(sorted(urls), 1):
-        url_type, category = categorize_url(url)
-        repo = get_repo_name(url)
-        description = get_description(url, url_type)
-        
+    for i, record in enumerate(records, 1):
         print(f"\n--- URL #{i} ---")
-        print(f"URL: {url}")
-        print(f"TYPE: {url_type}")
-        print(f"CATEGORY: {category}")
-        print(f"REPO: {repo}")
-        print(f"DESCRIPTION: {description}")
+        print(f"URL: {record.url}")
+        print(f"TYPE: {record.type}")
+        print(f"CATEGORY: {record.category}")
+        print(f"REPO: {record.repo}")
+        print(f"DESCRIPTION: {record.description}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extrahiert und kategorisiert alle URLs")
+    parser.add_argument('input', nargs='?', default="ANALYSE_BERICHT.md")
+    parser.add_argument('--mmap', action='store_true',
+                        help="Datei per mmap scannen statt komplett einzulesen")
+    parser.add_argument('--canonical', action='store_true',
+                        help="URLs vor dem Gruppieren kanonisieren (url_canonical)")
+    add_memo_arguments(parser)
+    add_metrics_arguments(parser)
+    args = parser.parse_args(argv)
+    metrics = metrics_from_args('url_extraction', args)
+    memo = memo_from_args(args)
+    filepath = args.input
+    
+    print("=" * 80)
+    print(f"URL EXTRACTION REPORT - {filepath}")
+    print("=" * 80)
+    print()
+    
+    # Extrahiere URLs
+    urls = extract_urls_from_file(filepath, use_mmap=args.mmap, canonical=args.canonical, metrics=metrics)
+    metrics.count('urls', len(urls))
+    
+    print(f"✅ Gefundene URLs: {len(urls)}")
+    print()
+    
+    # Klassifiziere jede URL einmal, alle Ausgaben nutzen dieselben Datensätze
+    with metrics.stage('classify'):
+        records = build_records(urls)
+    memo.close()
+    print(f"🧠 URL-Memo: {memo.summary()}")
+    print()
+    metrics.add_cache_stats(memo.stats, prefix='memo')
+    
+    # Gruppiere URLs nach Typ
+    urls_by_type = defaultdict(list)
+    urls_by_category = defaultdict(list)
+    
+    with metrics.stage('aggregate'):
+        for record in records:
+            urls_by_type[record.type].append(record.url)
+            urls_by_category[record.category].append(record.url)
+    
+    with metrics.stage('console'):
+        print_listing(records, urls_by_type, urls_by_category)
     
     # Exportiere in Textdatei
     output_file = "URL_EXTRACTION_RESULTS.txt"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write("=" * 80 + "\n")
-        f.write("URL EXTRACTION REPORT - ANALYSE_BERICHT.md\n")
-        f.write("=" * 80 + "\n\n")
-        f.write(f"Total URLs found: {len(urls)}\n\n")
-        
-        f.write("=" * 80 + "\n")
-        f.write("DETAILLIERTE STRUKTURIERTE URL-LISTE\n")
-        f.write("=" * 80 + "\n\n")
-        
-        for i, url in enumerate(sorted(urls), 1):
-            url_type, category = categorize_url(url)
-            repo = get_repo_name(url)
-            description = get_description(url, url_type)
-            
-            f.write(f"\n--- URL #{i} ---\n")
-            f.write(f"URL: {url}\n")
-            f.write(f"TYPE: {url_type}\n")
-            f.write(f"CATEGORY: {category}\n")
-            f.write(f"REPO: {repo}\n")
-            f.write(f"DESCRIPTION: {description}\n")
+    with metrics.stage('write'):
+        write_results(output_file, filepath, records)
     
     print(f"\n\n✅ Ergebnisse wurden auch in '{output_file}' gespeichert!")
     print()
+    metrics.finish()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Persistenter URL-Index in SQLite mit Facetten- und Volltextsuche
+Die Extraktoren schreiben ihre Erwähnungen optional hierher (--index PATH),
+statt dass URL_ANALYSE_RESULTS.json oder ALLE_URLS_MIT_DUPLIKATEN.txt
+durchsucht werden müssen:
+
+    urls          eine Zeile pro URL: kanonische Form, Typ, Kategorie, Domain
+    mentions      eine Zeile pro Erwähnung: Quelldatei, Zeile, Repo, Abschnitt,
+                  Kontext
+    mentions_fts  FTS5 über den Kontext (external content auf mentions)
+
+Jede Spalte, nach der gefiltert wird, hat einen Index; nach dem Laden
+aktualisiert analyze() die Statistiken für den Query-Planer. Eine
+Quelldatei wird beim erneuten Indizieren vollständig ersetzt.
+
+Beispiele:
+    python url_index.py urls.db --domain img.shields.io --group-by repo
+    python url_index.py urls.db --type badge --section "DEVTOOLS"
+    python url_index.py urls.db --search "supabase AND auth" --limit 20
+    python url_index.py urls.db --facets
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+from itertools import islice
+
+from url_memo import SHARED_MEMO
+
+# Erwähnungen pro Transaktion
+BATCH_SIZE = 10_000
+# Platzhalter pro IN (...)-Abfrage (SQLite-Grenze älterer Versionen: 999)
+_IN_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    canonical TEXT NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_urls_canonical ON urls(canonical);
+CREATE INDEX IF NOT EXISTS idx_urls_domain ON urls(domain);
+CREATE INDEX IF NOT EXISTS idx_urls_type ON urls(type, category);
+CREATE INDEX IF NOT EXISTS idx_urls_category ON urls(category);
+
+CREATE TABLE IF NOT EXISTS mentions (
+    id INTEGER PRIMARY KEY,
+    url_id INTEGER NOT NULL REFERENCES urls(id),
+    source TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    repo TEXT NOT NULL,
+    section TEXT NOT NULL,
+    context TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_mentions_url ON mentions(url_id, repo);
+CREATE INDEX IF NOT EXISTS idx_mentions_source ON mentions(source, line);
+CREATE INDEX IF NOT EXISTS idx_mentions_repo ON mentions(repo);
+CREATE INDEX IF NOT EXISTS idx_mentions_section ON mentions(section);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS mentions_fts USING fts5(
+    context, content='mentions', content_rowid='id'
+);
+"""
+
+# Filter der Abfrage-CLI: Name -> SQL-Ausdruck
+FILTERS = {
+    'url': 'u.url = ?',
+    'canonical': 'u.canonical = ?',
+    'domain': 'u.domain = ?',
+    'type': 'u.type = ?',
+    'category': 'u.category = ?',
+    'repo': 'm.repo = ?',
+    'section': 'm.section = ?',
+    'source': 'm.source = ?',
+}
+GROUP_COLUMNS = {'url': 'u.url', 'canonical': 'u.canonical', 'domain': 'u.domain', 'type': 'u.type',
+                 'category': 'u.category', 'repo': 'm.repo', 'section': 'm.section',
+                 'source': 'm.source'}
+
+
+class UrlIndex:
+    """SQLite-Datenbank mit URLs und ihren Erwähnungen"""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # URL -> id für die URLs dieses Laufs
+        self.ids = {}
+
+    def url_ids(self, urls):
+        """ids für eine Menge von URLs; neue URLs werden klassifiziert und angelegt"""
+        missing = [url for url in urls if url not in self.ids]
+        for start in range(0, len(missing), _IN_CHUNK):
+            chunk = missing[start:start + _IN_CHUNK]
+            rows = self.conn.execute(
+                f"SELECT url, id FROM urls WHERE url IN ({','.join('?' * len(chunk))})", chunk)
+            self.ids.update(rows)
+        new = [url for url in missing if url not in self.ids]
+        for url in new:
+            info = SHARED_MEMO.classify(url)
+            cursor = self.conn.execute(
+                "INSERT INTO urls (url, canonical, type, category, domain, description) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, SHARED_MEMO.canonicalize(url), info.type, info.category, info.domain, info.description))
+            self.ids[url] = cursor.lastrowid
+        return self.ids
+
+    def remove_source(self, source):
+        """Löscht alle Erwähnungen einer Quelldatei (inkl. Volltext-Einträgen)"""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO mentions_fts (mentions_fts, rowid, context) "
+                "SELECT 'delete', id, context FROM mentions WHERE source = ?", (source,))
+            self.conn.execute("DELETE FROM mentions WHERE source = ?", (source,))
+
+    def add_mentions(self, source, mentions, replace=True):
+        """Schreibt Erwähnungen (Dicts mit url, line und optional repo, section/category,
+        context) einer Quelldatei; gibt die Anzahl zurück
+        """
+        if replace:
+            self.remove_source(source)
+        mentions = iter(mentions)
+        count = 0
+        while True:
+            batch = list(islice(mentions, BATCH_SIZE))
+            if not batch:
+                return count
+            # Bei einem Rollback wären die gemerkten ids neuer URLs ungültig
+            ids_before = dict(self.ids)
+            try:
+                self._insert_batch(source, batch)
+            except BaseException:
+                self.ids = ids_before
+                raise
+            count += len(batch)
+
+    def _insert_batch(self, source, batch):
+        with self.conn:
+            ids = self.url_ids({item['url'] for item in batch})
+            rows = [(ids[item['url']], source, item.get('line', 0), item.get('repo', ''),
+                     item.get('section', item.get('category', '')), item.get('context', ''))
+                    for item in batch]
+            first = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM mentions").fetchone()[0]
+            self.conn.executemany(
+                "INSERT INTO mentions (url_id, source, line, repo, section, context) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute("INSERT INTO mentions_fts (rowid, context) "
+                              "SELECT id, context FROM mentions WHERE id > ?", (first,))
+
+    def analyze(self):
+        """Statistiken für den Query-Planer aktualisieren (nach größeren Ladevorgängen)
+
+        Ohne sie wählt SQLite bei kombinierten Filtern (z.B. repo und section)
+        oft den weniger selektiven Index.
+        """
+        self.conn.execute("ANALYZE")
+
+    def query(self, filters=None, search=None, group_by=None, limit=50):
+        """Erwähnungen nach Filtern/Volltext; mit group_by Anzahl pro Wert
+
+        Gibt (Spaltennamen, Zeilen) zurück.
+        """
+        clauses = []
+        params = []
+        for name, value in (filters or {}).items():
+            clauses.append(FILTERS[name])
+            params.append(value)
+        sql = "FROM mentions m JOIN urls u ON u.id = m.url_id"
+        if search:
+            sql += " JOIN mentions_fts f ON f.rowid = m.id"
+            clauses.append("mentions_fts MATCH ?")
+            params.append(search)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if group_by:
+            column = GROUP_COLUMNS[group_by]
+            columns = [group_by, 'mentions', 'urls']
+            sql = (f"SELECT {column}, COUNT(*), COUNT(DISTINCT m.url_id) {sql} "
+                   f"GROUP BY {column} ORDER BY COUNT(*) DESC, {column}")
+        else:
+            columns = ['url', 'type', 'domain', 'source', 'line', 'repo', 'context']
+            # Bei Volltextsuche liefert FTS5 die Treffer schon nach rowid sortiert
+            order = "f.rowid" if search else "m.id"
+            sql = f"SELECT u.url, u.type, u.domain, m.source, m.line, m.repo, m.context {sql} ORDER BY {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        return columns, self.conn.execute(sql, params).fetchall()
+
+    def facets(self, limit=10):
+        """Die häufigsten Werte pro Facette: {Facette: [(Wert, Erwähnungen)]}"""
+        return {name: [(row[0], row[1]) for row in self.query(group_by=name, limit=limit)[1]]
+                for name in ('type', 'category', 'domain', 'repo', 'source')}
+
+    def close(self):
+        self.conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Abfragen über den SQLite-URL-Index")
+    parser.add_argument('database')
+    for name in FILTERS:
+        parser.add_argument(f'--{name}', help=f"Filter: {name}")
+    parser.add_argument('--search', help="FTS5-Suche im Kontext (z.B. 'supabase AND auth')")
+    parser.add_argument('--group-by', choices=sorted(GROUP_COLUMNS), help="Anzahl pro Wert statt Liste")
+    parser.add_argument('--facets', action='store_true', help="Häufigste Werte pro Facette")
+    parser.add_argument('--limit', type=int, default=50, help="Maximale Anzahl Zeilen (0 = alle)")
+    args = parser.parse_args(argv)
+
+    index = UrlIndex(args.database)
+    start = time.perf_counter()
+    try:
+        if args.facets:
+            for name, values in index.facets(args.limit or 10).items():
+                print(f"\n🔷 {name}:")
+                for value, count in values:
+                    print(f"  {count:8d}  {value}")
+            rows = None
+        else:
+            filters = {name: getattr(args, name) for name in FILTERS if getattr(args, name)}
+            columns, rows = index.query(filters, args.search, args.group_by, args.limit)
+            print('\t'.join(columns))
+            for row in rows:
+                print('\t'.join(str(value) for value in row))
+    finally:
+        index.close()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n⏱️  {elapsed:.1f} ms" + (f", {len(rows)} Zeilen" if rows is not None else ""), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Link-Checker für die extrahierten URLs
+Prüft alle URLs aus URL_ANALYSE_RESULTS.json asynchron mit einem
+begrenzten Verbindungspool pro Host, HEAD mit GET-Fallback, Rate-Limit
+pro Host und Retry mit exponentiellem Backoff, und schreibt Status und
+Latenz zurück in die Ergebnisse
+"""
+
+import argparse
+import asyncio
+import json
+import ssl
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+USER_AGENT = 'hnoss-url-checker/1.0'
+
+# Statuscodes, bei denen HEAD nicht unterstützt wird -> GET versuchen
+HEAD_FALLBACK_STATUS = {400, 403, 405, 501}
+# Statuscodes, die als vorübergehend gelten -> erneut versuchen
+RETRY_STATUS = {429, 502, 503, 504}
+# Maximal gelesene Body-Größe bei GET; größere Antworten werden verworfen
+MAX_BODY = 1 << 20
+
+
+class HttpError(Exception):
+    """Ungültige oder abgebrochene HTTP-Antwort"""
+
+
+class HostPool:
+    """Verbindungspool und Rate-Limit für einen Host (Schema, Host, Port)"""
+
+    def __init__(self, scheme, host, port, max_connections, rate, ssl_context):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.ssl = ssl_context if scheme == 'https' else None
+        self.slots = asyncio.Semaphore(max_connections)
+        self.idle = []
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_slot = 0.0
+        self.opened = 0
+
+    async def wait_turn(self):
+        """Hält den Mindestabstand zwischen zwei Anfragen an diesen Host ein"""
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self.next_slot)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def acquire(self):
+        await self.slots.acquire()
+        while self.idle:
+            reader, writer = self.idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+            writer.close()
+        try:
+            reader, writer = await asyncio.open_connection(
+                self.host, self.port, ssl=self.ssl,
+                server_hostname=self.host if self.ssl else None)
+        except BaseException:
+            self.slots.release()
+            raise
+        self.opened += 1
+        return reader, writer
+
+    def release(self, conn, reusable):
+        if reusable:
+            self.idle.append(conn)
+        else:
+            conn[1].close()
+        self.slots.release()
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+async def read_response(reader, method):
+    """Liest Statuszeile, Header und Body; gibt (Status, Header, wiederverwendbar) zurück"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise HttpError("Verbindung ohne Antwort geschlossen")
+    parts = status_line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b'HTTP/'):
+        raise HttpError(f"Ungültige Statuszeile: {status_line[:80]!r}")
+    status = int(parts[1])
+    http10 = parts[0] == b'HTTP/1.0'
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    reusable = not http10 and headers.get('connection', '').lower() != 'close'
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        return status, headers, reusable
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        total = 0
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                # Trailer bis zur Leerzeile überspringen
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                break
+            total += size
+            if total > MAX_BODY:
+                return status, headers, False
+            await reader.readexactly(size + 2)
+    elif 'content-length' in headers:
+        length = int(headers['content-length'])
+        if length > MAX_BODY:
+            return status, headers, False
+        await reader.readexactly(length)
+    else:
+        # Body endet mit dem Verbindungsende
+        return status, headers, False
+
+    return status, headers, reusable
+
+
+class LinkChecker:
+    """Prüft URLs nebenläufig mit Pools pro Host"""
+
+    def __init__(self, concurrency=200, per_host=8, rate=None, timeout=10.0,
+                 retries=2, backoff=0.5, verify_ssl=True):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.rate = rate
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.ssl_context = ssl.create_default_context()
+        if not verify_ssl:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.pools = {}
+        self.stats = Counter()
+
+    def pool_for(self, scheme, host, port):
+        key = (scheme, host, port)
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = self.pools[key] = HostPool(scheme, host, port, self.per_host,
+                                              self.rate, self.ssl_context)
+        return pool
+
+    async def request(self, method, parts):
+        pool = self.pool_for(parts.scheme, parts.hostname, parts.port or
+                             (443 if parts.scheme == 'https' else 80))
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        host_header = parts.netloc.rpartition('@')[2]
+        request = (f"{method} {target} HTTP/1.1\r\nHost: {host_header}\r\n"
+                   f"User-Agent: {USER_AGENT}\r\nAccept: */*\r\n\r\n").encode('utf-8')
+
+        await pool.wait_turn()
+        conn = await pool.acquire()
+        reusable = False
+        try:
+            reader, writer = conn
+            writer.write(request)
+            await writer.drain()
+            status, headers, reusable = await read_response(reader, method)
+            return status, headers
+        finally:
+            pool.release(conn, reusable)
+
+    async def check(self, url):
+        """Prüft eine URL; gibt ein Ergebnis-Dict zurück"""
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            return {'status': None, 'error': 'unsupported-url', 'latency_ms': None,
+                    'method': None, 'attempts': 0}
+
+        start = time.perf_counter()
+        error = None
+        status = None
+        method = 'HEAD'
+        attempt = 0
+        for attempt in range(1, self.retries + 2):
+            try:
+                status, headers = await asyncio.wait_for(self.request('HEAD', parts), self.timeout)
+                method = 'HEAD'
+                if status in HEAD_FALLBACK_STATUS:
+                    self.stats['get_fallbacks'] += 1
+                    status, headers = await asyncio.wait_for(self.request('GET', parts), self.timeout)
+                    method = 'GET'
+                error = None
+                if status not in RETRY_STATUS:
+                    break
+                delay = headers.get('retry-after', '')
+                delay = float(delay) if delay.isdigit() else self.backoff * 2 ** (attempt - 1)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HttpError, ValueError) as exc:
+                error = type(exc).__name__
+                delay = self.backoff * 2 ** (attempt - 1)
+            if attempt <= self.retries:
+                self.stats['retries'] += 1
+                await asyncio.sleep(delay)
+
+        self.stats['checked'] += 1
+        self.stats['errors' if error else f"{(status or 0) // 100}xx"] += 1
+        return {
+            'status': status,
+            'error': error,
+            'latency_ms': round((time.perf_counter() - start) * 1000, 1),
+            'method': method,
+            'attempts': attempt,
+        }
+
+    async def check_all(self, urls):
+        """Prüft alle URLs mit begrenzter Nebenläufigkeit; Dict URL -> Ergebnis"""
+        results = {}
+        queue = asyncio.Queue()
+        for url in dict.fromkeys(urls):
+            queue.put_nowait(url)
+
+        async def worker():
+            while True:
+                try:
+                    url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results[url] = await self.check(url)
+
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, queue.qsize()) or 1)))
+        finally:
+            for pool in self.pools.values():
+                pool.close()
+        return results
+
+
+def apply_results(data, results, checked_at):
+    """Schreibt Status und Latenz in die Einträge von all_urls"""
+    for item in data['all_urls']:
+        result = results.get(item['url'])
+        if result is not None:
+            item['link_status'] = result['status']
+            item['link_error'] = result['error']
+            item['link_latency_ms'] = result['latency_ms']
+            item['link_method'] = result['method']
+            item['link_checked_at'] = checked_at
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prüft die extrahierten URLs auf Erreichbarkeit")
+    parser.add_argument('results', nargs='?', default='URL_ANALYSE_RESULTS.json')
+    parser.add_argument('-o', '--output', help="Zieldatei (Standard: Eingabedatei überschreiben)")
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--per-host', type=int, default=8, help="Verbindungen pro Host")
+    parser.add_argument('--rate', type=float, default=10.0, help="Anfragen pro Sekunde und Host (0 = unbegrenzt)")
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--insecure', action='store_true', help="TLS-Zertifikate nicht prüfen")
+    args = parser.parse_args(argv)
+
+    with open(args.results, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    urls = [item['url'] for item in data['all_urls']]
+
+    checker = LinkChecker(args.concurrency, args.per_host, args.rate or None, args.timeout,
+                          args.retries, verify_ssl=not args.insecure)
+    print(f"🔗 Prüfe {len(urls)} URLs...")
+    start = time.perf_counter()
+    results = asyncio.run(checker.check_all(urls))
+    elapsed = time.perf_counter() - start
+
+    apply_results(data, results, time.strftime('%Y-%m-%dT%H:%M:%S'))
+    output = args.output or args.results
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+    print("=" * 80)
+    for key, count in sorted(checker.stats.items()):
+        print(f"  {key:15s}: {count}")
+    print(f"⏱️  {elapsed:.2f} s ({len(results) / max(elapsed, 1e-9):.0f} Prüfungen/s)")
+    print(f"✅ Ergebnisse geschrieben: {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Memo für Klassifikation und Kanonisierung von URLs
+Dieselben URLs kommen in einem Bericht und über Läufe hinweg immer wieder
+vor. UrlMemo merkt sich pro Roh-URL das Ergebnis von classify_url()
+(Host/Pfad zerlegen plus Regel-Lookup) und von canonicalize() (urlsplit
+plus Normalisierung) in je einem begrenzten LRU-Cache (functools.lru_cache,
+in C: ein Treffer kostet etwa 0.1 µs). Treffer, Fehlschläge und
+Verdrängungen werden gezählt.
+
+Optional liegen die Ergebnisse zusätzlich in SQLite (--memo-file): beim
+Öffnen werden die Einträge der letzten Läufe bis zur Kapazität geladen und
+bei Fehlschlägen im LRU statt einer Neuberechnung benutzt, beim Schließen
+werden die in diesem Lauf benutzten zurückgeschrieben. Ändern sich die
+Klassifikationsregeln (rules_version) oder MEMO_FORMAT, wird die Datei
+geleert. Eine URL zu laden kostet etwa so viel, wie sie zu klassifizieren;
+das lohnt sich vor allem, wenn sich die Regeln verteuern.
+
+Die Skripte teilen sich ein Memo pro Prozess (SHARED_MEMO); Worker-Prozesse
+haben jeweils ihr eigenes.
+"""
+
+from functools import lru_cache
+
+from url_classifier import UrlClass, classify_url
+
+DEFAULT_CAPACITY = 100_000
+DEFAULT_MEMO_PATH = '.url_memo.sqlite'
+# Höchstens so viele Kapazitäten an Einträgen bleiben in der Datei
+FILE_ROWS_FACTOR = 4
+# Bei Änderungen an canonicalize() oder am Tabellenformat erhöhen
+MEMO_FORMAT = 2
+
+_canonicalize = None
+
+
+class UrlMemo:
+    """Begrenzte LRU-Caches: Roh-URL -> UrlClass bzw. kanonische Form
+
+    classify(url) und canonicalize(url) verhalten sich wie
+    url_classifier.classify_url(url) mit den Standardregeln und
+    url_canonical.canonicalize(url).
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, path=None):
+        self.path = None
+        self.conn = None
+        self.run = 0
+        # aus der Datei: url -> [UrlClass oder None, kanonische Form oder None]
+        self.stored = {}
+        # in diesem Lauf berechnet oder aus stored benutzt (nur mit Datei)
+        self.used = {}
+        self.loaded = 0
+        self.reused = 0
+        self.saved = 0
+        self.resize(capacity)
+        if path:
+            self.attach(path)
+
+    def resize(self, capacity):
+        """Neue Kapazität pro Cache; leert beide LRU-Caches samt Zählern"""
+        self.capacity = capacity
+        self.classify = lru_cache(maxsize=capacity)(self._classify)
+        self.canonicalize = lru_cache(maxsize=capacity)(self._canonicalize)
+
+    def _classify(self, url):
+        entry = self.stored.get(url)
+        if entry is not None and entry[0] is not None:
+            self.reused += 1
+            info = entry[0]
+        else:
+            info = classify_url(url)
+        if self.conn is not None:
+            self.used.setdefault(url, [None, None])[0] = info
+        return info
+
+    def _canonicalize(self, url):
+        global _canonicalize
+        entry = self.stored.get(url)
+        if entry is not None and entry[1] is not None:
+            self.reused += 1
+            form = entry[1]
+        else:
+            if _canonicalize is None:
+                from url_canonical import canonicalize as _canonicalize
+            form = _canonicalize(url)
+        if self.conn is not None:
+            self.used.setdefault(url, [None, None])[1] = form
+        return form
+
+    @property
+    def stats(self):
+        infos = (self.classify.cache_info(), self.canonicalize.cache_info())
+        hits = sum(info.hits for info in infos)
+        misses = sum(info.misses for info in infos)
+        return {
+            'hits': hits,
+            'misses': misses,
+            # Ohne Kapazität wird nichts gespeichert, also auch nichts verdrängt
+            'evictions': sum(info.misses - info.currsize for info in infos) if self.capacity else 0,
+            'loaded': self.loaded,
+            'reused': self.reused,
+            'saved': self.saved,
+        }
+
+    def summary(self):
+        """Lesbare Trefferstatistik"""
+        stats = self.stats
+        lookups = stats['hits'] + stats['misses']
+        rate = stats['hits'] / lookups if lookups else 0.0
+        text = (f"{lookups} Abfragen, {stats['misses']} Fehlschläge (Trefferquote {rate:.1%}), "
+                f"{stats['evictions']} verdrängt")
+        if self.path:
+            text += (f", {self.loaded} URLs aus {self.path} geladen, {self.reused} Ergebnisse "
+                     f"daraus übernommen, {self.saved} gespeichert")
+        return text
+
+    def attach(self, path):
+        """Persistente Stufe: lädt die Einträge der letzten Läufe aus einer SQLite-Datei"""
+        import sqlite3
+        from url_classifier import rules_version
+        version = f"{MEMO_FORMAT}:{rules_version()}"
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                type TEXT,
+                category TEXT,
+                description TEXT,
+                domain TEXT,
+                canonical TEXT,
+                run INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS urls_run ON urls (run);
+        """)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        if meta.get('version') != version:
+            # Regeln oder Format geändert: alle Einträge sind ungültig
+            self.conn.execute("DELETE FROM urls")
+            meta = {'version': version, 'run': '0'}
+        self.run = int(meta.get('run', 0)) + 1
+        self.conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                              [('version', version), ('run', str(self.run))])
+        self.conn.commit()
+
+        rows = self.conn.execute(
+            "SELECT url, type, category, description, domain, canonical FROM urls "
+            "ORDER BY run DESC LIMIT ?", (self.capacity,))
+        stored = self.stored
+        for url, url_type, category, description, domain, canonical in rows:
+            info = None if url_type is None else UrlClass(url_type, category, description, domain)
+            stored[url] = [info, canonical]
+        self.loaded = len(stored)
+
+    def save(self):
+        """Schreibt die in diesem Lauf benutzten Einträge in die persistente Stufe"""
+        if self.conn is None:
+            return
+        rows = []
+        for url, (info, canonical) in self.used.items():
+            if info is None:
+                rows.append((url, None, None, None, None, canonical, self.run))
+            else:
+                rows.append((url,) + tuple(info) + (canonical, self.run))
+        with self.conn:
+            # Nur eine der beiden Spalten benutzt: die andere aus der Datei behalten
+            self.conn.executemany("""
+                INSERT INTO urls VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    type = COALESCE(excluded.type, type),
+                    category = COALESCE(excluded.category, category),
+                    description = COALESCE(excluded.description, description),
+                    domain = COALESCE(excluded.domain, domain),
+                    canonical = COALESCE(excluded.canonical, canonical),
+                    run = excluded.run
+            """, rows)
+            self.conn.execute("DELETE FROM urls WHERE url IN (SELECT url FROM urls ORDER BY run DESC "
+                              "LIMIT -1 OFFSET ?)", (self.capacity * FILE_ROWS_FACTOR,))
+        self.saved += len(rows)
+        self.used.clear()
+
+    def close(self):
+        if self.conn is not None:
+            self.save()
+            self.conn.close()
+            self.conn = None
+
+
+SHARED_MEMO = UrlMemo()
+
+
+def add_memo_arguments(parser):
+    """Die gemeinsamen Optionen --memo-size und --memo-file"""
+    group = parser.add_argument_group("URL-Memo")
+    group.add_argument('--memo-size', type=int, default=DEFAULT_CAPACITY, metavar='N',
+                       help="Höchstens N Klassifikationen und N kanonische Formen im Speicher "
+                            "(LRU, 0 = aus)")
+    group.add_argument('--memo-file', nargs='?', const=DEFAULT_MEMO_PATH, metavar='PATH',
+                       help="Memo zwischen Läufen in SQLite aufheben "
+                            f"(ohne PATH: {DEFAULT_MEMO_PATH})")
+
+
+def memo_from_args(args):
+    """Stellt SHARED_MEMO nach den Optionen von add_memo_arguments() ein"""
+    if args.memo_size != SHARED_MEMO.capacity:
+        SHARED_MEMO.resize(args.memo_size)
+    if args.memo_file:
+        SHARED_MEMO.attach(args.memo_file)
+    return SHARED_MEMO
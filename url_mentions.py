@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Kompakte Erwähnungs-Datensätze
+Eine MentionTable hält alle Erwähnungen einer Quelldatei spaltenorientiert
+(array): die URL als Code in einem internierten String-Pool (Typ und
+Domain einmal pro unique URL), Zeilennummer, Byte-Position der Zeile in
+der Quelldatei und Spalte der URL in der Zeile. Repository und Kategorie
+ändern sich nur an Überschriften und stehen deshalb als Läufe (erste
+Zeile, Wert) daneben. Das sind 20 Byte pro Erwähnung statt eines Dicts
+mit eigener Kopie der Kontextzeile.
+
+Der Kontext wird erst gelesen, wenn ein Bericht ihn rendert: aus der per
+mmap abgebildeten Quelldatei, die ganze Zeile oder nur ein Fenster um die
+URL. Die Quelldatei darf sich bis dahin nicht ändern; close() (oder die
+Tabelle als Kontextmanager) gibt die Abbildung wieder frei.
+
+table[i] liefert eine Mention, eine Sicht auf Zeile i mit denselben
+Schlüsseln wie die bisherigen Erwähnungs-Dicts (url, type, domain, line,
+repo, category, context); gelesen wird erst beim Zugriff. table[a:b] ist
+eine MentionRows-Auswahl.
+"""
+
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Sequence
+
+from url_columnar import StringPool
+from url_memo import SHARED_MEMO
+from url_tokenizer import URL_REGEX
+
+KEYS = ('url', 'type', 'domain', 'line', 'repo', 'category', 'context')
+# Spalten pro Erwähnung (Name, array-Typcode)
+ROW_COLUMNS = (('url_codes', 'I'), ('lines', 'I'), ('starts', 'Q'), ('columns', 'I'))
+
+_LINE_END = re.compile(rb'[\r\n]')
+
+
+class Mention:
+    """Sicht auf eine Zeile einer MentionTable; verhält sich lesend wie das Erwähnungs-Dict"""
+
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table, row):
+        self.table = table
+        self.row = row
+
+    @property
+    def url(self):
+        return self.table.urls[self.table.url_codes[self.row]]
+
+    @property
+    def type(self):
+        table = self.table
+        return table.types[table.url_types[table.url_codes[self.row]]]
+
+    @property
+    def domain(self):
+        table = self.table
+        return table.domains[table.url_domains[table.url_codes[self.row]]]
+
+    @property
+    def line(self):
+        return self.table.lines[self.row]
+
+    @property
+    def repo(self):
+        return self.table.repo_runs.value(self.row)
+
+    @property
+    def category(self):
+        return self.table.category_runs.value(self.row)
+
+    @property
+    def context(self):
+        return self.table.context(self.row)
+
+    def snippet(self, window=None):
+        """Kontext; mit window nur so viele Zeichen vor und nach der URL"""
+        return self.table.context(self.row, window)
+
+    def __getitem__(self, key):
+        if key not in KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in KEYS else default
+
+    def keys(self):
+        return KEYS
+
+    def __repr__(self):
+        return f"Mention({self.url!r}, line={self.line})"
+
+
+class MentionRows(Sequence):
+    """Auswahl von Zeilen einer MentionTable (z.B. alle Erwähnungen eines Typs)"""
+
+    def __init__(self, table, rows):
+        self.table = table
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return MentionRows(self.table, self.rows[index])
+        return Mention(self.table, self.rows[index])
+
+    def __iter__(self):
+        table = self.table
+        return (Mention(table, row) for row in self.rows)
+
+    def records(self, window=None):
+        return self.table.records(self.rows, window)
+
+
+class Runs:
+    """Spalte mit langen Läufen gleicher Werte: erste Zeile und Wert pro Lauf"""
+
+    __slots__ = ('rows', 'values')
+
+    def __init__(self):
+        self.rows = array('I')
+        self.values = []
+
+    def append(self, row, value):
+        if not self.values or self.values[-1] != value:
+            self.rows.append(row)
+            self.values.append(value)
+
+    def value(self, row):
+        return self.values[bisect_right(self.rows, row) - 1]
+
+    def set_first(self, value):
+        """Ersetzt den Wert des ersten Laufs (und verschmilzt ihn ggf. mit dem zweiten)"""
+        self.values[0] = value
+        if len(self.values) > 1 and self.values[1] == value:
+            del self.rows[1]
+            del self.values[1]
+
+    def tally(self, total):
+        """Anzahl Zeilen pro Wert in Fundreihenfolge; total ist die Zeilenanzahl"""
+        result = {}
+        ends = self.rows[1:] + array('I', [total])
+        for start, end, value in zip(self.rows, ends, self.values):
+            result[value] = result.get(value, 0) + end - start
+        return result
+
+    def __eq__(self, other):
+        return isinstance(other, Runs) and self.rows == other.rows and self.values == other.values
+
+    def __getstate__(self):
+        return self.rows, self.values
+
+    def __setstate__(self, state):
+        self.rows, self.values = state
+
+
+class _RunCursor:
+    """Wert eines Laufs für aufsteigende Zeilen, ohne jedes Mal zu suchen
+
+    Geht eine Zeile zurück (z.B. bei einem umgekehrten Slice), wird neu gesucht.
+    """
+
+    __slots__ = ('rows', 'values', 'index', 'next_row')
+
+    def __init__(self, runs):
+        self.rows = runs.rows
+        self.values = runs.values
+        self.index = 0
+        self.next_row = self.rows[1] if len(self.rows) > 1 else None
+
+    def value(self, row):
+        if row < self.rows[self.index]:
+            self.index = bisect_right(self.rows, row) - 1
+            self.next_row = self.rows[self.index + 1] if self.index + 1 < len(self.rows) else None
+        next_row = self.next_row
+        if next_row is not None and row >= next_row:
+            rows = self.rows
+            index = self.index + 1
+            last = len(rows) - 1
+            while index < last and rows[index + 1] <= row:
+                index += 1
+            self.index = index
+            self.next_row = rows[index + 1] if index < last else None
+        return self.values[self.index]
+
+
+class MentionTable(Sequence):
+    """Alle Erwähnungen einer Quelldatei in Spalten
+
+    source ist der Pfad der Quelldatei (für den Kontext) oder ihr Inhalt als
+    bytes. starts ist die Byte-Position der Zeile, columns der
+    Zeichen-Offset der URL in der Zeile.
+    """
+
+    def __init__(self, source=None):
+        self.source = source
+        self.urls = StringPool()
+        self.types = StringPool()
+        self.domains = StringPool()
+        # pro URL-Code
+        self.url_types = array('I')
+        self.url_domains = array('I')
+        for name, typecode in ROW_COLUMNS:
+            setattr(self, name, array(typecode))
+        self.repo_runs = Runs()
+        self.category_runs = Runs()
+        self._data = None
+
+    def url_code(self, url):
+        """Code einer URL; neue URLs werden dabei einmal klassifiziert"""
+        code = self.urls.codes.get(url)
+        if code is None:
+            code = self.urls.intern(url)
+            info = SHARED_MEMO.classify(url)
+            self.url_types.append(self.types.intern(info.type))
+            self.url_domains.append(self.domains.intern(info.domain))
+        return code
+
+    def append(self, url, line, repo, category, start=0, column=0):
+        row = len(self.url_codes)
+        self.url_codes.append(self.url_code(url))
+        self.repo_runs.append(row, repo)
+        self.category_runs.append(row, category)
+        self.lines.append(line)
+        self.starts.append(start)
+        self.columns.append(column)
+
+    def extend(self, other, line_offset=0):
+        """Hängt die Zeilen einer anderen Tabelle derselben Quelldatei an (Codes umgerechnet)"""
+        offset = len(self)
+        url_map = [self.url_code(url) for url in other.urls.strings]
+        self.url_codes.extend(url_map[code] for code in other.url_codes)
+        for runs, other_runs in ((self.repo_runs, other.repo_runs),
+                                 (self.category_runs, other.category_runs)):
+            for row, value in zip(other_runs.rows, other_runs.values):
+                runs.append(row + offset, value)
+        if line_offset:
+            self.lines.extend(line + line_offset for line in other.lines)
+        else:
+            self.lines.extend(other.lines)
+        self.starts.extend(other.starts)
+        self.columns.extend(other.columns)
+
+    def __len__(self):
+        return len(self.url_codes)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return MentionRows(self, range(*row.indices(len(self))))
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return Mention(self, row)
+
+    def __iter__(self):
+        return (Mention(self, row) for row in range(len(self)))
+
+    def __eq__(self, other):
+        if not isinstance(other, MentionTable):
+            return NotImplemented
+        return (self.source == other.source
+                and all(getattr(self, name) == getattr(other, name) for name, _ in ROW_COLUMNS)
+                and self.repo_runs == other.repo_runs and self.category_runs == other.category_runs
+                and self.urls.strings == other.urls.strings)
+
+    def __getstate__(self):
+        # Die mmap-Abbildung wird im anderen Prozess bei Bedarf neu angelegt
+        state = dict(self.__dict__)
+        state['_data'] = None
+        return state
+
+    def _source_data(self):
+        if self._data is None:
+            if isinstance(self.source, (bytes, bytearray, memoryview)):
+                self._data = self.source
+            else:
+                with open(self.source, 'rb') as f:
+                    self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._data
+
+    def close(self):
+        """Gibt die Abbildung der Quelldatei frei; ein späterer Kontext bildet sie neu ab"""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def context(self, row, window=None):
+        """Die Zeile einer Erwähnung (ohne Leerraum am Rand)
+
+        Mit window nur window Zeichen vor und nach der URL, gekürzte Seiten
+        mit "..." markiert.
+        """
+        if self.source is None:
+            return ''
+        data = self._source_data()
+        start = self.starts[row]
+        end = _LINE_END.search(data, start)
+        line = str(data[start:end.start() if end else len(data)], 'utf-8')
+        if window is None:
+            return line.strip()
+        column = self.columns[row]
+        match = URL_REGEX.match(line, column)
+        url_end = match.end() if match else column
+        left = max(column - window, 0)
+        right = url_end + window
+        snippet = line[left:right].strip()
+        if left > 0:
+            snippet = "..." + snippet
+        if right < len(line.rstrip()):
+            snippet += "..."
+        return snippet
+
+    def records(self, rows=None, window=None):
+        """Erwähnungs-Dicts für die Zeilen rows (Standard: alle), eins nach dem anderen
+
+        Deutlich schneller als die Schlüssel jeder Mention einzeln zu lesen,
+        am schnellsten für aufsteigende Zeilen; zum Rendern, solange nur ein
+        Paket der Dicts gleichzeitig lebt.
+        """
+        urls, types, domains = self.urls.strings, self.types.strings, self.domains.strings
+        url_codes, url_types, url_domains = self.url_codes, self.url_types, self.url_domains
+        lines, starts = self.lines, self.starts
+        data = self._source_data() if self.source is not None and window is None else None
+        line_end = _LINE_END.search
+        repo_runs = _RunCursor(self.repo_runs)
+        category_runs = _RunCursor(self.category_runs)
+        for row in (range(len(self)) if rows is None else rows):
+            code = url_codes[row]
+            if data is None:
+                context = self.context(row, window)
+            else:
+                start = starts[row]
+                end = line_end(data, start)
+                context = str(data[start:end.start() if end else len(data)], 'utf-8').strip()
+            yield {
+                'url': urls[code],
+                'type': types[url_types[code]],
+                'domain': domains[url_domains[code]],
+                'line': lines[row],
+                'repo': repo_runs.value(row),
+                'category': category_runs.value(row),
+                'context': context,
+            }
+
+    def counts(self, column):
+        """Anzahl Erwähnungen pro Wert von url, type, domain, repo oder category
+
+        Die Werte stehen in Fundreihenfolge.
+        """
+        if column in ('url', 'type', 'domain'):
+            tally = Counter(self.url_codes)
+            if column == 'url':
+                return {self.urls[code]: n for code, n in tally.items()}
+            pool, per_url = ((self.types, self.url_types) if column == 'type'
+                             else (self.domains, self.url_domains))
+            result = {}
+            for code, n in tally.items():
+                value = pool[per_url[code]]
+                result[value] = result.get(value, 0) + n
+            return result
+        runs = self.repo_runs if column == 'repo' else self.category_runs
+        return runs.tally(len(self))
+
+    def group_by_type(self):
+        """Zeilen pro Typ in Fundreihenfolge (Typ -> MentionRows)"""
+        groups = {}
+        url_types = self.url_types
+        for row, code in enumerate(self.url_codes):
+            type_code = url_types[code]
+            rows = groups.get(type_code)
+            if rows is None:
+                rows = groups[type_code] = array('I')
+            rows.append(row)
+        return {self.types[code]: MentionRows(self, rows) for code, rows in groups.items()}
+
+    def unique_per_type(self):
+        """Anzahl unique URLs pro Typ"""
+        return {self.types[code]: n for code, n in Counter(self.url_types).items()}
+
+    def nbytes(self):
+        """Speicher der Spalten und Lauf-Anfänge in Bytes (ohne die Strings)"""
+        arrays = [getattr(self, name) for name, _ in ROW_COLUMNS]
+        arrays += [self.repo_runs.rows, self.category_runs.rows]
+        return sum(column.itemsize * len(column) for column in arrays)
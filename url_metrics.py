@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Laufzeit-Metriken für die Extraktions-Skripte
+Stufen-Timer und Zähler pro Lauf; am Ende jedes Laufs als JSON und im
+Prometheus-Textformat geschrieben (z.B. für den textfile-Collector des
+node_exporter):
+
+    .url_metrics/<skript>.json
+    .url_metrics/<skript>.prom
+
+Stufen werden mit ``with metrics.stage('match'):`` gemessen; mehrfach
+durchlaufene Stufen (z.B. einmal pro Abschnitt) summieren sich. Gemessen
+wird nur an Stufengrenzen, nie pro URL oder Zeile.
+
+Mit profile=True (--profile) läuft pro Stufe ein eigener cProfile-Profiler
+(<skript>.<stufe>.prof, auswertbar mit ``python -m pstats``), und
+tracemalloc misst den Spitzenspeicher pro Stufe; die größten Allokationen
+stehen in <skript>.<stufe>.tracemalloc.txt. Die Zeiten sind dann deutlich
+höher als ohne Profiling.
+
+NULL_METRICS schaltet alles ab: stage() liefert einen wiederverwendbaren
+leeren Kontextmanager, alle anderen Methoden tun nichts. cProfile und
+tracemalloc werden erst mit profile=True geladen.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+
+DEFAULT_METRICS_DIR = '.url_metrics'
+# Präfix aller Prometheus-Metriken
+PROMETHEUS_PREFIX = 'url_extraction'
+# Anzahl Allokationsstellen in den tracemalloc-Berichten
+TRACEMALLOC_TOP = 25
+
+_METRIC_NAME = re.compile(r'[^a-zA-Z0-9_]')
+
+
+class _Stage:
+    """Kontextmanager einer Stufe; pro Name einmal angelegt und wiederverwendet"""
+
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        if self.metrics.profile:
+            self.metrics._profile_enter(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        metrics = self.metrics
+        metrics.seconds[self.name] = metrics.seconds.get(self.name, 0.0) + elapsed
+        metrics.calls[self.name] = metrics.calls.get(self.name, 0) + 1
+        if metrics.profile:
+            metrics._profile_exit(self.name)
+        return False
+
+
+class RunMetrics:
+    """Stufenzeiten, Zähler und Messwerte eines Skriptlaufs"""
+
+    def __init__(self, script, profile=False, directory=DEFAULT_METRICS_DIR):
+        self.script = script
+        self.profile = profile
+        self.directory = directory
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.seconds = {}
+        self.calls = {}
+        self.counters = {}
+        self.gauges = {}
+        self.sinks = []
+        self._stages = {}
+        self.profilers = {}
+        self.peaks = {}
+        self.snapshots = {}
+        self._memory_start = 0
+        if profile:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    def stage(self, name):
+        stage = self._stages.get(name)
+        if stage is None:
+            stage = self._stages[name] = _Stage(self, name)
+        return stage
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        self.gauges[name] = value
+
+    def add_sink_timings(self, timings):
+        """Messwerte aus run_sink/write_sinks/stream_sinks (url_sinks)"""
+        for timing in timings:
+            self.sinks.append({'sink': timing['sink'], 'path': timing['path'], 'rows': timing['rows'],
+                               'chars': timing['chars'], 'seconds': timing['seconds']})
+            self.count('chars_written', timing['chars'])
+
+    def add_cache_stats(self, stats, prefix='cache'):
+        """Treffer/Fehlschläge eines ManifestCache (cache.stats) oder UrlMemo (prefix='memo')"""
+        for name, value in stats.items():
+            self.count(f'{prefix}_{name}', value)
+
+    def _profile_enter(self, name):
+        import cProfile
+        import tracemalloc
+        profiler = self.profilers.get(name)
+        if profiler is None:
+            profiler = self.profilers[name] = cProfile.Profile()
+        tracemalloc.reset_peak()
+        self._memory_start = tracemalloc.get_traced_memory()[0]
+        profiler.enable()
+
+    def _profile_exit(self, name):
+        self.profilers[name].disable()
+        import tracemalloc
+        peak = tracemalloc.get_traced_memory()[1] - self._memory_start
+        previous = self.peaks.get(name)
+        if previous is None or peak > 1.5 * previous:
+            # Schnappschuss nur bei einem deutlich neuen Spitzenwert, nicht bei jedem Aufruf
+            self.snapshots[name] = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            ])
+        self.peaks[name] = max(peak, previous or 0)
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def as_dict(self):
+        total = self.elapsed()
+        counters = dict(self.counters)
+        rates = {}
+        for name in ('bytes_read', 'matches', 'urls'):
+            if name in counters and total > 0:
+                rates[f'{name}_per_second'] = counters[name] / total
+        return {
+            'script': self.script,
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started)),
+            'seconds': total,
+            'stages': {name: {'seconds': seconds, 'calls': self.calls[name],
+                              'share': seconds / total if total else 0.0}
+                       for name, seconds in self.seconds.items()},
+            'counters': counters,
+            'gauges': dict(self.gauges),
+            'rates': rates,
+            'sinks': self.sinks,
+            'profile': {name: {'peak_bytes': self.peaks.get(name, 0),
+                               'prof': self._profile_path(name, '.prof'),
+                               'tracemalloc': self._profile_path(name, '.tracemalloc.txt')}
+                        for name in self.profilers},
+        }
+
+    def prometheus(self, data=None):
+        """Prometheus-Textformat (Version 0.0.4)"""
+        data = data or self.as_dict()
+        prefix = PROMETHEUS_PREFIX
+        script = _label(self.script)
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join([f'script="{script}"'] + [f'{key}="{_label(val)}"'
+                                                                 for key, val in labels])
+                lines.append(f"{prefix}_{name}{{{label_text}}} {_number(value)}")
+
+        family('run_seconds', 'gauge', "Dauer des Laufs in Sekunden", [((), data['seconds'])])
+        family('run_timestamp_seconds', 'gauge', "Startzeit des Laufs (Unix-Zeit)",
+               [((), self.started)])
+        family('stage_seconds', 'gauge', "Dauer pro Stufe in Sekunden (Summe aller Aufrufe)",
+               [((('stage', name),), stage['seconds']) for name, stage in data['stages'].items()])
+        family('stage_calls', 'gauge', "Aufrufe pro Stufe",
+               [((('stage', name),), stage['calls']) for name, stage in data['stages'].items()])
+        for name, value in data['counters'].items():
+            family(f"{_metric_name(name)}_total", 'counter', f"Zähler {name}", [((), value)])
+        for name, value in list(data['gauges'].items()) + list(data['rates'].items()):
+            family(_metric_name(name), 'gauge', f"Messwert {name}", [((), value)])
+        if data['sinks']:
+            family('sink_seconds', 'gauge', "Schreibdauer pro Ausgabe in Sekunden",
+                   [((('sink', sink['sink']), ('path', sink['path'])), sink['seconds'])
+                    for sink in data['sinks']])
+        return '\n'.join(lines) + '\n'
+
+    def _profile_path(self, stage, suffix):
+        return os.path.join(self.directory, f"{self.script}.{_metric_name(stage)}{suffix}")
+
+    def write(self):
+        """Schreibt <skript>.json und <skript>.prom (und die Profile); gibt die Pfade zurück"""
+        os.makedirs(self.directory, exist_ok=True)
+        data = self.as_dict()
+        json_path = os.path.join(self.directory, f"{self.script}.json")
+        prom_path = os.path.join(self.directory, f"{self.script}.prom")
+        _write_atomic(json_path, json.dumps(data, indent=2, ensure_ascii=False) + '\n')
+        # Der textfile-Collector darf nie eine halb geschriebene Datei lesen
+        _write_atomic(prom_path, self.prometheus(data))
+        for name, profiler in self.profilers.items():
+            profiler.dump_stats(self._profile_path(name, '.prof'))
+        for name, snapshot in self.snapshots.items():
+            stats = snapshot.statistics('lineno')[:TRACEMALLOC_TOP]
+            lines = [f"# {self.script} / {name}: Spitze {self.peaks.get(name, 0) / 1e6:.1f} MB, "
+                     f"größte Allokationen am Ende der Stufe"]
+            lines.extend(str(stat) for stat in stats)
+            _write_atomic(self._profile_path(name, '.tracemalloc.txt'), '\n'.join(lines) + '\n')
+        return json_path, prom_path
+
+    def print_summary(self, file=None):
+        file = file or sys.stdout
+        total = self.elapsed()
+        print("⏱️  STUFEN:", file=file)
+        for name, seconds in self.seconds.items():
+            peak = f"  Spitze {self.peaks[name] / 1e6:7.1f} MB" if name in self.peaks else ""
+            print(f"  {name:12s} {seconds * 1000:9.1f} ms  {seconds / total if total else 0:6.1%}  "
+                  f"{self.calls[name]:6d}x{peak}", file=file)
+        print(f"  {'gesamt':12s} {total * 1000:9.1f} ms", file=file)
+        if self.counters:
+            print("  " + ", ".join(f"{name}={value}" for name, value in self.counters.items()), file=file)
+
+    def finish(self, quiet=False):
+        """Schreibt die Metrik-Dateien; mit Profiling zusätzlich die Stufentabelle"""
+        paths = self.write()
+        if not quiet:
+            if self.profile:
+                self.print_summary()
+            print(f"📈 Metriken: {paths[0]}, {paths[1]}")
+        return paths
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullMetrics:
+    """Abgeschaltete Metriken: keine Messung, keine Dateien"""
+
+    profile = False
+    _stage = _NullStage()
+
+    def stage(self, name):
+        return self._stage
+
+    def count(self, name, value=1):
+        pass
+
+    def set(self, name, value):
+        pass
+
+    def add_sink_timings(self, timings):
+        pass
+
+    def add_cache_stats(self, stats, prefix='cache'):
+        pass
+
+    def finish(self, quiet=False):
+        return None
+
+
+NULL_METRICS = NullMetrics()
+
+
+def _metric_name(name):
+    return _METRIC_NAME.sub('_', name)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _write_atomic(path, text):
+    temp = path + '.tmp'
+    with open(temp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(temp, path)
+
+
+def add_metrics_arguments(parser):
+    """Die gemeinsamen Optionen --metrics-dir, --no-metrics und --profile"""
+    group = parser.add_argument_group("Metriken")
+    group.add_argument('--metrics-dir', default=DEFAULT_METRICS_DIR,
+                       help="Verzeichnis für <skript>.json und <skript>.prom")
+    group.add_argument('--no-metrics', action='store_true',
+                       help="Keine Stufenzeiten messen und keine Metrik-Dateien schreiben")
+    group.add_argument('--profile', action='store_true',
+                       help="cProfile und tracemalloc pro Stufe (Dateien im Metrik-Verzeichnis; "
+                            "deutlich langsamer)")
+
+
+def metrics_from_args(script, args):
+    """RunMetrics für ein Skript aus den Optionen von add_metrics_arguments()"""
+    if args.no_metrics:
+        return NULL_METRICS
+    return RunMetrics(script, profile=args.profile, directory=args.metrics_dir)
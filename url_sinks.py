@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Gepufferte Ausgabe-Sinks für die URL-Ergebnisse
+Jeder Sink rendert die Datensätze in Paketen von BATCH_SIZE zu einem
+String und schreibt ihn mit einem write()-Aufruf in eine groß gepufferte
+Datei (oder nach stdout bei Pfad '-'). write_sinks() lässt mehrere Sinks
+über dieselben Datensätze in einem Thread-Pool laufen und misst die Zeit
+pro Sink.
+
+Eigene Formate entstehen durch Ableiten von Sink und Überschreiben von
+header(), render(batch, start) und footer(); prepare() kann die Datensätze
+vorher umsortieren.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections.abc import Sequence
+from itertools import islice
+
+# Datensätze pro Render-Paket
+BATCH_SIZE = 1000
+# Puffergröße der Ausgabedateien in Bytes
+WRITE_BUFFER = 1 << 20
+# Ab so vielen Datensätzen lohnen sich Threads für mehrere Sinks
+PARALLEL_MIN_RECORDS = 10_000
+# Endung der temporären Datei beim atomaren Schreiben
+TEMP_SUFFIX = '.tmp'
+
+CSV_HEADER = ['Nr', 'URL', 'Typ', 'Kategorie', 'Domain', 'Kontext/Repo', 'Beschreibung']
+
+# Encoder einmal anlegen; json.dumps() mit Optionen baut bei jedem Aufruf einen neuen
+_COMPACT = json.JSONEncoder(ensure_ascii=False)
+_INDENTED = json.JSONEncoder(indent=2, ensure_ascii=False)
+_SCALARS = (str, int, float, bool, type(None))
+
+
+class Sink:
+    """Basisklasse: rendert Pakete von Datensätzen in eine Datei"""
+
+    name = 'sink'
+    newline = None
+
+    def __init__(self, path):
+        self.path = path
+
+    def prepare(self, records):
+        """Reihenfolge der Datensätze für diesen Sink"""
+        return records
+
+    def header(self):
+        return ''
+
+    def render(self, batch, start):
+        """Rendert ein Paket; start ist der Index des ersten Datensatzes"""
+        raise NotImplementedError
+
+    def footer(self):
+        return ''
+
+
+class JsonSink(Sink):
+    """JSON-Dokument wie json.dump(indent=2), die Liste unter key wird paketweise geschrieben"""
+
+    name = 'json'
+
+    def __init__(self, path, document, key='all_urls'):
+        super().__init__(path)
+        self.document = document
+        self.key = key
+
+    def header(self):
+        document = {k: v for k, v in self.document.items() if k != self.key}
+        document[self.key] = None
+        head = json.dumps(document, indent=2, ensure_ascii=False)
+        # '  "all_urls": null\n}' durch den Listenanfang ersetzen
+        self.empty = True
+        return head[:head.rindex('null')] + '['
+
+    def render(self, batch, start):
+        parts = []
+        for item in batch:
+            parts.append(('\n    ' if self.empty else ',\n    ') + _indented_item(item))
+            self.empty = False
+        return ''.join(parts)
+
+    def footer(self):
+        return ']\n}' if self.empty else '\n  ]\n}'
+
+
+class JsonLinesSink(Sink):
+    """Ein JSON-Objekt pro Zeile"""
+
+    name = 'jsonl'
+
+    def render(self, batch, start):
+        return ''.join(_COMPACT.encode(item) + '\n' for item in batch)
+
+
+class CsvSink(Sink):
+    """URL_LISTE_VOLLSTAENDIG.csv: Nr, URL, Typ, Kategorie, Domain, Kontext/Repo, Beschreibung"""
+
+    name = 'csv'
+    newline = ''
+
+    def header(self):
+        return self._rows([CSV_HEADER])
+
+    def render(self, batch, start):
+        return self._rows([i, item['url'], item['type'], item['category'], item['domain'],
+                           item['context'], item['description']]
+                          for i, item in enumerate(batch, start + 1))
+
+    @staticmethod
+    def _rows(rows):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue()
+
+
+class MarkdownTableSink(Sink):
+    """URL_TABELLE.md: eine Tabellenzeile pro URL"""
+
+    name = 'md-table'
+
+    def header(self):
+        return ("# 📊 VOLLSTÄNDIGE URL-TABELLE\n\n"
+                "| Nr | URL | Typ | Kategorie | Domain | Kontext | Beschreibung |\n"
+                "|---:|-----|-----|-----------|--------|---------|-------------|\n")
+
+    def render(self, batch, start):
+        lines = []
+        for i, item in enumerate(batch, start + 1):
+            url = item['url']
+            url_display = url[:80] + '...' if len(url) > 80 else url
+            lines.append(f"| {i} | `{url_display}` | {item['type']} | {item['category']} | "
+                         f"{item['domain']} | {item['context']} | {item['description']} |\n")
+        return ''.join(lines)
+
+
+def _indented_item(item):
+    """Ein Listenelement wie in json.dump(indent=2) auf Ebene 2 eingerückt
+
+    Flache Dicts mit skalaren Werten werden mit dem C-Encoder zeilenweise
+    zusammengesetzt; der eingerückte Encoder läuft sonst komplett in Python.
+    """
+    if not item or not all(type(value) in _SCALARS for value in item.values()):
+        return _INDENTED.encode(item).replace('\n', '\n    ')
+    encode = _COMPACT.encode
+    return '{\n      ' + ',\n      '.join(
+        f"{encode(key)}: {encode(value)}" for key, value in item.items()) + '\n    }'
+
+
+def _open(sink, atomic=False):
+    if sink.path == '-':
+        return sys.stdout
+    path = sink.path + TEMP_SUFFIX if atomic else sink.path
+    return open(path, 'w', encoding='utf-8', newline=sink.newline, buffering=WRITE_BUFFER)
+
+
+def _close(f, sink=None, completed=False):
+    if f is sys.stdout:
+        f.flush()
+        return
+    f.close()
+    if sink is not None and f.name != sink.path:
+        # Atomar: die Zieldatei wird erst ersetzt, wenn alles geschrieben ist
+        if completed:
+            os.replace(f.name, sink.path)
+        else:
+            os.unlink(f.name)
+
+
+def run_sink(sink, records, batch_size=BATCH_SIZE, atomic=False):
+    """Schreibt alle Datensätze (Liste oder Iterator) in einen Sink; gibt die Messwerte zurück
+
+    Mit atomic=True wird in eine temporäre Datei daneben geschrieben und
+    diese am Ende umbenannt; Leser sehen nie eine halb geschriebene Datei.
+    """
+    start_time = time.perf_counter()
+    rows = iter(sink.prepare(records))
+    f = _open(sink, atomic)
+    written = 0
+    count = 0
+    completed = False
+    try:
+        written += f.write(sink.header())
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            written += f.write(sink.render(batch, count))
+            count += len(batch)
+        written += f.write(sink.footer())
+        completed = True
+    finally:
+        _close(f, sink, completed)
+    return {
+        'sink': sink.name,
+        'path': sink.path,
+        'rows': count,
+        'chars': written,
+        'seconds': time.perf_counter() - start_time,
+    }
+
+
+def write_sinks(records, sinks, batch_size=BATCH_SIZE, workers=None, atomic=False):
+    """Lässt alle Sinks über dieselben Datensätze laufen, mehrere parallel im Thread-Pool
+
+    records ist eine Sequenz (Liste, MentionTable, ...), die nur gelesen
+    wird, oder eine Funktion ohne Argumente, die für jeden Sink einen neuen
+    Iterator liefert (dann liegt nie mehr als ein Paket pro Sink im
+    Speicher). Jeder Sink hat seine
+    eigene Datei (atomic wie bei run_sink). Gibt die Messwerte in der
+    Reihenfolge der Sinks zurück. Weniger als PARALLEL_MIN_RECORDS
+    Datensätze werden ohne Thread-Pool geschrieben.
+    """
+    if callable(records):
+        source = records
+    else:
+        records = records if isinstance(records, Sequence) else list(records)
+        source = lambda: records
+        if len(records) < PARALLEL_MIN_RECORDS and workers is None:
+            workers = 1
+    if len(sinks) < 2 or workers == 1:
+        return [run_sink(sink, source(), batch_size, atomic) for sink in sinks]
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=workers or len(sinks)) as pool:
+        return list(pool.map(lambda sink: run_sink(sink, source(), batch_size, atomic), sinks))
+
+
+def stream_sinks(records, sinks, batch_size=BATCH_SIZE):
+    """Ein Durchlauf über einen Iterator; jedes Paket geht nacheinander an alle Sinks
+
+    Für Quellen, die sich nur einmal lesen lassen (Streaming-Extraktion,
+    inkrementell geparstes JSON). prepare() wird nicht aufgerufen, die
+    Sinks bekommen die Datensätze in Quellreihenfolge.
+    """
+    records = iter(records)
+    files = []
+    timings = []
+    try:
+        for sink in sinks:
+            start_time = time.perf_counter()
+            files.append(_open(sink))
+            written = files[-1].write(sink.header())
+            timings.append({'sink': sink.name, 'path': sink.path, 'rows': 0, 'chars': written,
+                            'seconds': time.perf_counter() - start_time})
+        count = 0
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            for sink, f, timing in zip(sinks, files, timings):
+                start_time = time.perf_counter()
+                timing['chars'] += f.write(sink.render(batch, count))
+                timing['seconds'] += time.perf_counter() - start_time
+            count += len(batch)
+        for sink, f, timing in zip(sinks, files, timings):
+            start_time = time.perf_counter()
+            timing['chars'] += f.write(sink.footer())
+            timing['rows'] = count
+            timing['seconds'] += time.perf_counter() - start_time
+    finally:
+        for f in files:
+            _close(f)
+    return timings
+
+
+def print_sink_timings(timings, file=None):
+    """Gibt Dauer und Größe pro Sink aus"""
+    file = file or sys.stdout
+    print("⏱️  AUSGABE:", file=file)
+    for timing in timings:
+        print(f"  {timing['sink']:10s} {timing['rows']:8d} Zeilen  {timing['chars'] / 1e3:9.1f} K Zeichen  "
+              f"{timing['seconds'] * 1000:8.1f} ms  {timing['path']}", file=file)
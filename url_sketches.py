@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Approximative Zähler für URL-Analysen über sehr große Korpora
+Statt exakter set()- und dict-Zähler mit einem Eintrag pro URL halten die
+Sketches einen festen, vorab gewählten Speicher:
+
+    HyperLogLog      unique URLs/Domains, relativer Standardfehler
+                     1.04 / sqrt(2^precision)
+    CountMinSketch   Häufigkeit pro URL, überschätzt um höchstens
+                     epsilon * Gesamtanzahl mit Wahrscheinlichkeit 1 - delta
+    SpaceSaving      Kandidaten für die meist-erwähnten URLs; jede URL mit
+                     mehr als Gesamtanzahl / capacity Erwähnungen ist enthalten
+
+Alle Sketches lassen sich mit merge() zusammenführen (gleiche Parameter
+vorausgesetzt), z.B. die Ergebnisse einzelner Dateien aus Worker-Prozessen.
+Gehasht wird mit BLAKE2b statt hash(), damit die Werte in jedem Prozess
+gleich sind.
+"""
+
+import heapq
+import math
+import operator
+from array import array
+from functools import lru_cache
+from hashlib import blake2b
+
+# 2^-r für alle möglichen Registerwerte
+_INVERSE_POWERS = [2.0 ** -r for r in range(65)]
+
+
+def hash64(value):
+    """Stabiler 64-Bit-Hash eines Strings (prozessübergreifend gleich)"""
+    return int.from_bytes(blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+# Domains wiederholen sich ständig; ihre Hashes werden zwischengespeichert
+_domain_hash = lru_cache(maxsize=1 << 14)(hash64)
+
+
+class HyperLogLog:
+    """Schätzt die Anzahl unterschiedlicher Werte"""
+
+    def __init__(self, error=0.01, precision=None):
+        if precision is None:
+            precision = math.ceil(math.log2((1.04 / error) ** 2))
+        self.precision = min(max(precision, 4), 18)
+        self.registers = bytearray(1 << self.precision)
+
+    @property
+    def error(self):
+        """Relativer Standardfehler der Schätzung"""
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, value):
+        self.add_hash(hash64(value))
+
+    def add_hash(self, h):
+        bits = 64 - self.precision
+        index = h >> bits
+        rank = bits - (h & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / math.fsum(map(_INVERSE_POWERS.__getitem__, self.registers))
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Kleiner Bereich: Linear Counting ist genauer
+            return round(m * math.log(m / zeros))
+        return round(estimate)
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError("HyperLogLog: unterschiedliche Präzision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def nbytes(self):
+        return len(self.registers)
+
+
+class CountMinSketch:
+    """Schätzt Häufigkeiten; nie zu niedrig, höchstens um epsilon * total zu hoch"""
+
+    def __init__(self, epsilon=1e-4, delta=0.01):
+        self.width = math.ceil(math.e / epsilon)
+        self.depth = math.ceil(math.log(1 / delta))
+        self.rows = [array('Q', bytes(8 * self.width)) for _ in range(self.depth)]
+        self.total = 0
+
+    def _indexes(self, h):
+        # Kirsch-Mitzenmacher: depth Hashfunktionen aus zwei Hälften eines Hashes
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        width = self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def add(self, value, count=1):
+        self.add_hash(hash64(value), count)
+
+    def add_hash(self, h, count=1):
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        width = self.width
+        for row in self.rows:
+            row[h1 % width] += count
+            h1 += h2
+        self.total += count
+
+    def estimate(self, value):
+        return self.estimate_hash(hash64(value))
+
+    def estimate_hash(self, h):
+        return min(row[index] for row, index in zip(self.rows, self._indexes(h)))
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("CountMinSketch: unterschiedliche Dimensionen")
+        self.rows = [array('Q', map(operator.add, row, other_row))
+                     for row, other_row in zip(self.rows, other.rows)]
+        self.total += other.total
+        return self
+
+    def nbytes(self):
+        return 8 * self.width * self.depth
+
+
+class SpaceSaving:
+    """Hält höchstens capacity Kandidaten für die häufigsten Werte
+
+    Zähler überschätzen um höchstens den Fehler, den ein Kandidat beim
+    Verdrängen des bisher kleinsten Zählers übernommen hat.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        # (Zähler, Wert) pro Kandidat; der Zähler im Heap ist eine Untergrenze,
+        # weil Erhöhungen den Heap nicht anfassen
+        self.heap = []
+
+    def add(self, value, count=1):
+        counts = self.counts
+        current = counts.get(value)
+        if current is not None:
+            counts[value] = current + count
+            return
+        if len(counts) < self.capacity:
+            counts[value] = count
+            self.errors[value] = 0
+            heapq.heappush(self.heap, (count, value))
+            return
+        smallest, victim = self._pop_min()
+        del counts[victim]
+        del self.errors[victim]
+        counts[value] = smallest + count
+        self.errors[value] = smallest
+        heapq.heappush(self.heap, (smallest + count, value))
+
+    def _pop_min(self):
+        heap = self.heap
+        while True:
+            count, value = heapq.heappop(heap)
+            current = self.counts[value]
+            if current == count:
+                return count, value
+            # Veraltete Untergrenze: mit aktuellem Zähler wieder einsortieren
+            heapq.heappush(heap, (current, value))
+
+    def _rebuild(self):
+        self.heap = [(count, value) for value, count in self.counts.items()]
+        heapq.heapify(self.heap)
+
+    def min_count(self):
+        """Untergrenze für Werte außerhalb der Kandidaten (0, solange nicht voll)"""
+        if len(self.counts) < self.capacity:
+            return 0
+        return min(self.counts.values())
+
+    def merge(self, other):
+        """Mergeable Summary: fehlende Werte bekommen den kleinsten Zähler der anderen Seite"""
+        own_min, other_min = self.min_count(), other.min_count()
+        merged = {}
+        errors = {}
+        for value in list(self.counts) + [v for v in other.counts if v not in self.counts]:
+            merged[value] = self.counts.get(value, own_min) + other.counts.get(value, other_min)
+            errors[value] = (self.errors.get(value, own_min)
+                             + other.errors.get(value, other_min))
+        kept = heapq.nlargest(self.capacity, merged.items(), key=lambda x: x[1])
+        self.counts = dict(kept)
+        self.errors = {value: errors[value] for value in self.counts}
+        self._rebuild()
+        return self
+
+    def top(self, k):
+        """[(Wert, Zähler, Fehler)] der k größten Zähler"""
+        return [(value, count, self.errors[value])
+                for value, count in heapq.nlargest(k, self.counts.items(), key=lambda x: x[1])]
+
+    def nbytes(self):
+        # Grobe Schätzung: Dict-Einträge, Heap-Tupel und die gehaltenen Strings
+        strings = sum(len(value) + 49 for value in self.counts)
+        return strings + 2 * 104 * len(self.counts) + 72 * len(self.heap)
+
+
+class MentionSketch:
+    """Sketch-Gegenstück zu den exakten Kennzahlen des Duplikat-Berichts
+
+    Pro Typ: exakte Anzahl Erwähnungen (wenige Typen), HyperLogLog für
+    unique URLs und Domains. Für die Häufigkeitsliste SpaceSaving-Kandidaten,
+    deren Zähler mit dem Count-Min-Sketch nach oben begrenzt werden.
+    """
+
+    def __init__(self, error=0.01, epsilon=1e-4, delta=0.01, capacity=1000):
+        self.settings = (error, epsilon, delta, capacity)
+        self.total = 0
+        self.urls = HyperLogLog(error)
+        self.type_counts = {}
+        self.type_urls = {}
+        self.type_domains = {}
+        self.frequencies = CountMinSketch(epsilon, delta)
+        self.heavy_hitters = SpaceSaving(capacity)
+
+    def add(self, url, url_type, domain, count=1):
+        h = hash64(url)
+        self.total += count
+        self.urls.add_hash(h)
+        if url_type not in self.type_counts:
+            self.type_counts[url_type] = 0
+            self.type_urls[url_type] = HyperLogLog(self.settings[0])
+            self.type_domains[url_type] = HyperLogLog(self.settings[0])
+        self.type_counts[url_type] += count
+        self.type_urls[url_type].add_hash(h)
+        self.type_domains[url_type].add_hash(_domain_hash(domain))
+        self.frequencies.add_hash(h, count)
+        self.heavy_hitters.add(url, count)
+
+    def merge(self, other):
+        if other.settings != self.settings:
+            raise ValueError("MentionSketch: unterschiedliche Parameter")
+        self.total += other.total
+        self.urls.merge(other.urls)
+        for url_type, count in other.type_counts.items():
+            if url_type not in self.type_counts:
+                self.type_counts[url_type] = 0
+                self.type_urls[url_type] = HyperLogLog(self.settings[0])
+                self.type_domains[url_type] = HyperLogLog(self.settings[0])
+            self.type_counts[url_type] += count
+            self.type_urls[url_type].merge(other.type_urls[url_type])
+            self.type_domains[url_type].merge(other.type_domains[url_type])
+        self.frequencies.merge(other.frequencies)
+        self.heavy_hitters.merge(other.heavy_hitters)
+        return self
+
+    def unique(self):
+        return self.urls.count()
+
+    def by_type(self):
+        """[(Typ, Erwähnungen, ~unique URLs, ~unique Domains)], häufigster Typ zuerst"""
+        rows = [(url_type, count, self.type_urls[url_type].count(), self.type_domains[url_type].count())
+                for url_type, count in self.type_counts.items()]
+        return sorted(rows, key=lambda x: x[1], reverse=True)
+
+    def top_urls(self, k=20):
+        """[(URL, geschätzte Anzahl)]; Schätzung = Minimum aus SpaceSaving und Count-Min"""
+        candidates = ((url, min(count, self.frequencies.estimate(url)))
+                      for url, count, _ in self.heavy_hitters.top(self.heavy_hitters.capacity))
+        return heapq.nlargest(k, candidates, key=lambda x: x[1])
+
+    def nbytes(self):
+        hlls = [self.urls] + list(self.type_urls.values()) + list(self.type_domains.values())
+        return (sum(hll.nbytes() for hll in hlls) + self.frequencies.nbytes()
+                + self.heavy_hitters.nbytes())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Streaming URL-Extraktion mit begrenztem Speicherbedarf
+Liest die Eingabe blockweise, findet und klassifiziert URLs Zeile für Zeile
+und schreibt die Ergebnisse sofort als JSON Lines, CSV oder TXT
+
+Speicherobergrenze (unabhängig von der Eingabegröße):
+    CHUNK_SIZE + MAX_LINE_LENGTH Zeichen Lesepuffer
+    + WRITE_BUFFER Bytes pro Ausgabedatei
+    + ein Datensatz mit höchstens CONTEXT_LIMIT Zeichen Kontext
+Mit --unique kommt die Menge der bereits gesehenen URLs hinzu; die wächst
+mit der Anzahl unterschiedlicher URLs, nicht mit der Eingabegröße.
+"""
+
+import argparse
+import csv
+import json
+import mmap
+import os
+import re
+import sys
+
+from url_memo import SHARED_MEMO
+from url_tokenizer import find_urls
+
+# Zeichen pro Lese-Block
+CHUNK_SIZE = 1 << 20
+# Längere Zeilen werden an Leerzeichen aufgeteilt (URLs enthalten keine)
+MAX_LINE_LENGTH = 1 << 16
+# Zeilenenden wie bei readlines() im Universal-Newline-Modus
+_LINE_BREAK = re.compile(r'\r\n|\r|\n')
+# Puffergröße der Ausgabedateien in Bytes
+WRITE_BUFFER = 1 << 20
+# Maximale Länge der gespeicherten Kontextzeile
+CONTEXT_LIMIT = 200
+
+FIELDS = ['url', 'type', 'category', 'domain', 'line', 'repo', 'section', 'context']
+
+# Dateiendung -> Format (url_structure liest 'html' und 'markdown' strukturiert)
+FORMATS = {
+    '.html': 'html', '.htm': 'html', '.xhtml': 'html',
+    '.md': 'markdown', '.markdown': 'markdown', '.mdx': 'markdown',
+}
+
+
+def detect_format(path):
+    """Format anhand der Dateiendung: 'html', 'markdown' oder 'text'"""
+    return FORMATS.get(os.path.splitext(path)[1].lower(), 'text')
+
+
+def iter_chunks(filepath, chunk_size=CHUNK_SIZE):
+    """Liest die Datei in Blöcken von chunk_size Zeichen"""
+    with open(filepath, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def iter_lines(chunks, max_line_length=MAX_LINE_LENGTH):
+    """Setzt Blöcke zu Zeilen zusammen: (Zeilennummer, Text, Zeilenanfang?)
+
+    Zeilenenden sind '\r\n', '\r' und '\n' (wie readlines() ohne newline='').
+    Eine URL, die über eine Blockgrenze läuft, bleibt im Rest-Puffer, bis
+    das Zeilenende gelesen ist; ebenso ein '\r' am Blockende, dem im nächsten
+    Block noch ein '\n' folgen kann. Überlange Zeilen werden am letzten
+    Leerzeichen vor max_line_length geteilt, damit der Puffer begrenzt bleibt.
+    """
+    line_num = 1
+    at_line_start = True
+    carry = ''
+    search = _LINE_BREAK.search
+
+    for chunk in chunks:
+        buffer = carry + chunk
+        start = 0
+        if '\r' not in buffer:
+            # Häufigster Fall, ohne Regex: nur '\n'
+            while True:
+                end = buffer.find('\n', start)
+                if end == -1:
+                    break
+                yield line_num, buffer[start:end], at_line_start
+                line_num += 1
+                at_line_start = True
+                start = end + 1
+        else:
+            while True:
+                match = search(buffer, start)
+                if match is None:
+                    break
+                end = match.start()
+                if end == len(buffer) - 1 and buffer[end] == '\r':
+                    # Vielleicht die erste Hälfte von '\r\n': mit dem nächsten Block entscheiden
+                    break
+                yield line_num, buffer[start:end], at_line_start
+                line_num += 1
+                at_line_start = True
+                start = match.end()
+
+        carry = buffer[start:]
+        while len(carry) > max_line_length:
+            cut = max(carry.rfind(' ', 0, max_line_length), carry.rfind('\t', 0, max_line_length))
+            if cut <= 0:
+                cut = max_line_length
+            yield line_num, carry[:cut], at_line_start
+            at_line_start = False
+            carry = carry[cut:]
+
+    if carry:
+        yield line_num, carry.rstrip('\r'), at_line_start
+
+
+def iter_mentions(lines, unique=False):
+    """Findet und klassifiziert alle URL-Erwähnungen zeilenweise"""
+    current_repo = "Unknown"
+    current_section = "Unknown"
+    seen = set() if unique else None
+
+    for line_num, line, at_line_start in lines:
+        if at_line_start:
+            # Erkenne Kategorien
+            if line.startswith('## 🏷️'):
+                current_section = line.replace('## 🏷️', '').strip()
+            # Erkenne Repository-Namen
+            if line.startswith('### ') and '. ' in line:
+                current_repo = line.split('. ', 1)[1].strip()
+
+        if 'http' not in line:
+            continue
+
+        context = None
+        for url in find_urls(line):
+            if seen is not None:
+                if url in seen:
+                    continue
+                seen.add(url)
+            if context is None:
+                context = line.strip()[:CONTEXT_LIMIT]
+            info = SHARED_MEMO.classify(url)
+            yield {
+                'url': url,
+                'type': info.type,
+                'category': info.category,
+                'domain': info.domain,
+                'line': line_num,
+                'repo': current_repo,
+                'section': current_section,
+                'context': context,
+            }
+
+
+def iter_mmap_matches(filepath, pattern, with_lines=False):
+    """Bytes-Regex direkt über eine mmap-Abbildung der Datei (ohne Volltext-Kopie)
+
+    pattern ist ein str- oder bytes-Muster; str-Muster werden als ASCII
+    kompiliert. Dekodiert werden nur die Treffer. Mit with_lines=True wird
+    (Zeilennummer, Treffer) geliefert; die Zeilennummer ergibt sich aus den
+    Zeilenumbrüchen zwischen zwei Treffern, die in Fenstern von höchstens
+    CHUNK_SIZE Bytes gezählt werden.
+
+    Hinweis: im Bytes-Modus beendet nur ASCII-Whitespace eine URL, nicht
+    Unicode-Leerzeichen wie U+00A0.
+    """
+    if isinstance(pattern, str):
+        pattern = pattern.encode('ascii')
+    regex = re.compile(pattern)
+
+    with open(filepath, 'rb') as f:
+        try:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Leere Datei
+            return
+    line_num = 1
+    counted_to = 0
+    matches = regex.finditer(mapping)
+    try:
+        for match in matches:
+            text = match.group(0).decode('utf-8', errors='replace')
+            if not with_lines:
+                yield text
+                continue
+            start = match.start()
+            while counted_to < start:
+                end = min(start, counted_to + CHUNK_SIZE)
+                line_num += mapping[counted_to:end].count(b'\n')
+                counted_to = end
+            yield line_num, text
+    finally:
+        # Der Scanner hält den Puffer der Abbildung, vor dem Schließen freigeben
+        del matches
+        mapping.close()
+
+
+class JsonLinesWriter:
+    """Schreibt einen Datensatz pro Zeile als JSON"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER)
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False))
+        self.file.write('\n')
+
+    def close(self):
+        self.file.close()
+
+
+class CsvWriter:
+    """Schreibt die Datensätze als CSV mit Kopfzeile"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER)
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+        self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record)
+
+    def close(self):
+        self.file.close()
+
+
+class TxtWriter:
+    """Schreibt die Datensätze im Stil von ALLE_URLS_MIT_DUPLIKATEN.txt"""
+
+    def __init__(self, path):
+        self.file = open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER)
+        self.count = 0
+
+    def write(self, record):
+        self.count += 1
+        self.file.write(
+            f"[{self.count}]\n"
+            f"  URL:         {record['url']}\n"
+            f"  TYPE:        {record['type']}\n"
+            f"  CATEGORY:    {record['section']}\n"
+            f"  REPO:        {record['repo']}\n"
+            f"  ZEILE:       {record['line']}\n"
+            f"  CONTEXT:     {record['context']}\n\n"
+        )
+
+    def close(self):
+        self.file.close()
+
+
+def stream_extract(filepath, writers, unique=False, chunk_size=CHUNK_SIZE):
+    """Verbindet Leser, Matcher, Klassifikator und Writer; gibt die Anzahl zurück"""
+    count = 0
+    try:
+        for record in iter_mentions(iter_lines(iter_chunks(filepath, chunk_size)), unique):
+            for writer in writers:
+                writer.write(record)
+            count += 1
+    finally:
+        for writer in writers:
+            writer.close()
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming URL-Extraktion mit begrenztem Speicher")
+    parser.add_argument('input', help="Eingabedatei (Markdown/HTML/Text)")
+    parser.add_argument('--jsonl', help="Ausgabe als JSON Lines")
+    parser.add_argument('--csv', help="Ausgabe als CSV")
+    parser.add_argument('--txt', help="Ausgabe als Textbericht")
+    parser.add_argument('--unique', action='store_true',
+                        help="Jede URL nur einmal ausgeben (Speicher wächst mit unique URLs)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help="Zeichen pro Lese-Block")
+    args = parser.parse_args(argv)
+
+    writers = []
+    if args.jsonl:
+        writers.append(JsonLinesWriter(args.jsonl))
+    if args.csv:
+        writers.append(CsvWriter(args.csv))
+    if args.txt:
+        writers.append(TxtWriter(args.txt))
+    if not writers:
+        parser.error("mindestens eine Ausgabe angeben (--jsonl, --csv oder --txt)")
+
+    print(f"🔍 Streaming-Extraktion: {args.input}", file=sys.stderr)
+    count = stream_extract(args.input, writers, args.unique, args.chunk_size)
+    print(f"✅ {count} URL-Erwähnungen geschrieben", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
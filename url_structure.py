@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Strukturbewusste URL-Extraktion für HTML und Markdown
+Statt einer Regex über den ganzen Text wird das Dokument entsprechend
+seinem Format gelesen:
+
+    HTML      html.parser mit inkrementellem feed(): URLs aus href/src/
+              srcset/... und aus dem Text, Entities dekodiert; Kontext ist
+              die letzte Überschrift (h1-h6, vorher <title>). Inhalte von
+              <script>/<style> werden nur mit scan_scripts=True durchsucht
+    Markdown  Links, Bilder, Autolinks und Referenzdefinitionen werden
+              erkannt; Kontext ist die letzte ATX-Überschrift außerhalb
+              von Codeblöcken
+    Text      Tokenizer über jede Zeile, Kontext "Unknown"
+
+Jede Erwähnung ist ein Dict mit url, line, context und element
+(z.B. 'a[href]', 'img[srcset]', 'script', 'md-image', 'text').
+
+html.parser läuft in Python und ist um ein Vielfaches langsamer als der
+Zeilen-Regex (siehe benchmark_url_extraction.py html); die Skripte nutzen
+den HTML-Leser deshalb nur auf Wunsch (--format html bzw. --html-parser),
+den Markdown-Leser automatisch.
+"""
+
+import argparse
+import re
+from collections import defaultdict
+from html.parser import HTMLParser
+
+from url_streaming import detect_format, iter_chunks, iter_lines
+from url_tokenizer import find_urls, iter_urls
+
+# Attribute, deren Wert eine URL ist (srcset wird gesondert zerlegt)
+URL_ATTRIBUTES = {'href', 'src', 'action', 'formaction', 'poster', 'cite',
+                  'data', 'content', 'background', 'manifest'}
+HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+# Elemente, deren Inhalt Code ist und standardmäßig nicht durchsucht wird
+SCRIPT_TAGS = {'script', 'style'}
+# Elemente ohne End-Tag; sie kommen nicht auf den Element-Stack
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+             'meta', 'param', 'source', 'track', 'wbr'}
+
+_MD_HEADING = re.compile(r'#{1,6}(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+_MD_FENCE = re.compile(r' {0,3}(`{3,}|~{3,})')
+_MD_REFERENCE = re.compile(r' {0,3}\[[^\]]+\]:[ \t]*<?$')
+_WHITESPACE = re.compile(r'\s+')
+# Bis zum letzten dieser Zeichen darf ein Block an den HTML-Parser gehen
+_FEED_CUT = (' ', '\n', '\t', '\r', '\f', '<', '>')
+
+
+class HtmlUrlParser(HTMLParser):
+    """Sammelt URL-Erwähnungen beim inkrementellen Parsen von HTML
+
+    Mit scan_scripts=True werden auch <script>- und <style>-Inhalte nach
+    URLs durchsucht (element 'script' bzw. 'style').
+    """
+
+    def __init__(self, scan_scripts=False):
+        super().__init__(convert_charrefs=True)
+        self.scan_scripts = scan_scripts
+        self.mentions = []
+        self.context = "Unknown"
+        self.stack = []
+        self.heading = None
+        self.title = None
+
+    def handle_starttag(self, tag, attrs):
+        self.collect_attributes(tag, attrs)
+        if tag in HEADING_TAGS:
+            self.heading = []
+        elif tag == 'title' and self.title is None:
+            self.title = []
+        if tag not in VOID_TAGS:
+            self.stack.append(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        self.collect_attributes(tag, attrs)
+
+    def collect_attributes(self, tag, attrs):
+        line = self.getpos()[0]
+        for name, value in attrs:
+            if not value:
+                continue
+            if name == 'srcset' or name == 'imagesrcset':
+                # "bild-1x.png 1x, bild-2x.png 2x": die URL ist das erste Wort jedes Kandidaten
+                urls = [url for candidate in value.split(',') if candidate.strip()
+                        for url in find_urls(candidate.split()[0])]
+            elif name in URL_ATTRIBUTES or name.startswith('data-'):
+                urls = find_urls(value)
+            else:
+                continue
+            for url in urls:
+                self.mentions.append({'url': url, 'line': line, 'context': self.context,
+                                      'element': f"{tag}[{name}]"})
+
+    def handle_endtag(self, tag):
+        if tag in HEADING_TAGS and self.heading is not None:
+            text = _WHITESPACE.sub(' ', ''.join(self.heading)).strip()
+            if text:
+                self.context = text
+            self.heading = None
+        elif tag == 'title' and isinstance(self.title, list):
+            self.title = _WHITESPACE.sub(' ', ''.join(self.title)).strip()
+            if self.title and self.context == "Unknown":
+                self.context = self.title
+        if tag in self.stack:
+            # Nicht geschlossene Elemente (z.B. <p>, <li>) mit abräumen
+            while self.stack.pop() != tag:
+                pass
+
+    def handle_data(self, data):
+        if self.heading is not None:
+            self.heading.append(data)
+        elif isinstance(self.title, list):
+            self.title.append(data)
+        if 'http' not in data:
+            return
+        element = self.stack[-1] if self.stack else 'text'
+        if element in SCRIPT_TAGS and not self.scan_scripts:
+            return
+        line = self.getpos()[0]
+        for offset, url in iter_urls(data):
+            self.mentions.append({'url': url, 'line': line + data.count('\n', 0, offset),
+                                  'context': self.context, 'element': element})
+
+
+def iter_html_mentions(chunks, scan_scripts=False):
+    """URL-Erwähnungen aus HTML, Block für Block an den Parser verfüttert
+
+    html.parser gibt Text ohne folgendes '<' sofort an handle_data weiter;
+    eine URL an der Blockgrenze käme dort in zwei Hälften an. Deshalb geht
+    jeder Block nur bis zum letzten Leerraum bzw. '<'/'>' an den Parser,
+    der Rest wird dem nächsten vorangestellt.
+    """
+    parser = HtmlUrlParser(scan_scripts)
+    rest = ''
+    for chunk in chunks:
+        if rest:
+            chunk = rest + chunk
+        cut = max(map(chunk.rfind, _FEED_CUT)) + 1
+        rest = chunk[cut:]
+        parser.feed(chunk[:cut])
+        yield from parser.mentions
+        parser.mentions.clear()
+    parser.feed(rest)
+    parser.close()
+    yield from parser.mentions
+
+
+def iter_markdown_mentions(lines):
+    """URL-Erwähnungen aus Markdown-Zeilen (Zeilennummer, Text, Zeilenanfang?)"""
+    context = "Unknown"
+    fence = None
+
+    for line_num, line, at_line_start in lines:
+        if at_line_start:
+            match = _MD_FENCE.match(line)
+            if match and (fence is None or match.group(1).startswith(fence)):
+                fence = match.group(1)[:3] if fence is None else None
+            elif fence is None and line.startswith('#'):
+                match = _MD_HEADING.match(line)
+                if match and match.group(1):
+                    context = match.group(1).strip()
+
+        if 'http' not in line:
+            continue
+        for offset, url in iter_urls(line):
+            if fence is not None or line.count('`', 0, offset) % 2:
+                element = 'md-code'
+            elif line.endswith('](', 0, offset):
+                bracket = line.rfind('[', 0, offset - 2)
+                element = 'md-image' if bracket > 0 and line[bracket - 1] == '!' else 'md-link'
+            elif line.endswith('<', 0, offset):
+                element = 'md-autolink'
+            elif at_line_start and _MD_REFERENCE.match(line, 0, offset):
+                element = 'md-reference'
+            else:
+                element = 'text'
+            yield {'url': url, 'line': line_num, 'context': context, 'element': element}
+
+
+def iter_text_mentions(lines):
+    """URL-Erwähnungen aus Zeilen ohne bekannte Struktur"""
+    for line_num, line, _ in lines:
+        if 'http' in line:
+            for url in find_urls(line):
+                yield {'url': url, 'line': line_num, 'context': "Unknown", 'element': 'text'}
+
+
+def iter_mentions(chunks, fmt, scan_scripts=False):
+    """Wählt den Leser für das Format ('html', 'markdown' oder 'text')"""
+    if fmt == 'html':
+        return iter_html_mentions(chunks, scan_scripts)
+    if fmt == 'markdown':
+        return iter_markdown_mentions(iter_lines(chunks))
+    return iter_text_mentions(iter_lines(chunks))
+
+
+def iter_file_mentions(path, fmt=None, scan_scripts=False):
+    """URL-Erwähnungen einer Datei, Format nach Dateiendung"""
+    return iter_mentions(iter_chunks(path), fmt or detect_format(path), scan_scripts)
+
+
+def build_structured_index(content, fmt, with_counts=False, scan_scripts=False):
+    """Wie build_context_index, aber mit dem Leser für das Format
+
+    Gibt URL -> (erste Zeile, Kontext) bzw. (erste Zeile, Kontext, Anzahl) zurück.
+    """
+    index = {}
+    counts = defaultdict(int)
+    # Ohne 'http' gibt es nichts zu finden; der Parser muss gar nicht erst laufen
+    if 'http' not in content:
+        return index
+    for mention in iter_mentions((content,), fmt, scan_scripts):
+        url = mention['url']
+        if url not in index:
+            index[url] = (mention['line'], mention['context'])
+        counts[url] += 1
+
+    if with_counts:
+        return {url: (line_num, context, counts[url]) for url, (line_num, context) in index.items()}
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Strukturbewusste URL-Extraktion (HTML/Markdown)")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--format', choices=['html', 'markdown', 'text'],
+                        help="Format erzwingen (Standard: nach Dateiendung)")
+    parser.add_argument('--scan-scripts', action='store_true',
+                        help="HTML: auch <script>- und <style>-Inhalte durchsuchen")
+    args = parser.parse_args(argv)
+
+    for path in args.files:
+        for mention in iter_file_mentions(path, args.format, args.scan_scripts):
+            print(f"{path}:{mention['line']}\t{mention['element']}\t{mention['url']}\t{mention['context']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Lokaler HTTP-Stub-Server zum Testen des Link-Checkers (ohne Internet)
+
+Pfade:
+    /status/<code>        antwortet mit <code>
+    /no-head/...          405 auf HEAD, 200 auf GET
+    /flaky/<n>/<id>       die ersten <n> Anfragen pro <id> mit 503, danach 200
+    /slow/<ms>/...        antwortet nach <ms> Millisekunden
+    /close/...            200 mit "Connection: close"
+    alles andere          200
+"""
+
+import argparse
+import asyncio
+from collections import Counter
+
+REASONS = {200: 'OK', 204: 'No Content', 301: 'Moved Permanently', 404: 'Not Found',
+           405: 'Method Not Allowed', 500: 'Internal Server Error', 503: 'Service Unavailable'}
+
+
+class StubServer:
+    """Minimaler HTTP/1.1-Server mit Keep-Alive"""
+
+    def __init__(self):
+        self.requests = Counter()
+        self.flaky = Counter()
+        self.server = None
+        self.handlers = set()
+
+    def route(self, method, path):
+        """Gibt (Status, zusätzliche Header, Verzögerung in s) zurück"""
+        parts = path.split('?', 1)[0].strip('/').split('/')
+        head = parts[0]
+        if head == 'status' and len(parts) > 1 and parts[1].isdigit():
+            return int(parts[1]), {}, 0.0
+        if head == 'no-head':
+            return (405 if method == 'HEAD' else 200), {}, 0.0
+        if head == 'flaky' and len(parts) > 1 and parts[1].isdigit():
+            key = '/'.join(parts[2:])
+            self.flaky[key] += 1
+            return (503 if self.flaky[key] <= int(parts[1]) else 200), {'Retry-After': '0'}, 0.0
+        if head == 'slow' and len(parts) > 1 and parts[1].isdigit():
+            return 200, {}, int(parts[1]) / 1000
+        if head == 'close':
+            return 200, {'Connection': 'close'}, 0.0
+        return 200, {}, 0.0
+
+    async def handle(self, reader, writer):
+        task = asyncio.current_task()
+        self.handlers.add((task, writer))
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+
+                self.requests[method] += 1
+                status, headers, delay = self.route(method, path)
+                if delay:
+                    await asyncio.sleep(delay)
+
+                body = b'' if status in (204, 304) else f"{status}\n".encode()
+                lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'Status')}",
+                         f"Content-Length: {len(body)}"]
+                lines += [f"{name}: {value}" for name, value in headers.items()]
+                writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+                if method != 'HEAD':
+                    writer.write(body)
+                await writer.drain()
+                if headers.get('Connection') == 'close':
+                    break
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+            self.handlers.discard((task, writer))
+
+    async def start(self, host='127.0.0.1', port=0):
+        """Startet den Server; gibt den tatsächlichen Port zurück"""
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        handlers = list(self.handlers)
+        for _, writer in handlers:
+            writer.close()
+        await asyncio.gather(*(task for task, _ in handlers), return_exceptions=True)
+        await self.server.wait_closed()
+
+
+async def serve_forever(host, port):
+    stub = StubServer()
+    port = await stub.start(host, port)
+    print(f"🧪 Stub-Server läuft auf http://{host}:{port}/")
+    await stub.server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lokaler HTTP-Stub-Server für den Link-Checker")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
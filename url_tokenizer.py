@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Gemeinsamer URL-Tokenizer für alle Extraktions-Skripte
+Eine einzige Regex erkennt URLs in Fließtext, Markdown-Links und
+HTML-Attributen, lässt ausgeglichene Klammern in der URL stehen und schneidet
+Satzzeichen am Ende ab, ohne nachträgliches rstrip
+
+Die Konformität wird gegen url_tokenizer_golden.json geprüft:
+    python url_tokenizer.py --check
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+# Zeichen, die eine URL beenden: Whitespace, Klammern/Quotes/Spitzklammern
+# (Markdown- und HTML-Begrenzer) sowie nach RFC 3986 unzulässige Zeichen
+_STOP = r'\s()<>\[\]{}"\'`|\\^'
+# Zeichen, die am Ende einer URL als Satzzeichen gelten ($ vor Template-Platzhaltern)
+_TRAILING = r'.,;:!?*$'
+
+# Ausgeglichenes Klammerpaar innerhalb einer URL, z.B. /wiki/Foo_(bar)
+_PAREN = rf'\([^{_STOP}]*\)'
+
+# Läufe von Satzzeichen werden nur übernommen, wenn danach die URL weitergeht;
+# so endet jeder Treffer auf ein URL-Zeichen oder eine Klammer, ohne dass die
+# Regex Zeichen für Zeichen zurücksetzen muss
+URL_PATTERN = (
+    rf'https?://'
+    rf'(?:[^{_STOP}{_TRAILING}]+'
+    rf'|[{_TRAILING}]+(?=[^{_STOP}{_TRAILING}]|{_PAREN})'
+    rf'|{_PAREN})+'
+)
+
+URL_REGEX = re.compile(URL_PATTERN)
+# Gleiche Regel als Bytes-Muster (für mmap-Scans)
+URL_REGEX_BYTES = re.compile(URL_PATTERN.encode('ascii'))
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'url_tokenizer_golden.json')
+
+
+def find_urls(text):
+    """Alle URLs im Text, in Fundreihenfolge (mit Wiederholungen)"""
+    return URL_REGEX.findall(text)
+
+
+def iter_urls(text):
+    """(Startoffset, URL) für alle URLs im Text"""
+    for match in URL_REGEX.finditer(text):
+        yield match.start(), match.group(0)
+
+
+def verify_golden(path=GOLDEN_PATH):
+    """Prüft den Tokenizer gegen den Golden-Korpus; gibt die Abweichungen zurück"""
+    with open(path, 'r', encoding='utf-8') as f:
+        cases = json.load(f)
+    failures = []
+    for case in cases:
+        got = find_urls(case['input'])
+        if got != case['expected']:
+            failures.append({'name': case['name'], 'input': case['input'],
+                             'expected': case['expected'], 'got': got})
+    return len(cases), failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gemeinsamer URL-Tokenizer")
+    parser.add_argument('files', nargs='*', help="Dateien, deren URLs ausgegeben werden")
+    parser.add_argument('--check', action='store_true', help="Golden-Korpus prüfen")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        total, failures = verify_golden()
+        for failure in failures:
+            print(f"❌ {failure['name']}: erwartet {failure['expected']}, erhalten {failure['got']}")
+        print(f"{'✅' if not failures else '❌'} {total - len(failures)}/{total} Fälle konform")
+        return 1 if failures else 0
+
+    for path in args.files:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for url in find_urls(f.read()):
+                print(url)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+URL-Werkzeuge als ein Paket
+Gemeinsamer Einstiegspunkt für die Skripte und Module im Wurzelverzeichnis:
+
+    python -m url_tools extract --export      (Kommandozeile, siehe url_tools.cli)
+    from url_tools import find_urls, classify_url, analyze_content
+
+Die Module dahinter (url_tokenizer, extract_all_urls, ...) bleiben unter
+ihren bisherigen Namen importierbar. ``import url_tools`` lädt keines von
+ihnen; erst der Zugriff auf ein Attribut importiert das zugehörige Modul.
+"""
+
+import importlib
+
+# Öffentlicher Name -> Modul, aus dem er stammt
+_EXPORTS = {
+    'find_urls': 'url_tokenizer',
+    'iter_urls': 'url_tokenizer',
+    'classify_url': 'url_classifier',
+    'canonicalize': 'url_canonical',
+    'canonicalize_batch': 'url_canonical',
+    'near_duplicate_clusters': 'url_canonical',
+    'analyze_content': 'extract_all_urls',
+    'analyze_structured': 'extract_all_urls',
+    'split_sections': 'extract_all_urls',
+    'iter_mentions_with_context': 'extract_all_urls_with_duplicates',
+    'iter_mentions_parallel': 'extract_all_urls_with_duplicates',
+    'read_mentions': 'extract_all_urls_with_duplicates',
+    'aggregate_mentions': 'extract_all_urls_with_duplicates',
+    'build_structured_index': 'url_structure',
+    'detect_format': 'url_streaming',
+    'ManifestCache': 'url_cache',
+    'UrlMemo': 'url_memo',
+    'SHARED_MEMO': 'url_memo',
+    'UrlIndex': 'url_index',
+    'UrlTable': 'url_columnar',
+    'MentionSketch': 'url_sketches',
+    'MentionTable': 'url_mentions',
+    'RunMetrics': 'url_metrics',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,10 @@
+import os
+import sys
+
+if not __package__:
+    # Als Verzeichnis gestartet (python path/to/url_tools): Paket importierbar machen
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from url_tools.cli import main
+
+sys.exit(main())
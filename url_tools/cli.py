@@ -0,0 +1,103 @@
+"""
+Eine Kommandozeile für alle URL-Werkzeuge
+
+    python -m url_tools extract [ANALYSE_BERICHT.md] [--export]
+    python -m url_tools dupes --console summary -j 8
+    python -m url_tools -C build/ export
+    python -m url_tools help extract
+
+Jeder Befehl ist die main()-Funktion eines der Skripte; sein Modul (mit
+JSON-/CSV-Writern, Berichten, SQLite, html.parser, ...) wird erst geladen,
+wenn der Befehl läuft. Die Übersicht lädt nichts außer diesem Modul.
+-C DIR wechselt vor dem Befehl ins Verzeichnis DIR (wie git -C): die
+Ausgabedateien landen dort, relative Eingabepfade gelten ab DIR.
+"""
+
+import importlib
+import os
+import sys
+
+# Befehl -> (Modul mit main(argv), Kurzbeschreibung)
+COMMANDS = {
+    'extract': ('extract_all_urls', "URLs extrahieren und kategorisieren (JSON, Markdown-Report)"),
+    'list': ('url_extraction', "URLs nach Typ und Kategorie auflisten (URL_EXTRACTION_RESULTS.txt)"),
+    'dupes': ('extract_all_urls_with_duplicates', "Alle Erwähnungen inklusive Duplikate"),
+    'export': ('create_csv_export', "CSV und Markdown-Tabelle aus URL_ANALYSE_RESULTS.json"),
+    'corpus': ('url_corpus_scan', "Viele Dateien parallel scannen"),
+    'stream': ('url_streaming', "Streaming-Extraktion mit begrenztem Speicher"),
+    'structure': ('url_structure', "HTML/Markdown strukturbewusst lesen"),
+    'tokenize': ('url_tokenizer', "URLs mit dem gemeinsamen Tokenizer finden"),
+    'canonical': ('url_canonical', "URLs kanonisieren, nahe Duplikate gruppieren"),
+    'index': ('url_index', "Abfragen über den SQLite-URL-Index"),
+    'load': ('url_db_loader', "Ergebnisse in url_metadata laden"),
+    'links': ('url_link_checker', "Erreichbarkeit der URLs prüfen"),
+    'watch': ('url_watch', "Ausgaben bei jeder Änderung aktualisieren"),
+    'bench': ('benchmark_suite', "Benchmark-Suite mit JSON-Ergebnissen"),
+}
+
+USAGE = "usage: python -m url_tools [-C DIR] <befehl> [optionen]"
+
+# Die Module liegen im Verzeichnis über dem Paket
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def print_help(file=None):
+    file = file or sys.stdout
+    print(USAGE, file=file)
+    print("\nBefehle:", file=file)
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:10s} {description}", file=file)
+    print("\nHilfe zu einem Befehl: python -m url_tools <befehl> --help", file=file)
+
+
+def run(command, argv):
+    """Führt einen Befehl aus; gibt den Exit-Code zurück"""
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    module = importlib.import_module(COMMANDS[command][0])
+    # argparse nimmt den Programmnamen aus sys.argv[0]
+    sys.argv = [f"url_tools {command}"] + list(argv)
+    result = module.main(list(argv))
+    return result if isinstance(result, int) else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    directory = None
+    while argv and argv[0].startswith('-'):
+        option = argv.pop(0)
+        if option in ('-h', '--help'):
+            print_help()
+            return 0
+        if option == '-C' and argv:
+            directory = argv.pop(0)
+        elif option.startswith('-C') and len(option) > 2:
+            directory = option[2:]
+        else:
+            print(USAGE, file=sys.stderr)
+            print(f"❌ Unbekannte Option: {option}", file=sys.stderr)
+            return 2
+    if not argv:
+        print_help(sys.stderr)
+        return 2
+
+    command, rest = argv[0], argv[1:]
+    if command == 'help':
+        if not rest:
+            print_help()
+            return 0
+        command, rest = rest[0], ['--help']
+    if command not in COMMANDS:
+        print(USAGE, file=sys.stderr)
+        print(f"❌ Unbekannter Befehl: {command} (verfügbar: {', '.join(COMMANDS)})", file=sys.stderr)
+        return 2
+    if directory:
+        os.chdir(directory)
+    try:
+        return run(command, rest)
+    except SystemExit as exit:
+        # argparse (--help, Fehler) und einzelne Skripte beenden per sys.exit
+        if exit.code is None or isinstance(exit.code, int):
+            return exit.code or 0
+        print(exit.code, file=sys.stderr)
+        return 1
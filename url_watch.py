@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Watch-Modus: aktualisiert die Ausgaben der Extraktions-Skripte bei jeder Änderung
+Beobachtet ANALYSE_BERICHT.md (und optional HTML-Seiten) und schreibt nach
+jedem Speichern neu:
+
+    URL_ANALYSE_RESULTS.json, URL_ANALYSE_REPORT.md   (extract_all_urls.py)
+    URL_LISTE_VOLLSTAENDIG.csv, URL_TABELLE.md          (create_csv_export.py)
+    ALLE_URLS_MIT_DUPLIKATEN.txt                        (extract_all_urls_with_duplicates.py)
+    URL_EXTRACTION_RESULTS.txt                          (url_extraction.py)
+    URL_KORPUS_RESULTS.json                             (url_corpus_scan.py, nur mit --pages)
+
+Der Bericht wird an den ``## ``/``### ``-Überschriften in Abschnitte geteilt
+(wie beim Manifest-Cache); nur Abschnitte, deren Text sich geändert hat,
+werden neu extrahiert, alle anderen Ergebnisse liegen im Speicher.
+Zeilennummern und Kontexte werden beim Zusammensetzen aus den
+Abschnittsanfängen neu berechnet. Seiten werden pro Datei neu gescannt.
+
+Änderungen meldet inotify (Linux, über ctypes); ohne inotify oder mit
+--poll wird os.stat() in festen Abständen verglichen. Die Ausgaben werden
+atomar ersetzt (temporäre Datei + Umbenennen).
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from collections import Counter
+
+from extract_all_urls import (AnalyseReportSink, analyze_content, analyze_structured, build_output_data,
+                              compute_statistics, group_urls, split_sections)
+from extract_all_urls_with_duplicates import MentionReportSink, aggregate_mentions, iter_line_mentions
+from url_cache import content_digest
+from url_corpus_scan import collect_files, merge_results, scan_file
+from url_extraction import UrlRecord, get_repo_name, match_category, write_results
+from url_memo import SHARED_MEMO, add_memo_arguments, memo_from_args
+from url_sinks import TEMP_SUFFIX, CsvSink, JsonSink, MarkdownTableSink, run_sink, write_sinks
+from url_structure import detect_format
+
+# inotify-Ereignisse (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+# Verzeichnisse statt Dateien beobachten: viele Editoren speichern über eine
+# neue Datei, die dann umbenannt wird
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT = struct.Struct('iIII')
+
+# Ruhezeit nach dem letzten Ereignis, bevor neu extrahiert wird (Sekunden)
+DEBOUNCE = 0.05
+# Abstand der os.stat()-Vergleiche ohne inotify (Sekunden)
+POLL_INTERVAL = 0.2
+
+OUTPUTS = {
+    'json': 'URL_ANALYSE_RESULTS.json',
+    'report': 'URL_ANALYSE_REPORT.md',
+    'csv': 'URL_LISTE_VOLLSTAENDIG.csv',
+    'md_table': 'URL_TABELLE.md',
+    'mentions': 'ALLE_URLS_MIT_DUPLIKATEN.txt',
+    'extraction': 'URL_EXTRACTION_RESULTS.txt',
+}
+
+
+class InotifyWatcher:
+    """Änderungen über Linux-inotify (ctypes, ohne Zusatzpaket)"""
+
+    name = 'inotify'
+
+    def __init__(self, paths, debounce=DEBOUNCE):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify nicht verfügbar")
+        self.debounce = debounce
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 fehlgeschlagen")
+        self.dirs = {}
+        for directory in sorted({os.path.dirname(path) for path in self.paths}):
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(errno, os.strerror(errno), directory)
+            self.dirs[wd] = directory
+
+    def _read_events(self):
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                path = os.path.join(self.dirs.get(wd, ''), name)
+                if path in self.paths:
+                    changed.add(path)
+
+    def wait(self, timeout=None):
+        """Wartet auf Änderungen; gibt die geänderten Pfade zurück (leer bei Timeout)
+
+        Nach dem ersten Ereignis wird gesammelt, bis debounce Sekunden lang
+        nichts mehr kommt, damit ein Speichervorgang nur einen Lauf auslöst.
+        """
+        changed = set()
+        ready = select.select([self.fd], [], [], timeout)[0]
+        while ready:
+            changed |= self._read_events()
+            ready = select.select([self.fd], [], [], self.debounce)[0]
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback: vergleicht (mtime, Größe, Inode) aller Dateien in festen Abständen"""
+
+    name = 'polling'
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.stamps = {os.path.abspath(path): None for path in paths}
+        for path in self.stamps:
+            self.stamps[path] = self._stamp(path)
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path, stamp in self.stamps.items():
+                current = self._stamp(path)
+                if current != stamp:
+                    self.stamps[path] = current
+                    changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+def open_watcher(paths, poll=None):
+    """inotify, wenn verfügbar; mit poll (Sekunden) oder ohne inotify Polling"""
+    if poll is None:
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(paths, poll or POLL_INTERVAL)
+
+
+class SectionMemo:
+    """Abschnitts-Ergebnisse im Speicher, Ersatz für ManifestCache in analyze_content
+
+    Gehalten werden nur die Abschnitte des letzten und des aktuellen Stands;
+    advance() nach jedem Lauf verwirft alle anderen.
+    """
+
+    def __init__(self):
+        self.previous = {}
+        self.current = {}
+        self.stats = Counter()
+
+    def get_section(self, digest):
+        result = self.current.get(digest)
+        if result is None:
+            result = self.previous.get(digest)
+        if result is None:
+            self.stats['section_misses'] += 1
+            return None
+        self.stats['section_hits'] += 1
+        self.current[digest] = result
+        return result
+
+    def put_section(self, digest, result):
+        self.current[digest] = result
+
+    def advance(self):
+        self.previous, self.current = self.current, {}
+
+
+def _collect(generator):
+    """Alle Elemente eines Generators und sein Rückgabewert"""
+    items = []
+    while True:
+        try:
+            items.append(next(generator))
+        except StopIteration as stop:
+            return items, stop.value
+
+
+class ReportPipeline:
+    """Ausgaben der vier Skripte für einen Bericht, abschnittsweise aktualisiert"""
+
+    def __init__(self, path, output_dir='.', html_parser=False):
+        self.path = path
+        # HTML-Berichte mit html.parser statt mit dem Zeilen-Regex lesen
+        self.html_parser = html_parser
+        self.outputs = {key: os.path.join(output_dir, name) for key, name in OUTPUTS.items()}
+        self.digest = None
+        self.sections = SectionMemo()
+        # Abschnittstext -> (Erwähnungen relativ zum Abschnitt, (repo, category) am Ende)
+        self.mentions = {}
+        # URL -> UrlRecord für URL_EXTRACTION_RESULTS.txt
+        self.records = {}
+
+    def update(self):
+        """Liest den Bericht neu und schreibt alle Ausgaben
+
+        Gibt None zurück, wenn sich der Inhalt nicht geändert hat, sonst eine
+        Zusammenfassung mit den geänderten Zeilenbereichen.
+        """
+        start_time = time.perf_counter()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        digest = content_digest(content)
+        if digest == self.digest:
+            return None
+
+        sections = split_sections(content)
+        previous = self.mentions
+        changed = []
+        for start, text in sections:
+            if text not in self.mentions:
+                end = start + text.count('\n')
+                if changed and changed[-1][1] + 1 == start:
+                    changed[-1] = (changed[-1][0], end)
+                else:
+                    changed.append((start, end))
+        if self.html_parser and detect_format(self.path) == 'html':
+            _, categorized = analyze_structured(content, 'html')
+        else:
+            _, categorized = analyze_content(content, self.sections, sections=sections)
+            self.sections.advance()
+        all_urls = self._mentions(sections)
+        extract_time = time.perf_counter() - start_time
+
+        timings = self._write(categorized, all_urls)
+        self.digest = digest
+        return {
+            'changed': changed,
+            'sections': len(sections),
+            'reextracted': sum(1 for _, text in sections if text not in previous),
+            'urls': len(categorized),
+            'mentions': len(all_urls),
+            'extract_seconds': extract_time,
+            'seconds': time.perf_counter() - start_time,
+            'timings': timings,
+        }
+
+    def _mentions(self, sections):
+        """Alle Erwähnungen wie iter_mentions_with_context, neu nur für geänderte Abschnitte"""
+        memo = {}
+        all_urls = []
+        repo = category = "Unknown"
+        for start, text in sections:
+            entry = memo.get(text) or self.mentions.get(text)
+            if entry is None:
+                # Kontext None = vom vorherigen Abschnitt übernehmen
+                entry = _collect(iter_line_mentions(text.split('\n'), 1, None, None))
+            memo[text] = entry
+            items, (section_repo, section_category) = entry
+            offset = start - 1
+            for item in items:
+                item = dict(item, line=item['line'] + offset)
+                if item['repo'] is None:
+                    item['repo'] = repo
+                if item['category'] is None:
+                    item['category'] = category
+                all_urls.append(item)
+            if section_repo is not None:
+                repo = section_repo
+            if section_category is not None:
+                category = section_category
+        self.mentions = memo
+        return all_urls
+
+    def _extraction_records(self, categorized):
+        records = []
+        for url in sorted(item['url'] for item in categorized):
+            record = self.records.get(url)
+            if record is None:
+                info = SHARED_MEMO.classify(url)
+                record = UrlRecord(url, info.type, match_category(url), get_repo_name(url),
+                                   info.description or "Web Resource")
+            records.append(record)
+        self.records = {record.url: record for record in records}
+        return records
+
+    def _write(self, categorized, all_urls):
+        outputs = self.outputs
+        by_type, by_category = group_urls(categorized)
+        stats = compute_statistics(categorized)
+        type_counts = {url_type: len(items) for url_type, items in by_type.items()}
+        sinks = [
+            JsonSink(outputs['json'], build_output_data(categorized, by_type, by_category, stats)),
+            AnalyseReportSink(outputs['report'], self.path, stats, type_counts),
+            CsvSink(outputs['csv']),
+            MarkdownTableSink(outputs['md_table']),
+        ]
+        timings = write_sinks(categorized, sinks, atomic=True)
+        timings.append(run_sink(MentionReportSink(outputs['mentions'], aggregate_mentions(all_urls)),
+                                all_urls, atomic=True))
+
+        start_time = time.perf_counter()
+        records = self._extraction_records(categorized)
+        write_results(outputs['extraction'] + TEMP_SUFFIX, self.path, records)
+        os.replace(outputs['extraction'] + TEMP_SUFFIX, outputs['extraction'])
+        timings.append({'sink': 'extraction', 'path': outputs['extraction'], 'rows': len(records),
+                        'chars': os.path.getsize(outputs['extraction']),
+                        'seconds': time.perf_counter() - start_time})
+        return timings
+
+
+class CorpusPipeline:
+    """URL_KORPUS_RESULTS.json über mehrere Seiten; geänderte Dateien werden neu gescannt"""
+
+    def __init__(self, files, output='URL_KORPUS_RESULTS.json', html_parser=False):
+        self.files = [os.path.abspath(path) for path in files]
+        self.output = output
+        self.html_parser = html_parser
+        self.results = {}
+
+    def update(self, changed=None):
+        """Scannt die geänderten Dateien (alle bei None) und schreibt das JSON neu"""
+        start_time = time.perf_counter()
+        for path in self.files:
+            if changed is None or path in changed:
+                try:
+                    self.results[path] = scan_file(path, html=self.html_parser)
+                except FileNotFoundError:
+                    self.results.pop(path, None)
+        categorized = merge_results(self.results[path] for path in self.files if path in self.results)
+        output_data = build_output_data(categorized)
+        output_data['files_scanned'] = len(self.results)
+        write_sinks(categorized, [JsonSink(self.output, output_data)], atomic=True)
+        return {'files': len(self.files) if changed is None else len(changed & set(self.files)),
+                'urls': len(categorized), 'seconds': time.perf_counter() - start_time}
+
+
+def _format_ranges(ranges, limit=5):
+    parts = [f"{start}" if start == end else f"{start}–{end}" for start, end in ranges[:limit]]
+    if len(ranges) > limit:
+        parts.append(f"+{len(ranges) - limit}")
+    return ', '.join(parts) or "-"
+
+
+def print_report_update(path, summary):
+    print(f"🔄 {path}: Zeilen {_format_ranges(summary['changed'])} neu extrahiert "
+          f"({summary['reextracted']}/{summary['sections']} Abschnitte), {summary['urls']} URLs, "
+          f"{summary['mentions']} Erwähnungen, {len(summary['timings'])} Dateien in "
+          f"{summary['seconds'] * 1000:.0f} ms (Extraktion {summary['extract_seconds'] * 1000:.0f} ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aktualisiert die URL-Ausgaben bei jeder Änderung")
+    parser.add_argument('input', nargs='?', default='ANALYSE_BERICHT.md')
+    parser.add_argument('--pages', nargs='*', default=[], metavar='PATH',
+                        help="Zusätzlich beobachtete Seiten (Dateien, Verzeichnisse, Glob-Muster) "
+                             "für URL_KORPUS_RESULTS.json")
+    parser.add_argument('--corpus-output', default='URL_KORPUS_RESULTS.json',
+                        help="JSON-Ausgabe für --pages")
+    parser.add_argument('-d', '--output-dir', default='.', help="Verzeichnis der Bericht-Ausgaben")
+    parser.add_argument('--poll', type=float, default=None, metavar='SECONDS',
+                        help="Polling statt inotify, Abstand in Sekunden")
+    parser.add_argument('--once', action='store_true',
+                        help="Ausgaben einmal erzeugen und beenden")
+    parser.add_argument('--html-parser', action='store_true',
+                        help="HTML-Bericht und -Seiten mit html.parser statt mit dem Zeilen-Regex lesen")
+    add_memo_arguments(parser)
+    args = parser.parse_args(argv)
+    memo = memo_from_args(args)
+
+    report = ReportPipeline(args.input, args.output_dir, args.html_parser)
+    summary = report.update()
+    if summary is None:
+        print(f"❌ {args.input} nicht gefunden", file=sys.stderr)
+        return 1
+    print_report_update(args.input, summary)
+    corpus = None
+    if args.pages:
+        corpus = CorpusPipeline(collect_files(args.pages), args.corpus_output, args.html_parser)
+        result = corpus.update()
+        print(f"🔄 {result['files']} Seiten: {result['urls']} URLs in {result['seconds'] * 1000:.0f} ms "
+              f"-> {args.corpus_output}")
+    if args.once:
+        memo.close()
+        print(f"🧠 URL-Memo: {memo.summary()}")
+        return 0
+
+    input_path = os.path.abspath(args.input)
+    watcher = open_watcher([input_path] + (corpus.files if corpus else []), args.poll)
+    print(f"👀 Beobachte {1 + (len(corpus.files) if corpus else 0)} Dateien ({watcher.name}), "
+          f"Strg+C beendet")
+    try:
+        while True:
+            changed = watcher.wait()
+            if input_path in changed:
+                summary = report.update()
+                if summary is not None:
+                    print_report_update(args.input, summary)
+            if corpus is not None and changed & set(corpus.files):
+                result = corpus.update(changed)
+                print(f"🔄 {result['files']} Seiten neu gescannt: {result['urls']} URLs in "
+                      f"{result['seconds'] * 1000:.0f} ms -> {args.corpus_output}")
+    except KeyboardInterrupt:
+        print("\n👋 Watch-Modus beendet")
+    finally:
+        watcher.close()
+        memo.close()
+        print(f"🧠 URL-Memo: {memo.summary()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())